@@ -1,17 +1,27 @@
-import pygame
+import time
+STARTED = time.perf_counter()  # Startup is timed from here to the first menu frame
+
+import os
 import sys
-import random
 import math
-import time
+import queue
+import argparse
+import importlib
+import threading
+import traceback
 from collections import deque
-from pacman import Game as PacManGame
-from donkey_kong import DonkeyKongGame
-from snake import SnakeGame
-from space_invaders import SpaceInvadersGame
-from galaga import GalagaGame
 
-# Initialize Pygame
-pygame.init()
+# pygame.pkgdata imports pkg_resources only to locate pygame's bundled font and
+# falls back to plain file paths without it; importing it takes about as long
+# as the rest of startup, so keep it out while pygame loads
+skip_pkg_resources = "pkg_resources" not in sys.modules
+if skip_pkg_resources:
+	sys.modules["pkg_resources"] = None
+import pygame
+if skip_pkg_resources:
+	del sys.modules["pkg_resources"]
+from engine import (QUALITY_HIGH, QUALITY_LOW, GameLoop, InputLog, LiveInput, QualityGovernor, init_pygame, load_font,
+					preload_fonts, render_text)
 
 # Constants
 WINDOW_WIDTH = 800
@@ -30,12 +40,17 @@ DARK_BLUE = (0, 0, 139)
 BROWN = (139, 69, 19)
 PINK = (255, 192, 203)
 
+# The menu gradient at frame t is its frame-0 picture scrolled up GRADIENT_SCROLL
+# rows per frame, since sin(y * 0.01 + t * 0.05) == sin((y + 5 * t) * 0.01)
+GRADIENT_SCROLL = 5
+GRADIENT_STRIP_HEIGHT = 2 * WINDOW_HEIGHT  # Rows pre-drawn at once; the menu scrolls through them
+
 class ArcadeMenu:
 	def __init__(self, screen):
 		self.screen = screen
-		self.font_title = pygame.font.Font(None, 72)
-		self.font_large = pygame.font.Font(None, 48)
-		self.font_medium = pygame.font.Font(None, 36)
+		self.font_title = load_font(72)
+		self.font_large = load_font(48)
+		self.font_medium = load_font(36)
 		self.selected_game = 0
 		self.games = [
 			{"name": "PAC-MAN", "color": YELLOW, "description": "Eat dots, avoid ghosts!"},
@@ -46,6 +61,10 @@ class ArcadeMenu:
 			{"name": "BREAKOUT", "color": RED, "description": "Bounce ball, break bricks!"}
 		]
 		self.animation_timer = 0
+		self.quality = QualityGovernor()  # Sheds cosmetic detail when frames run long
+		self.gradient_strip = None  # Gradient pre-drawn from strip_frame on, blitted at an offset
+		self.strip_frame = 0
+		self.background_frame = 0  # Frame the background shows; lags behind at lower quality
 
 	def handle_input(self, event):
 		if event.type == pygame.KEYDOWN:
@@ -60,19 +79,42 @@ class ArcadeMenu:
 	def update(self):
 		self.animation_timer += 1
 
+	def build_gradient_strip(self, frame):
+		"""Pre-draw the gradient for frame and the scroll that follows it"""
+		if self.gradient_strip is None:
+			self.gradient_strip = pygame.Surface((WINDOW_WIDTH, GRADIENT_STRIP_HEIGHT), 0, self.screen)
+		for y in range(GRADIENT_STRIP_HEIGHT):
+			color_intensity = int(20 + 15 * math.sin(y * 0.01 + frame * 0.05))
+			self.gradient_strip.fill((color_intensity, 0, color_intensity), (0, y, WINDOW_WIDTH, 1))
+		self.strip_frame = frame
+
+	def draw_gradient(self, surface, frame):
+		"""Blit the gradient for frame from the strip, rebuilding it once the scroll runs past its end"""
+		offset = (frame - self.strip_frame) * GRADIENT_SCROLL
+		if self.gradient_strip is None or not 0 <= offset <= GRADIENT_STRIP_HEIGHT - WINDOW_HEIGHT:
+			self.build_gradient_strip(frame)
+			offset = 0
+		surface.blit(self.gradient_strip, (0, 0), (0, offset, WINDOW_WIDTH, WINDOW_HEIGHT))
+
+	def draw_background(self):
+		"""Animated gradient every frame at high quality, every 4th frame at medium, frozen at low"""
+		if self.quality.level == QUALITY_HIGH:
+			self.background_frame = self.animation_timer
+		elif self.quality.level > QUALITY_LOW and self.animation_timer - self.background_frame >= 4:
+			self.background_frame = self.animation_timer
+		self.draw_gradient(self.screen, self.background_frame)
+
 	def draw(self):
 		# Background gradient effect
-		for y in range(WINDOW_HEIGHT):
-			color_intensity = int(20 + 15 * math.sin(y * 0.01 + self.animation_timer * 0.05))
-			pygame.draw.line(self.screen, (color_intensity, 0, color_intensity), (0, y), (WINDOW_WIDTH, y))
+		self.draw_background()
 
 		# Title
-		title_text = self.font_title.render("RETRO ARCADE", True, WHITE)
+		title_text = render_text(self.font_title, "RETRO ARCADE", WHITE)
 		title_rect = title_text.get_rect(center=(WINDOW_WIDTH // 2, 100))
 		self.screen.blit(title_text, title_rect)
 
 		# Subtitle
-		subtitle_text = self.font_medium.render("Choose Your Game", True, CYAN)
+		subtitle_text = render_text(self.font_medium, "Choose Your Game", CYAN)
 		subtitle_rect = subtitle_text.get_rect(center=(WINDOW_WIDTH // 2, 150))
 		self.screen.blit(subtitle_text, subtitle_rect)
 
@@ -91,12 +133,12 @@ class ArcadeMenu:
 
 			# Game name
 			game_color = game["color"] if i == self.selected_game else WHITE
-			game_text = self.font_large.render(game["name"], True, game_color)
+			game_text = render_text(self.font_large, game["name"], game_color)
 			self.screen.blit(game_text, (100, y_pos - 15))
 
 			# Game description
 			if i == self.selected_game:
-				desc_text = self.font_medium.render(game["description"], True, CYAN)
+				desc_text = render_text(self.font_medium, game["description"], CYAN)
 				self.screen.blit(desc_text, (100, y_pos + 20))
 
 		# Instructions
@@ -107,7 +149,7 @@ class ArcadeMenu:
 		]
 
 		for i, instruction in enumerate(instructions):
-			inst_text = self.font_medium.render(instruction, True, WHITE)
+			inst_text = render_text(self.font_medium, instruction, WHITE)
 			self.screen.blit(inst_text, (50, WINDOW_HEIGHT - 120 + i * 30))
 
 
@@ -120,11 +162,12 @@ class ArcadeMenu:
 
 
 
-class BreakoutGame:
-	def __init__(self, screen):
-		self.screen = screen
-		self.font = pygame.font.Font(None, 48)
-		self.running = True
+class BreakoutGame(GameLoop):
+	STATE_FIELDS = ("paddle_x", "ball_x", "ball_y", "ball_dx", "ball_dy", "bricks")
+
+	def __init__(self, screen, seed=None):
+		GameLoop.__init__(self, screen, seed)
+		self.font = load_font(48)
 		self.paddle_x = WINDOW_WIDTH // 2 - 50
 		self.paddle_y = WINDOW_HEIGHT - 100
 		self.paddle_width = 100
@@ -147,106 +190,217 @@ class BreakoutGame:
 				}
 				self.bricks.append(brick)
 
-	def run(self):
-		clock = pygame.time.Clock()
-
-		while self.running:
-			for event in pygame.event.get():
-				if event.type == pygame.QUIT:
-					return "quit"
-				elif event.type == pygame.KEYDOWN:
-					if event.key == pygame.K_ESCAPE:
-						return "menu"
-
-			keys = pygame.key.get_pressed()
-			if keys[pygame.K_LEFT]:
-				self.paddle_x = max(0, self.paddle_x - 5)
-			if keys[pygame.K_RIGHT]:
-				self.paddle_x = min(WINDOW_WIDTH - self.paddle_width, self.paddle_x + 5)
-
-			# Update ball
-			self.ball_x += self.ball_dx
-			self.ball_y += self.ball_dy
-
-			# Ball collision with walls
-			if self.ball_x <= 10 or self.ball_x >= WINDOW_WIDTH - 10:
-				self.ball_dx = -self.ball_dx
-			if self.ball_y <= 10:
-				self.ball_dy = -self.ball_dy
-
-			# Ball collision with paddle
-			if (self.ball_y + 10 >= self.paddle_y and
-				self.ball_x >= self.paddle_x and
-				self.ball_x <= self.paddle_x + self.paddle_width):
-				self.ball_dy = -abs(self.ball_dy)
-
-			# Ball collision with bricks
-			ball_rect = pygame.Rect(self.ball_x - 10, self.ball_y - 10, 20, 20)
-			for brick in self.bricks:
-				if brick['active']:
-					brick_rect = pygame.Rect(brick['x'], brick['y'], brick['width'], brick['height'])
-					if ball_rect.colliderect(brick_rect):
-						brick['active'] = False
-						self.ball_dy = -self.ball_dy
-						break
-
-			# Reset if ball goes off screen
-			if self.ball_y > WINDOW_HEIGHT:
-				self.ball_x = WINDOW_WIDTH // 2
-				self.ball_y = WINDOW_HEIGHT // 2
-				self.ball_dx = 3
-				self.ball_dy = -3
-
-			self.screen.fill(BLACK)
-
-			# Draw bricks
-			for brick in self.bricks:
-				if brick['active']:
-					pygame.draw.rect(self.screen, brick['color'],
-								   (brick['x'], brick['y'], brick['width'], brick['height']))
+	def update(self, dt, input):
+		"""Advance the game by one fixed 60 Hz tick"""
+		if input[pygame.K_LEFT]:
+			self.paddle_x = max(0, self.paddle_x - 5)
+		if input[pygame.K_RIGHT]:
+			self.paddle_x = min(WINDOW_WIDTH - self.paddle_width, self.paddle_x + 5)
+		self.frame_timer.mark("input")
+
+		# Update ball
+		self.ball_x += self.ball_dx
+		self.ball_y += self.ball_dy
+		self.frame_timer.mark("update")
+
+		# Ball collision with walls
+		if self.ball_x <= 10 or self.ball_x >= WINDOW_WIDTH - 10:
+			self.ball_dx = -self.ball_dx
+		if self.ball_y <= 10:
+			self.ball_dy = -self.ball_dy
+
+		# Ball collision with paddle
+		if (self.ball_y + 10 >= self.paddle_y and
+			self.ball_x >= self.paddle_x and
+			self.ball_x <= self.paddle_x + self.paddle_width):
+			self.ball_dy = -abs(self.ball_dy)
+
+		# Ball collision with bricks
+		ball_rect = pygame.Rect(self.ball_x - 10, self.ball_y - 10, 20, 20)
+		for brick in self.bricks:
+			if brick['active']:
+				brick_rect = pygame.Rect(brick['x'], brick['y'], brick['width'], brick['height'])
+				if ball_rect.colliderect(brick_rect):
+					brick['active'] = False
+					self.ball_dy = -self.ball_dy
+					break
+		self.frame_timer.mark("collisions")
+
+		# Reset if ball goes off screen
+		if self.ball_y > WINDOW_HEIGHT:
+			self.ball_x = WINDOW_WIDTH // 2
+			self.ball_y = WINDOW_HEIGHT // 2
+			self.ball_dx = 3
+			self.ball_dy = -3
+		self.frame_timer.mark("update")
+
+	def render(self):
+		"""Draw the whole scene"""
+		self.screen.fill(BLACK)
+
+		# Draw bricks
+		for brick in self.bricks:
+			if brick['active']:
+				pygame.draw.rect(self.screen, brick['color'],
+							   (brick['x'], brick['y'], brick['width'], brick['height']))
+				if self.quality.level > QUALITY_LOW:
 					pygame.draw.rect(self.screen, WHITE,
 								   (brick['x'], brick['y'], brick['width'], brick['height']), 1)
 
-			# Draw paddle
-			pygame.draw.rect(self.screen, WHITE,
-						   (self.paddle_x, self.paddle_y, self.paddle_width, 10))
-
-			# Draw ball
-			pygame.draw.circle(self.screen, WHITE, (int(self.ball_x), int(self.ball_y)), 10)
-
-			# Title and instructions
-			title_text = self.font.render("BREAKOUT", True, WHITE)
-			title_rect = title_text.get_rect(center=(WINDOW_WIDTH // 2, 30))
-			self.screen.blit(title_text, title_rect)
-
-			inst_text = self.font.render("Left/Right arrows to move paddle", True, WHITE)
-			self.screen.blit(inst_text, (10, WINDOW_HEIGHT - 80))
+		# Draw paddle
+		pygame.draw.rect(self.screen, WHITE,
+					   (self.paddle_x, self.paddle_y, self.paddle_width, 10))
 
-			back_text = self.font.render("Press ESC to return to menu", True, WHITE)
-			self.screen.blit(back_text, (10, WINDOW_HEIGHT - 40))
+		# Draw ball
+		pygame.draw.circle(self.screen, WHITE, (int(self.ball_x), int(self.ball_y)), 10)
 
-			pygame.display.flip()
-			clock.tick(60)
+		# Title and instructions
+		title_text = render_text(self.font, "BREAKOUT", WHITE)
+		title_rect = title_text.get_rect(center=(WINDOW_WIDTH // 2, 30))
+		self.screen.blit(title_text, title_rect)
 
-		return "menu"
+		inst_text = render_text(self.font, "Left/Right arrows to move paddle", WHITE)
+		self.screen.blit(inst_text, (10, WINDOW_HEIGHT - 80))
+
+		back_text = render_text(self.font, "Press ESC to return to menu", WHITE)
+		self.screen.blit(back_text, (10, WINDOW_HEIGHT - 40))
+
+class GameEntry:
+	"""A game in the arcade's registry; its module is imported the first time it is launched"""
+
+	def __init__(self, module, class_name, game_class=None):
+		self.module = module
+		self.class_name = class_name
+		self.game_class = game_class
+		self.warm = None  # Instance built ahead of time by the Preloader
+		self.error = None  # Why the last warm-up failed, reported by take()
+		self.lock = threading.Lock()
+		self.queued = False  # A warm-up is queued and has not started yet
+		self.built = threading.Event()  # Cleared while a warm-up is queued or running
+		self.built.set()
+
+	def load(self):
+		"""Import the game's module if needed and return the game class"""
+		if self.game_class is None:
+			self.game_class = getattr(importlib.import_module(self.module), self.class_name)
+		return self.game_class
+
+	def __call__(self, *args, **kwargs):
+		return self.load()(*args, **kwargs)
+
+	def queue_warm_up(self):
+		with self.lock:
+			self.queued = True
+			self.built.clear()
+
+	def warm_up(self, screen):
+		with self.lock:
+			if not self.queued:
+				return  # take() built the game on the main thread meanwhile
+			self.queued = False
+		try:
+			self.warm = self(screen)
+			self.error = None
+		except Exception as error:
+			self.error = error
+			raise
+		finally:
+			self.built.set()
+
+	def take(self, screen):
+		"""The warm instance if one is ready, else a new one built now.
+
+		A warm-up that has not started yet is dropped; one already running is
+		waited for, so the game is never built twice at once.
+		"""
+		with self.lock:
+			if self.queued:
+				self.queued = False
+				self.built.set()
+		self.built.wait()
+		game, self.warm = self.warm, None
+		if game is None:
+			if self.error is not None:
+				error, self.error = self.error, None
+				print(f"Preloading {self.class_name} failed, building it now:", file=sys.stderr)
+				traceback.print_exception(type(error), error, error.__traceback__)
+			game = self(screen)
+		return game
+
+class Preloader:
+	"""Builds a warm instance of every game on a background thread while the menu idles.
+
+	The thread imports each game's module and runs its constructor, which
+	bakes what the game needs up front (Pac-Man's sprites and path table, for
+	one), so launching a game only takes the instance. A game that has been
+	played is replaced with a fresh instance rather than reset in place.
+	Fonts are created on the main thread before the thread starts, as
+	SDL_ttf is not thread-safe.
+	"""
+
+	def __init__(self, screen, entries):
+		self.screen = screen
+		self.entries = entries
+		self.jobs = queue.Queue()
+		self.thread = None
+
+	def start(self):
+		preload_fonts()
+		for entry in self.entries:
+			self.request(entry)
+		self.thread = threading.Thread(target=self.work, name="preloader", daemon=True)
+		self.thread.start()
+
+	def request(self, entry):
+		"""Queue building a warm instance of entry's game"""
+		entry.queue_warm_up()
+		self.jobs.put(entry)
+
+	def work(self):
+		while True:
+			entry = self.jobs.get()
+			try:
+				if entry is None:
+					return
+				entry.warm_up(self.screen)
+			except Exception:
+				pass  # Kept on the entry; take() reports it and builds the game on the main thread
+			finally:
+				self.jobs.task_done()
+
+	def wait(self):
+		"""Block until every queued instance is built"""
+		self.jobs.join()
+
+	def stop(self):
+		"""Finish the queued work and end the thread, before pygame shuts down"""
+		if self.thread is not None:
+			self.jobs.put(None)
+			self.thread.join()
+			self.thread = None
 
 class RetroArcade:
-	def __init__(self):
+	def __init__(self, record_dir=None, startup_only=False):
+		init_pygame()
 		self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
 		pygame.display.set_caption("RETRO ARCADE MACHINE")
 		self.clock = pygame.time.Clock()
 		self.menu = ArcadeMenu(self.screen)
 		self.current_state = "menu"
+		self.record_dir = record_dir  # Save an InputLog of every game played here
+		self.startup_time = None  # Seconds from launch to the first menu frame
+		self.startup_only = startup_only  # Report the startup time and quit
 
-		# Game classes
+		# Game registry, imported on launch so the menu does not wait for every game
 		self.games = {
-			0: PacManGame,
-			1: DonkeyKongGame,
-			2: SnakeGame,
-			3: SpaceInvadersGame,
-			4: GalagaGame,
-			5: BreakoutGame
+			0: GameEntry("pacman", "Game"),
+			1: GameEntry("donkey_kong", "DonkeyKongGame"),
+			2: GameEntry("snake", "SnakeGame"),
+			3: GameEntry("space_invaders", "SpaceInvadersGame"),
+			4: GameEntry("galaga", "GalagaGame"),
+			5: GameEntry(__name__, "BreakoutGame", BreakoutGame)
 		}
+		self.preloader = Preloader(self.screen, self.games.values())  # Started once the menu is up
 
 	def run(self):
 		running = True
@@ -263,22 +417,48 @@ class RetroArcade:
 							selected = self.menu.handle_input(event)
 							if selected is not None:
 								# Launch selected game
-								game_class = self.games[selected]
-								game = game_class(self.screen)
+								entry = self.games[selected]
+								game = entry.take(self.screen)
+								if self.record_dir:
+									game.input = LiveInput(InputLog(entry.class_name, game.seed))
 								result = game.run()
+								if self.record_dir:
+									self.save_recording(game)
+								self.preloader.request(entry)  # A fresh instance for next time
 								if result == "quit":
 									running = False
 								# If result is "menu", we stay in menu state
 
+				start = time.perf_counter()
 				self.menu.update()
 				self.menu.draw()
+				self.menu.quality.record(time.perf_counter() - start)
 
 			pygame.display.flip()
+			if self.startup_time is None:
+				self.startup_time = time.perf_counter() - STARTED
+				if self.startup_only:
+					print(f"Menu on screen {1000 * self.startup_time:.0f} ms after launch")
+					running = False
+				else:
+					self.preloader.start()
 			self.clock.tick(60)
 
+		self.preloader.stop()
 		pygame.quit()
 		sys.exit()
 
+	def save_recording(self, game):
+		log = game.input.log
+		os.makedirs(self.record_dir, exist_ok=True)
+		path = os.path.join(self.record_dir, f"{log.game}-{log.seed}-{time.strftime('%Y%m%d-%H%M%S')}.alog")
+		log.save(path)
+		print(f"Recorded {log.frames} frames to {path}")
+
 if __name__ == "__main__":
-	arcade = RetroArcade()
+	parser = argparse.ArgumentParser(description="Retro arcade machine")
+	parser.add_argument("--record", metavar="DIR", default=None, help="save an input log of every game played to DIR")
+	parser.add_argument("--startup-time", action="store_true", help="print how long the menu took to appear, then quit")
+	args = parser.parse_args()
+	arcade = RetroArcade(args.record, args.startup_time)
 	arcade.run()
\ No newline at end of file
@@ -0,0 +1,148 @@
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+import subprocess
+
+# Benchmarks never open a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from arcade import RetroArcade
+from engine import BotInput, FrameTimer
+
+# Headless frame-throughput benchmark: boots every game in RetroArcade.games
+# under the dummy video driver, drives it with a seeded scripted bot, runs a
+# fixed number of frames with the frame cap removed (one simulation tick per
+# frame) and reports frames per second plus per-phase cost from the game's
+# FrameTimer, and the arcade's launch-to-menu time, optionally as JSON.
+
+SCRIPT_KEYS = [pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT, pygame.K_SPACE]
+KEY_INTERVAL = 8  # Frames between scripted key presses
+
+STARTUP_RUNS = 5  # Fresh arcade launches timed; the median is reported
+STARTUP_TARGET_MS = 200  # Launch to menu on screen
+
+class ScriptedKeys:
+	"""BotInput policy holding one seeded random key, changed every KEY_INTERVAL ticks"""
+
+	def __init__(self, seed):
+		self.rng = random.Random(seed)
+		self.held = ()
+		self.tick = 0
+
+	def __call__(self, game):
+		if self.tick % KEY_INTERVAL == 0:
+			self.held = (self.rng.choice(SCRIPT_KEYS),)
+		self.tick += 1
+		return self.held
+
+def benchmark_game(name, game_class, screen, frames, seed):
+	"""Run one game for the given number of uncapped frames and return its results"""
+	pygame.event.clear()
+	game = game_class(screen, seed=seed)
+	game.fps = 0
+	game.input = BotInput(ScriptedKeys(seed), frames)  # One tick per frame, however fast frames come
+	# Keep every frame instead of the usual rolling window
+	game.frame_timer = FrameTimer(game.frame_timer.phases, size=frames)
+
+	start = time.perf_counter()
+	game.run()
+	elapsed = time.perf_counter() - start
+
+	timer = game.frame_timer
+	percentiles = timer.stats()
+	means = timer.means()
+	return {
+		"game": name,
+		"class": game_class.__name__,
+		"frames": timer.frames_total,
+		"seconds": elapsed,
+		"fps": timer.frames_total / elapsed if elapsed else 0.0,
+		"phases": {phase: {"mean": means[phase], "p50": p50, "p95": p95, "p99": p99}
+				   for phase, (p50, p95, p99) in percentiles.items()}
+	}
+
+def measure_startup(runs=STARTUP_RUNS):
+	"""Median milliseconds from launch to the first menu frame, over fresh arcade processes"""
+	arcade_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "arcade.py")
+	times = []
+	for _ in range(runs):
+		output = subprocess.run([sys.executable, arcade_path, "--startup-time"],
+								capture_output=True, text=True, check=True).stdout
+		times.append(float(re.search(r"Menu on screen (\d+) ms", output).group(1)))
+	return statistics.median(times)
+
+def run_benchmark(frames=600, seed=0, names=None):
+	arcade = RetroArcade()
+	results = []
+	for index, entry in sorted(arcade.games.items()):
+		name = arcade.menu.games[index]["name"]
+		if names and name not in names and entry.class_name not in names:
+			continue
+		# Import outside the timed run
+		results.append(benchmark_game(name, entry.load(), arcade.screen, frames, seed))
+	return {
+		"frames": frames,
+		"seed": seed,
+		"python": platform.python_version(),
+		"pygame": pygame.version.ver,
+		"video_driver": os.environ["SDL_VIDEODRIVER"],
+		"time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+		"startup_ms": measure_startup(),
+		"results": results
+	}
+
+def format_table(report, baseline=None):
+	previous = {}
+	if baseline:
+		previous = {result["game"]: result for result in baseline["results"]}
+	header = f"{'GAME':<20} {'FPS':>9} {'FRAME P50':>10} {'FRAME P99':>10}  SLOWEST PHASE"
+	if previous:
+		header += f"  {'VS BASELINE':>11}"
+	lines = [header, "-" * len(header)]
+	for result in report["results"]:
+		phases = result["phases"]
+		slowest = max((phase for phase in phases if phase not in ("frame", "wait")), key=lambda phase: phases[phase]["mean"])
+		line = (f"{result['game']:<20} {result['fps']:>9.1f} {phases['frame']['p50']:>9.2f}ms {phases['frame']['p99']:>9.2f}ms"
+				f"  {slowest} ({phases[slowest]['mean']:.2f}ms)")
+		old = previous.get(result["game"])
+		if old and old["fps"]:
+			line += f"  {100 * (result['fps'] / old['fps'] - 1):>+10.1f}%"
+		lines.append(line)
+
+	startup = f"\nStartup: menu on screen after {report['startup_ms']:.0f}ms (target {STARTUP_TARGET_MS}ms)"
+	if baseline and baseline.get("startup_ms"):
+		startup += f", {report['startup_ms'] - baseline['startup_ms']:+.0f}ms vs baseline"
+	lines.append(startup)
+	return "\n".join(lines)
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Headless frame-throughput benchmark for every arcade game")
+	parser.add_argument("--frames", type=int, default=600, help="frames per game")
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--games", nargs="+", default=None, help="menu names or class names (default: all)")
+	parser.add_argument("--json", dest="json_path", default=None, help="write the results to this JSON file")
+	parser.add_argument("--baseline", default=None, help="JSON file from an earlier run to compare against")
+	args = parser.parse_args(argv)
+
+	report = run_benchmark(args.frames, args.seed, args.games)
+	baseline = None
+	if args.baseline:
+		with open(args.baseline) as f:
+			baseline = json.load(f)
+	print(format_table(report, baseline))
+
+	if args.json_path:
+		with open(args.json_path, "w") as f:
+			json.dump(report, f, indent=2)
+		print(f"\nResults written to {args.json_path}")
+
+if __name__ == "__main__":
+	main(sys.argv[1:])
@@ -1,6 +1,6 @@
 import pygame
-import random
 import math
+from engine import QUALITY_HIGH, QUALITY_LOW, GameLoop, load_font, render_text
 
 # Colors
 BLACK = (0, 0, 0)
@@ -16,12 +16,15 @@ PINK = (255, 192, 203)
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 850
 
-class DonkeyKongGame:
-	def __init__(self, screen):
-		self.screen = screen
-		self.font = pygame.font.Font(None, 36)
-		self.font_large = pygame.font.Font(None, 48)
-		self.running = True
+class DonkeyKongGame(GameLoop):
+	STATE_FIELDS = ("mario_x", "mario_y", "mario_dy", "mario_on_ground", "mario_on_ladder", "mario_climbing",
+					"mario_facing_right", "barrels", "barrel_spawn_timer", "dk_throw_timer", "score", "lives", "level",
+					"game_won", "game_over")
+
+	def __init__(self, screen, seed=None):
+		GameLoop.__init__(self, screen, seed)
+		self.font = load_font(36)
+		self.font_large = load_font(48)
 
 		# Mario properties
 		self.mario_x = 50
@@ -271,9 +274,10 @@ class DonkeyKongGame:
 		# Vertical support beams
 		for x in [100, 300, 500, 700]:
 			pygame.draw.rect(self.screen, (70, 70, 70), (x, 0, 8, WINDOW_HEIGHT))
-			# Rivets on beams
-			for y in range(50, WINDOW_HEIGHT - 100, 40):
-				pygame.draw.circle(self.screen, (90, 90, 90), (x + 4, y), 3)
+			# Rivets on beams (first detail to go under load)
+			if self.quality.level == QUALITY_HIGH:
+				for y in range(50, WINDOW_HEIGHT - 100, 40):
+					pygame.draw.circle(self.screen, (90, 90, 90), (x + 4, y), 3)
 
 	def draw_platforms(self):
 		"""Draw authentic girder platforms"""
@@ -298,9 +302,10 @@ class DonkeyKongGame:
 						   (end_x, y + girder_height//2), 2)
 
 			# Rivets along the girder
-			for x in range(start_x + 20, end_x - 20, 40):
-				pygame.draw.circle(self.screen, (180, 90, 0), (x, y), 4)
-				pygame.draw.circle(self.screen, (255, 160, 20), (x, y), 2)
+			if self.quality.level > QUALITY_LOW:
+				for x in range(start_x + 20, end_x - 20, 40):
+					pygame.draw.circle(self.screen, (180, 90, 0), (x, y), 4)
+					pygame.draw.circle(self.screen, (255, 160, 20), (x, y), 2)
 
 	def draw_ladders(self):
 		"""Draw industrial ladders"""
@@ -424,10 +429,9 @@ class DonkeyKongGame:
 		mx, my = self.mario_x, self.mario_y
 
 		# Animation frame for walking
-		if abs(self.mario_dy) < 0.1 and (pygame.key.get_pressed()[pygame.K_LEFT] or
-										pygame.key.get_pressed()[pygame.K_RIGHT] or
-										pygame.key.get_pressed()[pygame.K_a] or
-										pygame.key.get_pressed()[pygame.K_d]):
+		keys = self.input.pressed()
+		if abs(self.mario_dy) < 0.1 and (keys[pygame.K_LEFT] or keys[pygame.K_RIGHT] or
+										keys[pygame.K_a] or keys[pygame.K_d]):
 			self.mario_animation_frame += 1
 
 		walk_frame = (self.mario_animation_frame // 8) % 2
@@ -520,167 +524,172 @@ class DonkeyKongGame:
 				pygame.draw.line(self.screen, (100, 50, 0),
 							   (bx, by), (line_x, line_y), 2)
 
-	def run(self):
-		clock = pygame.time.Clock()
-
-		while self.running:
-			for event in pygame.event.get():
-				if event.type == pygame.QUIT:
-					return "quit"
-				elif event.type == pygame.KEYDOWN:
-					if event.key == pygame.K_ESCAPE:
-						return "menu"
-					elif event.key == pygame.K_SPACE and self.mario_on_ground and not self.mario_on_ladder:
-						self.mario_dy = -7  # Slightly higher jump
-					elif event.key == pygame.K_r and (self.game_over or self.game_won):
-						# Restart game - Reset ALL Mario states
-						self.mario_x = 50
-						self.mario_y = WINDOW_HEIGHT - 220
-						self.mario_dy = 0
-						self.mario_on_ground = False
-						self.mario_on_ladder = False
-						self.mario_climbing = False
-						self.mario_facing_right = True
-						self.mario_animation_frame = 0
-						self.score = 0
-						self.lives = 3
-						self.level = 1
-						self.barrels.clear()
-						self.barrel_spawn_timer = 0
-						self.dk_throw_timer = 0
-						self.animation_timer = 0
-						self.game_won = False
-						self.game_over = False
-
-			if not self.game_over and not self.game_won:
-				keys = pygame.key.get_pressed()
-
-				# Check ladder collision first
-				self.check_mario_ladder_collision()
-
-				# Initialize climbing state
-				self.mario_climbing = False
-
-				# STEP 1: Handle climbing (highest priority)
-				if self.mario_on_ladder:
-					if keys[pygame.K_UP] or keys[pygame.K_w]:
-						self.mario_y -= 2.5  # Slightly slower climbing to match movement
-						self.mario_dy = 0  # Cancel gravity
-						self.mario_climbing = True
-					elif keys[pygame.K_DOWN] or keys[pygame.K_s]:
-						self.mario_y += 2.5  # Slightly slower climbing to match movement
-						self.mario_dy = 0  # Cancel gravity
-						self.mario_climbing = True
-
-				# STEP 2: Handle horizontal movement (always allowed unless climbing vertically)
-				if not self.mario_climbing:
-					if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-						self.mario_x -= 1.5  # Slower movement
-						self.mario_facing_right = False
-						if self.mario_x < 0:
-							self.mario_x = 0
-
-					if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-						self.mario_x += 1.5  # Slower movement
-						self.mario_facing_right = True
-						if self.mario_x > WINDOW_WIDTH - self.mario_width:
-							self.mario_x = WINDOW_WIDTH - self.mario_width
-
-				# STEP 3: Handle physics (only if not climbing)
-				if not self.mario_climbing:
-					# Apply gravity
-					if not self.mario_on_ground:
-						self.mario_dy += 0.5
-
-					# Apply vertical velocity
-					self.mario_y += self.mario_dy
-
-					# Check platform collisions (after movement)
-					self.check_mario_platform_collision()
-
-				# Spawn barrels
-				self.barrel_spawn_timer += 1
-				if self.barrel_spawn_timer > 150:  # Spawn every ~2.5 seconds at 60fps (less frequent)
-					self.spawn_barrel()
-					self.barrel_spawn_timer = 0
-
-				self.update_barrels()
-				self.check_barrel_collision()
-				self.check_win_condition()
-
-				# Update Donkey Kong
-				self.dk_throw_timer += 1
-
-				# Update score
-				self.score += 1
-
-			# Draw everything
-			self.screen.fill(BLACK)
-
-			# Draw construction site background
-			self.draw_background()
-
-			# Draw platforms (girders)
-			self.draw_platforms()
-
-			# Draw ladders
-			self.draw_ladders()
-
-			# Draw Donkey Kong
-			self.draw_donkey_kong()
-
-			# Draw Princess (Pauline)
-			self.draw_princess()
-
-			# Draw Mario
-			if not self.game_over:
-				self.draw_mario()
-
-			# Draw barrels
-			self.draw_barrels()
-
-			# Draw UI
-			score_text = self.font.render(f"SCORE: {self.score}", True, WHITE)
-			self.screen.blit(score_text, (10, 10))
-
-			lives_text = self.font.render(f"LIVES: {self.lives}", True, WHITE)
-			self.screen.blit(lives_text, (200, 10))
-
-			level_text = self.font.render(f"LEVEL: {self.level}", True, WHITE)
-			self.screen.blit(level_text, (350, 10))
-
-			# Game title
-			title_text = self.font_large.render("DONKEY KONG", True, RED)
-			title_rect = title_text.get_rect(center=(WINDOW_WIDTH // 2, 50))
-			self.screen.blit(title_text, title_rect)
-
-			if self.game_over:
-				game_over_text = self.font_large.render("GAME OVER!", True, RED)
-				game_over_rect = game_over_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
-				self.screen.blit(game_over_text, game_over_rect)
-
-				restart_text = self.font.render("Press R to restart, ESC for menu", True, WHITE)
-				restart_rect = restart_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 50))
-				self.screen.blit(restart_text, restart_rect)
-
-			elif self.game_won:
-				win_text = self.font_large.render("YOU SAVED THE PRINCESS!", True, GREEN)
-				win_rect = win_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
-				self.screen.blit(win_text, win_rect)
+	def update(self, dt, input):
+		"""Advance the game by one fixed 60 Hz tick"""
+		if self.game_over or self.game_won:
+			return
 
-				restart_text = self.font.render("Press R to play again, ESC for menu", True, WHITE)
-				restart_rect = restart_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 50))
-				self.screen.blit(restart_text, restart_rect)
+		up = input[pygame.K_UP] or input[pygame.K_w]
+		down = input[pygame.K_DOWN] or input[pygame.K_s]
+		left = input[pygame.K_LEFT] or input[pygame.K_a]
+		right = input[pygame.K_RIGHT] or input[pygame.K_d]
+		self.frame_timer.mark("input")
 
-			else:
-				# Instructions
-				inst_text = self.font.render("Arrow keys: Move | SPACE: Jump | Climb ladders to save the princess!", True, WHITE)
-				self.screen.blit(inst_text, (10, WINDOW_HEIGHT - 60))
+		# Check ladder collision first
+		self.check_mario_ladder_collision()
 
-				back_text = self.font.render("Press ESC to return to menu", True, WHITE)
-				self.screen.blit(back_text, (10, WINDOW_HEIGHT - 30))
+		# Initialize climbing state
+		self.mario_climbing = False
 
-			pygame.display.flip()
-			clock.tick(60)
+		# STEP 1: Handle climbing (highest priority)
+		if self.mario_on_ladder:
+			if up:
+				self.mario_y -= 2.5  # Slightly slower climbing to match movement
+				self.mario_dy = 0  # Cancel gravity
+				self.mario_climbing = True
+			elif down:
+				self.mario_y += 2.5  # Slightly slower climbing to match movement
+				self.mario_dy = 0  # Cancel gravity
+				self.mario_climbing = True
+
+		# STEP 2: Handle horizontal movement (always allowed unless climbing vertically)
+		if not self.mario_climbing:
+			if left:
+				self.mario_x -= 1.5  # Slower movement
+				self.mario_facing_right = False
+				if self.mario_x < 0:
+					self.mario_x = 0
+
+			if right:
+				self.mario_x += 1.5  # Slower movement
+				self.mario_facing_right = True
+				if self.mario_x > WINDOW_WIDTH - self.mario_width:
+					self.mario_x = WINDOW_WIDTH - self.mario_width
+
+		# STEP 3: Handle physics (only if not climbing)
+		if not self.mario_climbing:
+			# Apply gravity
+			if not self.mario_on_ground:
+				self.mario_dy += 0.5
+
+			# Apply vertical velocity
+			self.mario_y += self.mario_dy
+
+			# Check platform collisions (after movement)
+			self.check_mario_platform_collision()
+		self.frame_timer.mark("update")
+
+		# Spawn barrels
+		self.barrel_spawn_timer += 1
+		if self.barrel_spawn_timer > 150:  # Spawn every ~2.5 seconds at 60fps (less frequent)
+			self.spawn_barrel()
+			self.barrel_spawn_timer = 0
+
+		self.update_barrels()
+		self.frame_timer.mark("update")
+		self.check_barrel_collision()
+		self.check_win_condition()
+		self.frame_timer.mark("collisions")
+
+		# Update Donkey Kong
+		self.dk_throw_timer += 1
+
+		# Update score
+		self.score += 1
+		self.frame_timer.mark("update")
+
+	def render(self):
+		"""Draw the whole scene"""
+		self.screen.fill(BLACK)
+
+		# Draw construction site background
+		self.draw_background()
+
+		# Draw platforms (girders)
+		self.draw_platforms()
+
+		# Draw ladders
+		self.draw_ladders()
+
+		# Draw Donkey Kong
+		self.draw_donkey_kong()
+
+		# Draw Princess (Pauline)
+		self.draw_princess()
+
+		# Draw Mario
+		if not self.game_over:
+			self.draw_mario()
+
+		# Draw barrels
+		self.draw_barrels()
+
+		# Draw UI
+		score_text = render_text(self.font, f"SCORE: {self.score}", WHITE)
+		self.screen.blit(score_text, (10, 10))
+
+		lives_text = render_text(self.font, f"LIVES: {self.lives}", WHITE)
+		self.screen.blit(lives_text, (200, 10))
+
+		level_text = render_text(self.font, f"LEVEL: {self.level}", WHITE)
+		self.screen.blit(level_text, (350, 10))
+
+		# Game title
+		title_text = render_text(self.font_large, "DONKEY KONG", RED)
+		title_rect = title_text.get_rect(center=(WINDOW_WIDTH // 2, 50))
+		self.screen.blit(title_text, title_rect)
+
+		if self.game_over:
+			game_over_text = render_text(self.font_large, "GAME OVER!", RED)
+			game_over_rect = game_over_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
+			self.screen.blit(game_over_text, game_over_rect)
+
+			restart_text = render_text(self.font, "Press R to restart, ESC for menu", WHITE)
+			restart_rect = restart_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 50))
+			self.screen.blit(restart_text, restart_rect)
+
+		elif self.game_won:
+			win_text = render_text(self.font_large, "YOU SAVED THE PRINCESS!", GREEN)
+			win_rect = win_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
+			self.screen.blit(win_text, win_rect)
+
+			restart_text = render_text(self.font, "Press R to play again, ESC for menu", WHITE)
+			restart_rect = restart_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 50))
+			self.screen.blit(restart_text, restart_rect)
 
-		return "menu"
\ No newline at end of file
+		else:
+			# Instructions
+			inst_text = render_text(self.font, "Arrow keys: Move | SPACE: Jump | Climb ladders to save the princess!", WHITE)
+			self.screen.blit(inst_text, (10, WINDOW_HEIGHT - 60))
+
+			back_text = render_text(self.font, "Press ESC to return to menu", WHITE)
+			self.screen.blit(back_text, (10, WINDOW_HEIGHT - 30))
+
+	def handle_event(self, event):
+		if event.type != pygame.KEYDOWN:
+			return None
+		if event.key == pygame.K_SPACE and self.mario_on_ground and not self.mario_on_ladder:
+			self.mario_dy = -7  # Slightly higher jump
+		elif event.key == pygame.K_r and (self.game_over or self.game_won):
+			self.restart_game()
+		return None
+
+	def restart_game(self):
+		"""Restart game - Reset ALL Mario states"""
+		self.mario_x = 50
+		self.mario_y = WINDOW_HEIGHT - 220
+		self.mario_dy = 0
+		self.mario_on_ground = False
+		self.mario_on_ladder = False
+		self.mario_climbing = False
+		self.mario_facing_right = True
+		self.mario_animation_frame = 0
+		self.score = 0
+		self.lives = 3
+		self.level = 1
+		self.barrels.clear()
+		self.barrel_spawn_timer = 0
+		self.dk_throw_timer = 0
+		self.animation_timer = 0
+		self.game_won = False
+		self.game_over = False
\ No newline at end of file
@@ -0,0 +1,832 @@
+import time
+import pickle
+import random
+import struct
+from array import array
+from collections import OrderedDict, deque
+import pygame
+
+# Shared runtime helpers for the arcade games
+
+def init_pygame():
+	"""Start the pygame subsystems the games use: the display (with events) and fonts.
+
+	pygame.init() would also open audio, joysticks and the rest; nothing here
+	plays sound or reads a joystick, so starting them only delays the menu.
+	Safe to call more than once.
+	"""
+	pygame.display.init()
+	pygame.font.init()
+
+def resolve_seed(seed=None):
+	"""Return seed, or a fresh random one when it is None"""
+	if seed is None:
+		return random.randrange(2 ** 32)
+	return seed
+
+class GameClock:
+	"""Frame-counting game clock.
+
+	Games advance it once per simulated frame and read time from it instead of
+	the wall clock, so timers behave the same at any real speed.
+	"""
+
+	def __init__(self, fps):
+		self.fps = fps
+		self.frame = 0
+
+	def tick(self):
+		self.frame += 1
+
+	def reset(self):
+		self.frame = 0
+
+	@property
+	def ms(self):
+		"""Game time in milliseconds"""
+		return self.frame * 1000 // self.fps
+
+# Most simulation ticks run in one frame; time beyond that is dropped after a hitch
+MAX_TICKS_PER_FRAME = 5
+
+class FixedTimestep:
+	"""Accumulator that runs the simulation at a fixed rate, independent of the frame rate.
+
+	Call advance() once per rendered frame and simulate that many ticks; alpha
+	is then how far real time has moved towards the next tick (0 to 1), for
+	interpolating what is drawn.
+	"""
+
+	def __init__(self, rate, max_ticks=MAX_TICKS_PER_FRAME):
+		self.rate = rate
+		self.dt = 1.0 / rate
+		self.max_ticks = max_ticks
+		self.accumulator = 0.0
+		self.last = None
+		self.alpha = 1.0
+
+	def advance(self):
+		"""Number of ticks to simulate this frame"""
+		now = time.perf_counter()
+		if self.last is None:
+			# First frame: one tick so there is a state to draw
+			self.last = now
+			self.alpha = 1.0
+			return 1
+		self.accumulator += now - self.last
+		self.last = now
+
+		ticks = int(self.accumulator / self.dt)
+		if ticks > self.max_ticks:
+			# Too far behind to catch up; slow the game down instead of spiralling
+			ticks = self.max_ticks
+			self.accumulator = 0.0
+		else:
+			self.accumulator -= ticks * self.dt
+		self.alpha = self.accumulator / self.dt
+		return ticks
+
+	def reset(self):
+		self.accumulator = 0.0
+		self.last = None
+		self.alpha = 1.0
+
+# Rendered text surfaces kept by the shared HUD text cache
+TEXT_CACHE_SIZE = 512
+
+class TextCache:
+	"""Bounded LRU cache of rendered text surfaces, shared by every game.
+
+	Keyed by (font, text, color, antialias), so HUD strings are only rendered
+	again when their value changes. Callers must not modify the returned
+	surfaces; copy one first to fade or recolor it.
+	"""
+
+	def __init__(self, max_size=TEXT_CACHE_SIZE):
+		self.max_size = max_size
+		self.surfaces = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	def render(self, font, text, color, antialias=True):
+		key = (font, text, tuple(color), antialias)
+		surface = self.surfaces.get(key)
+		if surface is not None:
+			self.surfaces.move_to_end(key)
+			self.hits += 1
+			return surface
+
+		self.misses += 1
+		surface = font.render(text, antialias, color)
+		self.surfaces[key] = surface
+		if len(self.surfaces) > self.max_size:
+			self.surfaces.popitem(last=False)
+			self.evictions += 1
+		return surface
+
+	def clear(self):
+		self.surfaces.clear()
+
+	def stats(self):
+		lookups = self.hits + self.misses
+		return {
+			"size": len(self.surfaces),
+			"max_size": self.max_size,
+			"hits": self.hits,
+			"misses": self.misses,
+			"evictions": self.evictions,
+			"hit_rate": self.hits / lookups if lookups else 0.0
+		}
+
+text_cache = TextCache()
+
+def render_text(font, text, color, antialias=True):
+	"""font.render through the shared text cache"""
+	return text_cache.render(font, text, color, antialias)
+
+# Sizes of the default font used across the arcade, created up front by preload_fonts()
+FONT_SIZES = (22, 24, 32, 36, 40, 48, 52, 72)
+
+fonts = {}  # Size -> shared default font
+
+def load_font(size):
+	"""The default font at size, created once and shared by every game"""
+	font = fonts.get(size)
+	if font is None:
+		font = pygame.font.Font(None, size)
+		fonts[size] = font
+	return font
+
+def preload_fonts(sizes=FONT_SIZES):
+	"""Create the shared fonts now; SDL_ttf is not thread-safe, so call this from the main thread"""
+	for size in sizes:
+		load_font(size)
+
+# Frames of history kept per phase by FrameTimer (4 seconds at 60 FPS)
+FRAME_STATS_SIZE = 240
+
+# Phases of a typical run() loop, in order
+FRAME_PHASES = ("events", "input", "update", "collisions", "draw", "flip", "wait")
+
+# Key that toggles the frame timing overlay in every game
+FRAME_TIMER_KEY = pygame.K_F3
+
+class FrameTimer:
+	"""Always-on per-phase timing of a game loop.
+
+	The loop calls mark(phase) after each phase, which charges the time since
+	the previous mark to that phase (a phase may be marked several times per
+	frame), and end_frame() once per frame. Per-frame totals go into fixed-size
+	ring buffers; percentiles are only computed when asked for, so the cost
+	while the overlay is hidden is one perf_counter call per mark.
+	"""
+
+	def __init__(self, phases=FRAME_PHASES, size=FRAME_STATS_SIZE, refresh=30):
+		self.phases = phases
+		self.size = size
+		self.samples = {phase: array("d", [0.0]) * size for phase in phases}
+		self.frames = array("d", [0.0]) * size  # Whole-frame times
+		self.current = dict.fromkeys(phases, 0.0)
+		self.index = 0
+		self.count = 0
+		self.frames_total = 0  # Frames ended since creation or reset
+		self.last = time.perf_counter()
+		self.frame_start = self.last
+		self.visible = False
+		self.refresh = refresh  # Frames between overlay text updates
+		self.overlay = None
+		self.overlay_age = 0
+		self.font = None
+		self.on_frame = None  # Optional callback(timer) after every frame, e.g. scripted input
+
+	def mark(self, phase):
+		now = time.perf_counter()
+		self.current[phase] += now - self.last
+		self.last = now
+
+	def end_frame(self):
+		index = self.index
+		for phase, samples in self.samples.items():
+			samples[index] = self.current[phase]
+			self.current[phase] = 0.0
+		self.frames[index] = self.last - self.frame_start
+		self.frame_start = self.last
+		self.index = (index + 1) % self.size
+		self.count = min(self.count + 1, self.size)
+		self.frames_total += 1
+		if self.on_frame is not None:
+			self.on_frame(self)
+
+	def reset(self):
+		self.current = dict.fromkeys(self.phases, 0.0)
+		self.index = 0
+		self.count = 0
+		self.frames_total = 0
+		self.last = time.perf_counter()
+		self.frame_start = self.last
+
+	def last_busy(self):
+		"""Seconds the last frame spent working, leaving out the idle wait"""
+		last = (self.index - 1) % self.size
+		busy = self.frames[last]
+		if "wait" in self.samples:
+			busy -= self.samples["wait"][last]
+		return busy
+
+	def percentiles(self, samples, points=(50, 95, 99)):
+		"""Nearest-rank percentiles of the recorded frames, in milliseconds"""
+		if not self.count:
+			return tuple(0.0 for _ in points)
+		values = sorted(samples[:self.count])
+		last = self.count - 1
+		return tuple(1000 * values[min(last, self.count * point // 100)] for point in points)
+
+	def stats(self):
+		"""{phase: (p50, p95, p99)} in milliseconds, plus "frame" for whole frames"""
+		stats = {phase: self.percentiles(samples) for phase, samples in self.samples.items()}
+		stats["frame"] = self.percentiles(self.frames)
+		return stats
+
+	def means(self):
+		"""{phase: mean} in milliseconds, plus "frame" for whole frames"""
+		count = self.count or 1
+		means = {phase: 1000 * sum(samples[:self.count]) / count for phase, samples in self.samples.items()}
+		means["frame"] = 1000 * sum(self.frames[:self.count]) / count
+		return means
+
+	def rows(self):
+		"""Header and one (phase, p50, p95, p99) row of text per phase"""
+		rows = [("PHASE (ms)", "P50", "P95", "P99")]
+		for phase, values in self.stats().items():
+			rows.append((phase,) + tuple(f"{value:.2f}" for value in values))
+		return rows
+
+	def handle_event(self, event):
+		"""Toggle the overlay on the hotkey; returns True if the event was used"""
+		if event.type == pygame.KEYDOWN and event.key == FRAME_TIMER_KEY:
+			self.visible = not self.visible
+			self.overlay = None
+			return True
+		return False
+
+	def draw(self, surface, position=(8, 8)):
+		"""Blit the overlay when visible; returns its rect, or None"""
+		if not self.visible:
+			return None
+		self.overlay_age += 1
+		if self.overlay is None or self.overlay_age >= self.refresh:
+			self.overlay = self.build_overlay()
+			self.overlay_age = 0
+		return surface.blit(self.overlay, position)
+
+	def build_overlay(self):
+		if self.font is None:
+			self.font = load_font(22)
+		# Stats change every refresh, so these cells bypass the shared text cache
+		rows = [[self.font.render(text, True, (255, 255, 255)) for text in row] for row in self.rows()]
+		widths = [max(row[column].get_width() for row in rows) + 12 for column in range(len(rows[0]))]
+		line_height = self.font.get_linesize()
+		overlay = pygame.Surface((sum(widths) + 12, line_height * len(rows) + 12))
+		overlay.set_alpha(200)
+		for i, row in enumerate(rows):
+			x = 6
+			for column, cell in enumerate(row):
+				# Phase names left-aligned, numbers right-aligned
+				offset = 0 if column == 0 else widths[column] - cell.get_width()
+				overlay.blit(cell, (x + offset, 6 + i * line_height))
+				x += widths[column]
+		return overlay
+
+# Cosmetic detail levels, consulted by draw code
+QUALITY_LOW = 0
+QUALITY_MEDIUM = 1
+QUALITY_HIGH = 2
+
+class QualityGovernor:
+	"""Chooses how much decoration to draw from the measured frame cost.
+
+	Games record each frame's busy time (everything but the idle wait) and
+	their draw code checks level. A run of frames over budget drops the level
+	one step; a longer unbroken run with plenty of headroom raises it again.
+	Set fixed to pin a level.
+	"""
+
+	def __init__(self, fps=60, high_water=0.85, low_water=0.5, degrade_after=10, recover_after=180):
+		self.budget = 1.0 / fps
+		self.high_water = high_water  # Fraction of the budget that counts as slow
+		self.low_water = low_water  # Fraction of the budget that leaves room to recover
+		self.degrade_after = degrade_after
+		self.recover_after = recover_after
+		self.level = QUALITY_HIGH
+		self.fixed = None
+		self.slow_frames = 0
+		self.fast_frames = 0
+
+	def record(self, busy):
+		"""Account one frame that took busy seconds of work"""
+		if self.fixed is not None:
+			self.level = self.fixed
+			return
+
+		if busy > self.budget * self.high_water:
+			self.slow_frames += 1
+			self.fast_frames = 0
+		else:
+			self.slow_frames = max(0, self.slow_frames - 1)
+			self.fast_frames = self.fast_frames + 1 if busy < self.budget * self.low_water else 0
+
+		if self.slow_frames >= self.degrade_after and self.level > QUALITY_LOW:
+			self.level -= 1
+			self.slow_frames = 0
+			self.fast_frames = 0
+		elif self.fast_frames >= self.recover_after and self.level < QUALITY_HIGH:
+			self.level += 1
+			self.fast_frames = 0
+
+	def observe(self, frame_timer):
+		"""Record the frame frame_timer just ended"""
+		self.record(frame_timer.last_busy())
+
+# Keys the games poll with pygame.key.get_pressed(); bit i of a key mask is POLLED_KEYS[i]
+POLLED_KEYS = (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT,
+			   pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d, pygame.K_SPACE, pygame.K_BACKSPACE)
+KEY_BITS = {key: 1 << bit for bit, key in enumerate(POLLED_KEYS)}
+
+def key_mask(pressed):
+	"""Bitmask of the polled keys held in a pygame.key.get_pressed() result"""
+	mask = 0
+	for key, bit in KEY_BITS.items():
+		if pressed[key]:
+			mask |= bit
+	return mask
+
+class KeyState:
+	"""Held keys as a key mask; indexed like pygame.key.get_pressed().
+
+	This is the per-tick input snapshot every input source hands to a game's
+	update(), whether the keys came from the keyboard, a log or a bot.
+	"""
+
+	def __init__(self, mask=0):
+		self.mask = mask
+
+	def __getitem__(self, key):
+		return bool(self.mask & KEY_BITS.get(key, 0))
+
+class InputLog:
+	"""Compact binary log of one game session, for deterministic replay.
+
+	Holds the game's class name and seed, then for each rendered frame the
+	KEYDOWN events and mouse clicks, the held-key mask and the number of
+	simulation ticks run. The mask and tick count are only written when they
+	change, and runs of frames with nothing new are stored as a count.
+	"""
+
+	MAGIC = b"ALOG"
+	VERSION = 1
+
+	# Opcodes; a frame is any number of KEY/CLICK/MASK/TICKS followed by FRAME
+	FRAME = 1
+	FRAMES = 2  # u16 count of frames with nothing new
+	KEY = 3  # u32 key code
+	CLICK = 4  # u8 button, u16 x, u16 y
+	MASK = 5  # u16 key mask
+	TICKS = 6  # u8 ticks per frame
+
+	def __init__(self, game, seed, data=b"", frames=0):
+		self.game = game
+		self.seed = seed
+		self.data = bytearray(data)
+		self.frames = frames
+		self.mask = 0
+		self.ticks = 1
+		self.idle = 0
+
+	def record_frame(self, events, mask, ticks):
+		ops = bytearray()
+		for event in events:
+			if event.type == pygame.KEYDOWN:
+				ops += struct.pack("<BI", self.KEY, event.key)
+			elif event.type == pygame.MOUSEBUTTONDOWN:
+				ops += struct.pack("<BBHH", self.CLICK, event.button, *event.pos)
+		if mask != self.mask:
+			ops += struct.pack("<BH", self.MASK, mask)
+			self.mask = mask
+		if ticks != self.ticks:
+			ops += struct.pack("<BB", self.TICKS, ticks)
+			self.ticks = ticks
+
+		self.frames += 1
+		if not ops:
+			self.idle += 1
+			return
+		self.flush_idle()
+		self.data += ops
+		self.data.append(self.FRAME)
+
+	def flush_idle(self):
+		while self.idle:
+			count = min(self.idle, 0xFFFF)
+			self.data += struct.pack("<BH", self.FRAMES, count)
+			self.idle -= count
+
+	def replay_frames(self):
+		"""Yield (events, mask, ticks) per frame; events are ("key", key) or ("click", button, (x, y))"""
+		data = self.data
+		mask = 0
+		ticks = 1
+		events = []
+		offset = 0
+		while offset < len(data):
+			op = data[offset]
+			offset += 1
+			if op == self.FRAME:
+				yield events, mask, ticks
+				events = []
+			elif op == self.FRAMES:
+				count, = struct.unpack_from("<H", data, offset)
+				offset += 2
+				for _ in range(count):
+					yield [], mask, ticks
+			elif op == self.KEY:
+				key, = struct.unpack_from("<I", data, offset)
+				offset += 4
+				events.append(("key", key))
+			elif op == self.CLICK:
+				button, x, y = struct.unpack_from("<BHH", data, offset)
+				offset += 5
+				events.append(("click", button, (x, y)))
+			elif op == self.MASK:
+				mask, = struct.unpack_from("<H", data, offset)
+				offset += 2
+			elif op == self.TICKS:
+				ticks = data[offset]
+				offset += 1
+			else:
+				raise ValueError(f"Bad input log opcode {op} at byte {offset - 1}")
+
+	def to_bytes(self):
+		self.flush_idle()
+		name = self.game.encode()
+		header = self.MAGIC + struct.pack("<BB", self.VERSION, len(name)) + name + struct.pack("<QI", self.seed, self.frames)
+		return header + bytes(self.data)
+
+	@classmethod
+	def from_bytes(cls, blob):
+		if blob[:4] != cls.MAGIC:
+			raise ValueError("Not an input log")
+		version, name_length = struct.unpack_from("<BB", blob, 4)
+		if version != cls.VERSION:
+			raise ValueError(f"Unsupported input log version {version}")
+		offset = 6 + name_length
+		game = blob[6:offset].decode()
+		seed, frames = struct.unpack_from("<QI", blob, offset)
+		return cls(game, seed, blob[offset + 12:], frames)
+
+	def save(self, path):
+		with open(path, "wb") as f:
+			f.write(self.to_bytes())
+
+	@classmethod
+	def load(cls, path):
+		with open(path, "rb") as f:
+			return cls.from_bytes(f.read())
+
+# Input sources (LiveInput, ReplayInput, BotInput) share one interface. Each frame
+# the game loop calls events() once for discrete events and ticks(timestep) once,
+# then poll(game) once per simulation tick for that tick's KeyState; pressed()
+# is the latest KeyState, for drawing.
+
+class LiveInput:
+	"""The real keyboard and event queue, optionally recorded into an InputLog.
+
+	The keyboard is read once per frame into a KeyState, so every tick of the
+	frame sees the same keys and games never poll pygame themselves. Without a
+	display there is no keyboard: no events arrive and no keys are held.
+	"""
+
+	def __init__(self, log=None):
+		self.log = log
+		self.keys = None
+		self.frame_events = []
+
+	def events(self):
+		if not pygame.display.get_init():
+			self.frame_events = []
+			self.keys = KeyState()
+			return self.frame_events
+		self.frame_events = pygame.event.get()
+		self.keys = KeyState(key_mask(pygame.key.get_pressed()))
+		return self.frame_events
+
+	def pressed(self):
+		if self.keys is None:
+			self.keys = KeyState(key_mask(pygame.key.get_pressed()) if pygame.display.get_init() else 0)
+		return self.keys
+
+	def poll(self, game):
+		return self.pressed()
+
+	def ticks(self, timestep):
+		ticks = timestep.advance()
+		if self.log is not None:
+			self.log.record_frame(self.frame_events, self.pressed().mask, ticks)
+		return ticks
+
+class ReplayInput:
+	"""Plays an InputLog back through the same calls as LiveInput.
+
+	Live input is ignored apart from closing the window. Once the log runs
+	out the game gets a QUIT event.
+	"""
+
+	def __init__(self, log):
+		self.log = log
+		self.frames = log.replay_frames()
+		self.keys = KeyState()
+		self.frame_ticks = 0
+		self.finished = False
+
+	def events(self):
+		quit_events = pygame.event.get(pygame.QUIT)
+		pygame.event.clear()
+		frame = next(self.frames, None)
+		if frame is None or quit_events:
+			self.finished = True
+			self.frame_ticks = 0
+			return [pygame.event.Event(pygame.QUIT)]
+
+		recorded, mask, self.frame_ticks = frame
+		self.keys = KeyState(mask)
+		events = []
+		for event in recorded:
+			if event[0] == "key":
+				events.append(pygame.event.Event(pygame.KEYDOWN, key=event[1], mod=0, unicode="", scancode=0))
+			else:
+				events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=event[1], pos=event[2]))
+		return events
+
+	def pressed(self):
+		return self.keys
+
+	def poll(self, game):
+		return self.keys
+
+	def ticks(self, timestep):
+		return self.frame_ticks
+
+class BotInput:
+	"""Scripted input: policy(game) picks the keys to hold every tick.
+
+	policy returns an iterable of POLLED_KEYS (or None for no keys). A key
+	that becomes held also arrives as a KEYDOWN event at the start of the
+	next frame, as from a keyboard. Every frame is one tick whatever the wall
+	clock says, and the game gets a QUIT event after frames frames (if given)
+	or when its window is closed; other real events are dropped. With fps 0
+	and draw_frames off a game runs headless at full speed.
+	"""
+
+	def __init__(self, policy, frames=None):
+		self.policy = policy
+		self.frames = frames
+		self.frame = 0
+		self.keys = KeyState()
+		self.new_keys = 0  # Mask of keys pressed since the last events()
+
+	def events(self):
+		if pygame.display.get_init():
+			quit_events = pygame.event.get(pygame.QUIT)
+			pygame.event.clear()
+			if quit_events:
+				return [pygame.event.Event(pygame.QUIT)]
+		if self.frames is not None and self.frame >= self.frames:
+			return [pygame.event.Event(pygame.QUIT)]
+		self.frame += 1
+
+		events = []
+		if self.new_keys:
+			for key, bit in KEY_BITS.items():
+				if self.new_keys & bit:
+					events.append(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0))
+			self.new_keys = 0
+		return events
+
+	def pressed(self):
+		return self.keys
+
+	def poll(self, game):
+		mask = 0
+		for key in self.policy(game) or ():
+			mask |= KEY_BITS[key]
+		self.new_keys |= mask & ~self.keys.mask
+		self.keys = KeyState(mask)
+		return self.keys
+
+	def ticks(self, timestep):
+		return 1
+
+# Held to rewind the game one tick per tick
+REWIND_KEY = pygame.K_BACKSPACE
+REWIND_SECONDS = 10
+
+class Frozen(bytes):
+	"""A list or dict inside a snapshot, pickled"""
+
+def freeze(value):
+	"""Immutable deep copy of plain game data; lists and dicts are pickled, other values kept as they are"""
+	kind = type(value)
+	if kind is list or kind is dict:
+		return Frozen(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+	return value
+
+def thaw(value):
+	"""Fresh mutable copy of frozen game data"""
+	if type(value) is Frozen:
+		return pickle.loads(value)
+	return value
+
+def freeze_object(obj):
+	"""Frozen copy of an object's attributes; references to shared objects (RNG, path table) are kept.
+
+	Attributes named in the class's TRANSIENT dict, such as wall-clock
+	profiling, are left out and come back as the values given there.
+	"""
+	transient = getattr(obj, "TRANSIENT", ())
+	return obj.__class__, tuple((name, freeze(value)) for name, value in vars(obj).items() if name not in transient)
+
+def thaw_object(frozen):
+	cls, attributes = frozen
+	obj = cls.__new__(cls)
+	obj.__dict__.update(getattr(cls, "TRANSIENT", ()))
+	for name, value in attributes:
+		obj.__dict__[name] = thaw(value)
+	return obj
+
+def snapshot_state(obj, fields):
+	"""Frozen copy of the named attributes plus the state of obj.rng"""
+	state = {name: freeze(getattr(obj, name)) for name in fields}
+	state["rng"] = obj.rng.getstate()
+	return state
+
+def restore_state(obj, state):
+	for name, value in state.items():
+		if name == "rng":
+			obj.rng.setstate(value)
+		else:
+			setattr(obj, name, thaw(value))
+
+class StateHistory:
+	"""Fixed-size rewind buffer of game snapshots, stored as deltas.
+
+	A snapshot is a dict of frozen fields. Only the newest one is kept whole;
+	every older tick is kept as the previous values of just the fields that
+	changed, so stepping back applies one small dict and the oldest tick can
+	be dropped without touching the rest.
+	"""
+
+	def __init__(self, rate, seconds=REWIND_SECONDS):
+		self.deltas = deque(maxlen=rate * seconds)
+		self.current = None
+
+	def __len__(self):
+		return len(self.deltas)
+
+	def clear(self):
+		self.deltas.clear()
+		self.current = None
+
+	def push(self, state):
+		current = self.current
+		if current is not None:
+			self.deltas.append({name: value for name, value in current.items() if state.get(name) != value})
+		self.current = state
+
+	def rewind(self):
+		"""Step back one tick and return that snapshot, or None at the oldest"""
+		if not self.deltas:
+			return None
+		state = dict(self.current)
+		state.update(self.deltas.pop())
+		self.current = state
+		return state
+
+class GameLoop:
+	"""Base class of the games: owns the frame loop, timing, event dispatch and instrumentation.
+
+	A game calls GameLoop.__init__ first and implements update(dt, input), one
+	fixed simulation tick given the KeyState held for it, and render(), which
+	draws the current state onto the screen and returns the rects that
+	changed for pygame.display.update, or None after redrawing everything.
+	render() deliberately takes no target surface: every game, its HUD and
+	its overlays draw to self.screen, so an argument would be ignored.
+	Optional hooks: handle_event(event) for key presses and clicks, returning
+	"menu" or "quit" to leave; invalidate() when something else drew over the
+	screen; snapshot() and restore(state) when STATE_FIELDS is not the whole
+	state.
+
+	run() pumps events from self.input (live, replayed or a bot), leaves on
+	ESC or QUIT, polls one KeyState per tick and runs update at the fixed rate
+	or rewinds while REWIND_KEY is held, renders unless draw_frames is off or
+	the game is headless (screen None), caps the frame rate at fps and marks
+	every phase on frame_timer.
+	"""
+
+	# Everything update() changes; the rest is fixed at startup or only drawn
+	STATE_FIELDS = ()
+
+	def __init__(self, screen, seed=None, rate=60, phases=FRAME_PHASES):
+		self.screen = screen
+		self.seed = resolve_seed(seed)
+		self.rng = random.Random(self.seed)
+		self.running = True  # Cleared to leave run() for the menu
+		self.clock = pygame.time.Clock()
+		self.frame_timer = FrameTimer(phases)
+		self.fps = rate  # Frame cap in run(); 0 removes it
+		self.timestep = FixedTimestep(rate)  # Simulation rate, independent of the frame rate
+		self.quality = QualityGovernor()  # Sheds cosmetic detail when frames run long
+		self.input = LiveInput()  # A ReplayInput plays back a recorded InputLog instead
+		self.draw_frames = True  # False skips drawing, e.g. for max-speed replays
+		self.history = StateHistory(rate)  # Recent ticks for rewinding
+
+	def update(self, dt, input):
+		"""Advance the simulation by one tick of dt seconds with the keys in input held"""
+		raise NotImplementedError
+
+	def render(self):
+		"""Draw the current state; returns the changed rects, or None for the whole screen"""
+		raise NotImplementedError
+
+	def handle_event(self, event):
+		"""Game-specific events; return "menu" or "quit" to leave run()"""
+		return None
+
+	def invalidate(self):
+		"""Something else drew over the screen; the next render must redraw it all"""
+
+	def snapshot(self):
+		"""Capture the simulation state for rewinding"""
+		return snapshot_state(self, self.STATE_FIELDS)
+
+	def restore(self, state):
+		restore_state(self, state)
+
+	def rewind(self):
+		"""Step back one tick while the rewind key is held"""
+		state = self.history.rewind()
+		if state is not None:
+			self.restore(state)
+
+	def tick(self):
+		"""One simulation tick, or one tick back while the rewind key is held"""
+		keys = self.input.poll(self)
+		if keys[REWIND_KEY]:
+			self.rewind()
+		else:
+			self.update(self.timestep.dt, keys)
+			self.history.push(self.snapshot())
+
+	def run(self):
+		"""Play until the player leaves; returns "menu" or "quit" """
+		frame_timer = self.frame_timer
+		frame_timer.reset()  # Leave out the time since the game was built, e.g. idling in the menu
+		self.history.push(self.snapshot())
+
+		while self.running:
+			for event in self.input.events():
+				if frame_timer.handle_event(event):
+					# Redraw fully once the overlay is hidden again
+					self.invalidate()
+					continue
+				if event.type == pygame.QUIT:
+					return "quit"
+				if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+					return "menu"
+				result = self.handle_event(event)
+				if result is not None:
+					return result
+			frame_timer.mark("events")
+
+			for _ in range(self.input.ticks(self.timestep)):
+				self.tick()
+				frame_timer.mark("update")
+
+			if self.draw_frames and self.screen is not None:
+				dirty_rects = self.render()
+				overlay_rect = frame_timer.draw(self.screen)
+				if overlay_rect and dirty_rects is not None:
+					dirty_rects.append(overlay_rect)
+				frame_timer.mark("draw")
+
+				# Update the display - only the changed parts unless everything was redrawn
+				if dirty_rects is None:
+					pygame.display.flip()
+				else:
+					pygame.display.update(dirty_rects)
+				frame_timer.mark("flip")
+			self.clock.tick(self.fps)
+			frame_timer.mark("wait")
+			frame_timer.end_frame()
+			self.quality.observe(frame_timer)
+
+		return "menu"
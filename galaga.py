@@ -1,6 +1,6 @@
 import pygame
-import random
 import math
+from engine import QUALITY_HIGH, QUALITY_LOW, GameLoop, load_font, render_text
 
 # Colors
 BLACK = (0, 0, 0)
@@ -17,12 +17,14 @@ GRAY = (128, 128, 128)
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 850
 
-class GalagaGame:
-	def __init__(self, screen):
-		self.screen = screen
-		self.font = pygame.font.Font(None, 36)
-		self.font_large = pygame.font.Font(None, 48)
-		self.running = True
+class GalagaGame(GameLoop):
+	STATE_FIELDS = ("player_x", "bullets", "enemies", "enemy_bullets", "score", "lives", "game_over", "stage",
+					"enemies_spawned", "spawn_timer", "animation_frame", "stars", "wave_complete", "next_wave_timer")
+
+	def __init__(self, screen, seed=None):
+		GameLoop.__init__(self, screen, seed)
+		self.font = load_font(36)
+		self.font_large = load_font(48)
 
 		# Player
 		self.player_x = WINDOW_WIDTH // 2
@@ -62,44 +64,37 @@ class GalagaGame:
 		stars = []
 		for _ in range(80):
 			star = {
-				'x': random.randint(0, WINDOW_WIDTH),
-				'y': random.randint(0, WINDOW_HEIGHT - 120),
-				'speed': random.uniform(0.5, 2.0),
-				'brightness': random.randint(100, 255)
+				'x': self.rng.randint(0, WINDOW_WIDTH),
+				'y': self.rng.randint(0, WINDOW_HEIGHT - 120),
+				'speed': self.rng.uniform(0.5, 2.0),
+				'brightness': self.rng.randint(100, 255)
 			}
 			stars.append(star)
 		return stars
 
-	def run(self):
-		clock = pygame.time.Clock()
-
-		while self.running:
-			for event in pygame.event.get():
-				if event.type == pygame.QUIT:
-					return "quit"
-				elif event.type == pygame.KEYDOWN:
-					if event.key == pygame.K_ESCAPE:
-						return "menu"
-					elif event.key == pygame.K_SPACE and not self.game_over:
-						self.shoot()
-					elif event.key == pygame.K_r and self.game_over:
-						self.restart_game()
-
-			if not self.game_over:
-				# Handle continuous input
-				keys = pygame.key.get_pressed()
-				if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-					self.player_x = max(20, self.player_x - self.player_speed)
-				if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-					self.player_x = min(WINDOW_WIDTH - self.player_width - 20, self.player_x + self.player_speed)
-
-				self.update_game()
-
-			self.draw_everything()
-			pygame.display.flip()
-			clock.tick(60)
-
-		return "menu"
+	def handle_event(self, event):
+		if event.type != pygame.KEYDOWN:
+			return None
+		if event.key == pygame.K_SPACE and not self.game_over:
+			self.shoot()
+		elif event.key == pygame.K_r and self.game_over:
+			self.restart_game()
+		return None
+
+	def update(self, dt, input):
+		"""Advance the game by one fixed 60 Hz tick"""
+		if self.game_over:
+			return
+
+		# Handle continuous input
+		if input[pygame.K_LEFT] or input[pygame.K_a]:
+			self.player_x = max(20, self.player_x - self.player_speed)
+		if input[pygame.K_RIGHT] or input[pygame.K_d]:
+			self.player_x = min(WINDOW_WIDTH - self.player_width - 20, self.player_x + self.player_speed)
+		self.frame_timer.mark("input")
+
+		self.update_game()
+		self.frame_timer.mark("update")
 
 	def shoot(self):
 		"""Player shoots a bullet"""
@@ -134,7 +129,7 @@ class GalagaGame:
 				enemy_type = 'boss'
 
 			# Entry pattern - enemies fly in from sides
-			entry_side = random.choice(['left', 'right'])
+			entry_side = self.rng.choice(['left', 'right'])
 			if entry_side == 'left':
 				start_x = -50
 				curve_direction = 1
@@ -168,7 +163,7 @@ class GalagaGame:
 			star['y'] += star['speed']
 			if star['y'] > WINDOW_HEIGHT - 120:
 				star['y'] = 0
-				star['x'] = random.randint(0, WINDOW_WIDTH)
+				star['x'] = self.rng.randint(0, WINDOW_WIDTH)
 
 		# Spawn enemies
 		self.spawn_enemy_wave()
@@ -184,11 +179,14 @@ class GalagaGame:
 		# Update enemies
 		self.update_enemies()
 
+		self.frame_timer.mark("update")
+
 		# Check bullet-enemy collisions
 		self.check_collisions()
+		self.frame_timer.mark("collisions")
 
 		# Enemy shooting
-		if random.random() < 0.02:  # 2% chance per frame
+		if self.rng.random() < 0.02:  # 2% chance per frame
 			self.enemy_shoot()
 
 		# Update enemy bullets
@@ -197,8 +195,11 @@ class GalagaGame:
 			if bullet['y'] > WINDOW_HEIGHT:
 				self.enemy_bullets.remove(bullet)
 
+		self.frame_timer.mark("update")
+
 		# Check enemy bullet hits player
 		self.check_player_hit()
+		self.frame_timer.mark("collisions")
 
 		# Check wave complete
 		formation_enemies = [e for e in self.enemies if e['state'] == 'formation']
@@ -239,7 +240,7 @@ class GalagaGame:
 				enemy['y'] = enemy['target_y'] + math.sin(self.animation_frame * 0.05 + enemy['target_x'] * 0.01) * 5
 
 				# Randomly decide to dive
-				if random.random() < 0.001:  # Very low chance
+				if self.rng.random() < 0.001:  # Very low chance
 					enemy['state'] = 'diving'
 					enemy['dive_timer'] = 0
 
@@ -258,9 +259,9 @@ class GalagaGame:
 
 				# If went off screen, remove or return to formation
 				if enemy['y'] > WINDOW_HEIGHT:
-					if random.random() < 0.7:  # 70% chance to return
+					if self.rng.random() < 0.7:  # 70% chance to return
 						enemy['state'] = 'entering'
-						enemy['x'] = random.choice([-50, WINDOW_WIDTH + 50])
+						enemy['x'] = self.rng.choice([-50, WINDOW_WIDTH + 50])
 						enemy['y'] = 100
 						enemy['curve_direction'] = 1 if enemy['x'] < 0 else -1
 					else:
@@ -294,7 +295,7 @@ class GalagaGame:
 
 		shooters = formation_enemies + diving_enemies
 		if shooters:
-			shooter = random.choice(shooters)
+			shooter = self.rng.choice(shooters)
 			bullet = {
 				'x': shooter['x'],
 				'y': shooter['y'] + 12,
@@ -335,17 +336,23 @@ class GalagaGame:
 		self.enemies.clear()
 		self.enemy_bullets.clear()
 
-	def draw_everything(self):
+	def render(self):
 		"""Draw all game elements"""
 		# Space background
 		self.screen.fill(BLACK)
 
-		# Draw stars
-		for star in self.stars:
-			alpha = int(star['brightness'] * (0.3 + 0.7 * abs(math.sin(self.animation_frame * 0.02 + star['x'] * 0.01))))
-			alpha = max(0, min(255, alpha))  # Clamp between 0 and 255
-			color = (alpha, alpha, alpha)
-			pygame.draw.circle(self.screen, color, (int(star['x']), int(star['y'])), 1)
+		# Draw stars - every other one at medium quality, a quarter without twinkling at low
+		if self.quality.level == QUALITY_LOW:
+			for star in self.stars[::4]:
+				color = (star['brightness'],) * 3
+				pygame.draw.circle(self.screen, color, (int(star['x']), int(star['y'])), 1)
+		else:
+			stars = self.stars if self.quality.level == QUALITY_HIGH else self.stars[::2]
+			for star in stars:
+				alpha = int(star['brightness'] * (0.3 + 0.7 * abs(math.sin(self.animation_frame * 0.02 + star['x'] * 0.01))))
+				alpha = max(0, min(255, alpha))  # Clamp between 0 and 255
+				color = (alpha, alpha, alpha)
+				pygame.draw.circle(self.screen, color, (int(star['x']), int(star['y'])), 1)
 
 		# Draw player
 		self.draw_player()
@@ -439,29 +446,29 @@ class GalagaGame:
 	def draw_ui(self):
 		"""Draw user interface"""
 		# Score
-		score_text = self.font.render(f"Score: {self.score}", True, WHITE)
+		score_text = render_text(self.font, f"Score: {self.score}", WHITE)
 		self.screen.blit(score_text, (20, 20))
 
 		# Lives
-		lives_text = self.font.render(f"Lives: {self.lives}", True, WHITE)
+		lives_text = render_text(self.font, f"Lives: {self.lives}", WHITE)
 		self.screen.blit(lives_text, (20, 60))
 
 		# Stage
-		stage_text = self.font.render(f"Stage: {self.stage}", True, WHITE)
+		stage_text = render_text(self.font, f"Stage: {self.stage}", WHITE)
 		self.screen.blit(stage_text, (WINDOW_WIDTH - 150, 20))
 
 		# Title
-		title_text = self.font_large.render("G A L A G A", True, YELLOW)
+		title_text = render_text(self.font_large, "G A L A G A", YELLOW)
 		title_rect = title_text.get_rect(center=(WINDOW_WIDTH // 2, 40))
 		self.screen.blit(title_text, title_rect)
 
 		# Controls
-		controls_text = self.font.render("A/D or ←→: Move | SPACE: Shoot | ESC: Menu", True, GRAY)
+		controls_text = render_text(self.font, "A/D or ←→: Move | SPACE: Shoot | ESC: Menu", GRAY)
 		self.screen.blit(controls_text, (20, WINDOW_HEIGHT - 40))
 
 		# Wave complete message
 		if self.wave_complete:
-			ready_text = self.font_large.render(f"STAGE {self.stage} READY", True, CYAN)
+			ready_text = render_text(self.font_large, f"STAGE {self.stage} READY", CYAN)
 			ready_rect = ready_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
 			self.screen.blit(ready_text, ready_rect)
 
@@ -474,22 +481,22 @@ class GalagaGame:
 		self.screen.blit(overlay, (0, 0))
 
 		# Game over text
-		game_over_text = self.font_large.render("GAME OVER", True, RED)
+		game_over_text = render_text(self.font_large, "GAME OVER", RED)
 		game_over_rect = game_over_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 100))
 		self.screen.blit(game_over_text, game_over_rect)
 
 		# Final score
-		score_text = self.font_large.render(f"Final Score: {self.score}", True, WHITE)
+		score_text = render_text(self.font_large, f"Final Score: {self.score}", WHITE)
 		score_rect = score_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 50))
 		self.screen.blit(score_text, score_rect)
 
 		# Stage reached
-		stage_text = self.font.render(f"Stage Reached: {self.stage}", True, WHITE)
+		stage_text = render_text(self.font, f"Stage Reached: {self.stage}", WHITE)
 		stage_rect = stage_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 10))
 		self.screen.blit(stage_text, stage_rect)
 
 		# Restart instructions
-		restart_text = self.font.render("Press R to restart | ESC for menu", True, YELLOW)
+		restart_text = render_text(self.font, "Press R to restart | ESC for menu", YELLOW)
 		restart_rect = restart_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 50))
 		self.screen.blit(restart_text, restart_rect)
 
@@ -0,0 +1,189 @@
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+# Tournaments never open a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from pacman import Game, MazeSpec, DIRECTIONS
+
+# Ghost personality tournament: runs many seeded headless Pac-Man games with a
+# scripted Pac-Man across a process pool, sweeping ghost personality mixes and
+# level_difficulty parameters, and prints one aggregated row per combination.
+
+PERSONALITY_MIXES = {
+	"classic": ("aggressive", "ambush", "patrol", "unpredictable"),
+	"all-aggressive": ("aggressive",) * 4,
+	"all-ambush": ("ambush",) * 4,
+	"all-patrol": ("patrol",) * 4,
+	"all-unpredictable": ("unpredictable",) * 4,
+	"pincer": ("aggressive", "ambush", "aggressive", "ambush")
+}
+
+DIFFICULTIES = {
+	"default": {},
+	"fast-ghosts": {"ghost_speedup": 0.6},  # Ghost move delays 6/3/2 over levels 1-3, against 6/4/3 by default
+	"short-power": {"power_duration_start": 120, "power_duration_min": 60}
+}
+
+DANGER_DISTANCE = 3  # Bot flees ghosts this close
+HUNT_DISTANCE = 6  # Bot chases frightened ghosts this close
+
+def bot_action(game):
+	"""Greedy scripted Pac-Man: flee close ghosts, hunt frightened ones, else eat the nearest dot"""
+	pacman = game.pacman
+	table = game.path_table
+	field = game.update_pacman_field()
+	width = table.width
+	cell = pacman.y * width + pacman.x
+
+	threats = []
+	prey = []
+	for ghost in game.ghosts:
+		distance = field.distance(ghost.x, ghost.y)
+		if distance is None or ghost.eaten:
+			continue
+		if ghost.vulnerable:
+			if distance <= HUNT_DISTANCE:
+				prey.append((distance, ghost.x, ghost.y))
+		elif distance <= DANGER_DISTANCE:
+			threats.append(ghost)
+
+	if threats:
+		# Step to the neighbour that is furthest from the closest threat
+		best_move = None
+		best_distance = -1
+		for d, neighbour in table.neighbours[cell]:
+			x, y = neighbour % width, neighbour // width
+			distance = min(table.distance(x, y, ghost.x, ghost.y) or 0 for ghost in threats)
+			if distance > best_distance:
+				best_distance = distance
+				best_move = DIRECTIONS[d]
+		return best_move
+
+	if prey:
+		_, target_x, target_y = min(prey)
+		return table.next_direction(pacman.x, pacman.y, target_x, target_y)
+
+	nearest = None
+	for cell, item in enumerate(game.maze.cells):
+		if item == 2 or item == 4:
+			x, y = cell % width, cell // width
+			distance = field.distance(x, y)
+			if distance is not None and (nearest is None or distance < nearest[0]):
+				nearest = (distance, x, y)
+	if nearest is None:
+		return None
+	return table.next_direction(pacman.x, pacman.y, nearest[1], nearest[2])
+
+def run_match(mix_name, difficulty_name, seed, max_ticks, start_level, maze_file=None):
+	"""Play one headless game to game over (or max_ticks) and return its metrics"""
+	# Loading a maze file reads its compiled path table from the disk cache
+	game = Game(headless=True, seed=seed, maze_spec=MazeSpec.load(maze_file) if maze_file else None)
+	game.difficulty = DIFFICULTIES[difficulty_name]
+	personalities = PERSONALITY_MIXES[mix_name]
+	game.ghost_setup = [(x, y, color, personalities[index % len(personalities)])
+						for index, (x, y, color, _) in enumerate(game.ghost_setup)]
+	game.level = start_level
+	game.pacman.set_level_speed(start_level)
+	game.ghosts = game.create_ghosts()
+
+	dots_eaten = 0
+	decisions = 0
+	decision_time = 0.0
+	ticks = 0
+	while ticks < max_ticks and not game.game_over:
+		items_left = game.dots_remaining + game.super_dots_remaining
+		game.step(bot_action(game))
+		dots_eaten += items_left - (game.dots_remaining + game.super_dots_remaining)
+		ticks += 1
+		if game.show_win_dialog:
+			# next_level replaces the ghosts, so bank their counters first
+			decisions += sum(ghost.decisions for ghost in game.ghosts)
+			decision_time += sum(ghost.decision_time for ghost in game.ghosts)
+			game.next_level()
+
+	decisions += sum(ghost.decisions for ghost in game.ghosts)
+	decision_time += sum(ghost.decision_time for ghost in game.ghosts)
+	return {
+		"mix": mix_name,
+		"difficulty": difficulty_name,
+		"survival": ticks,
+		"dots": dots_eaten,
+		"score": game.score,
+		"level": game.level,
+		"decisions": decisions,
+		"decision_time": decision_time
+	}
+
+def _run_job(job):
+	return run_match(*job)
+
+def run_tournament(mixes, difficulties, games, max_ticks=5000, start_level=1, workers=None, seed=0, maze_file=None):
+	"""Run every mix x difficulty combination for the given number of seeded games"""
+	if maze_file:
+		MazeSpec.load(maze_file)  # Compile the path table once, before the workers read it
+	jobs = [(mix, difficulty, seed + game_index, max_ticks, start_level, maze_file)
+			for mix in mixes for difficulty in difficulties for game_index in range(games)]
+	if workers == 1:
+		return [_run_job(job) for job in jobs]
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		return list(executor.map(_run_job, jobs, chunksize=max(1, len(jobs) // (8 * (workers or os.cpu_count() or 1)))))
+
+def summarize(results):
+	"""Average the match results per (mix, difficulty)"""
+	groups = {}
+	for result in results:
+		groups.setdefault((result["mix"], result["difficulty"]), []).append(result)
+
+	rows = []
+	for (mix, difficulty), matches in groups.items():
+		count = len(matches)
+		decisions = sum(match["decisions"] for match in matches)
+		decision_time = sum(match["decision_time"] for match in matches)
+		rows.append({
+			"mix": mix,
+			"difficulty": difficulty,
+			"games": count,
+			"survival": sum(match["survival"] for match in matches) / count,
+			"dots": sum(match["dots"] for match in matches) / count,
+			"score": sum(match["score"] for match in matches) / count,
+			"level": sum(match["level"] for match in matches) / count,
+			"us_per_decision": 1e6 * decision_time / decisions if decisions else 0.0
+		})
+	# Deadliest ghosts first
+	rows.sort(key=lambda row: row["survival"])
+	return rows
+
+def format_table(rows):
+	header = f"{'MIX':<18} {'DIFFICULTY':<12} {'GAMES':>5} {'SURVIVAL':>9} {'DOTS':>7} {'SCORE':>8} {'LEVEL':>6} {'US/DECISION':>12}"
+	lines = [header, "-" * len(header)]
+	for row in rows:
+		lines.append(f"{row['mix']:<18} {row['difficulty']:<12} {row['games']:>5} {row['survival']:>9.1f} "
+					 f"{row['dots']:>7.1f} {row['score']:>8.0f} {row['level']:>6.2f} {row['us_per_decision']:>12.1f}")
+	return "\n".join(lines)
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Ghost personality tournament")
+	parser.add_argument("--games", type=int, default=8, help="seeded games per combination")
+	parser.add_argument("--mixes", nargs="+", default=list(PERSONALITY_MIXES), choices=list(PERSONALITY_MIXES))
+	parser.add_argument("--difficulties", nargs="+", default=list(DIFFICULTIES), choices=list(DIFFICULTIES))
+	parser.add_argument("--max-ticks", type=int, default=5000)
+	parser.add_argument("--level", type=int, default=1, help="starting level")
+	parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--maze", help="maze file to play instead of the classic maze")
+	args = parser.parse_args(argv)
+
+	start = time.perf_counter()
+	results = run_tournament(args.mixes, args.difficulties, args.games, args.max_ticks,
+							 args.level, args.workers, args.seed, args.maze)
+	elapsed = time.perf_counter() - start
+	print(format_table(summarize(results)))
+	print(f"\n{len(results)} games in {elapsed:.1f}s ({len(results) / elapsed:.1f} games/s)")
+
+if __name__ == "__main__":
+	main(sys.argv[1:])
@@ -1,12 +1,17 @@
 import pygame
+import os
 import sys
 import random
 import math
 import time
-from collections import deque
-
-# Initialize Pygame
-pygame.init()
+import copy
+import struct
+import hashlib
+import argparse
+from array import array
+from collections import OrderedDict, deque
+from engine import (GameClock, GameLoop, freeze_object, init_pygame, load_font, render_text, restore_state, snapshot_state,
+					thaw_object)
 
 # Constants - Adjusted for full window maze
 WINDOW_WIDTH = 800
@@ -33,6 +38,7 @@ UP = (0, -1)
 DOWN = (0, 1)
 LEFT = (-1, 0)
 RIGHT = (1, 0)
+DIRECTIONS = [UP, DOWN, LEFT, RIGHT]  # Search order used by ghost pathfinding
 
 # Life system constants
 MAX_LIVES = 4
@@ -64,16 +70,34 @@ MAZE = [
 ]
 
 # Ghost base coordinates (exclude from fruit spawning)
-GHOST_BASE_COORDS = {
+GHOST_BASE_COORDS = frozenset({
 	(8, 8), (9, 8), (10, 8), (11, 8),
 	(8, 9), (9, 9), (10, 9), (11, 9),
 	(8, 10), (9, 10), (10, 10), (11, 10),
 	(8, 11), (9, 11), (10, 11), (11, 11)
-}
+})
 
 # Tunnel row (where horizontal wraparound is possible)
 TUNNEL_ROW = 9
 
+# Pac-Man's start cell in MAZE
+PACMAN_START = (1, 1)
+
+# Maze file characters and the cell values they stand for (see MazeSpec.load)
+MAZE_FILE_CELLS = {
+	"#": 1,  # Wall
+	" ": 0,  # Empty
+	".": 2,  # Dot
+	"o": 4,  # Super dot
+	"P": 2,  # Pac-Man's start, on a dot
+	"G": 0,  # Ghost start, inside the ghost base
+	"=": 0,  # Ghost base, where fruit never spawns
+	"T": 0   # Empty cell on the tunnel row
+}
+
+# Compiled path tables of maze files are cached in this directory next to the file
+NAV_CACHE_DIR = "__navcache__"
+
 # Fruit types with different point values and colors
 FRUITS = [
 	("cherry", 100, RED, DARK_RED),
@@ -85,25 +109,814 @@ FRUITS = [
 	("key", 5000, YELLOW, BROWN)
 ]
 
+# Starting cells, colors and personalities of the four ghosts
+GHOST_SETUP = [
+	(9, 9, RED, "aggressive"),      # Red ghost - aggressive chaser
+	(10, 9, PINK, "ambush"),        # Pink ghost - ambush tactics
+	(9, 10, CYAN, "patrol"),        # Cyan ghost - patrol behavior
+	(10, 10, ORANGE, "unpredictable")  # Orange ghost - unpredictable
+]
+
+# Frames between ghost moves at level 1
+GHOST_BASE_SPEED = 6
+
+# Logic ticks per second; game time is counted in these ticks
+LOGIC_FPS = 15
+
+# Fruit disappears after 10 seconds of game time
+FRUIT_LIFETIME = 10 * LOGIC_FPS
+
+# Logic ticks the game pauses after a life is lost
+LIFE_LOST_PAUSE = 90
+
+# Ghosts only path towards targets at most this many steps away
+MAX_PATH_LENGTH = 21
+
+# Full ghost AI decisions per logic tick; ghosts over the budget follow their last plan
+GHOST_DECISIONS_PER_TICK = 2
+
+# Distance fields kept in the shared ghost path cache
+PATH_CACHE_SIZE = 128
+
+# Frames drawn per second in run(); sprites are interpolated between logic ticks
+RENDER_FPS = 60
+
+def pacman_move_delay(level):
+	"""Frames between Pac-Man moves - starts at 2, 0.1 faster per level, never below 0.5"""
+	return max(0.5, 2.0 - (level - 1) * 0.1)
+
+def ghost_move_delay(speed_multiplier, base_speed=GHOST_BASE_SPEED):
+	"""Ticks between ghost moves at a level's speed multiplier, never below 1"""
+	return max(1, int(base_speed / speed_multiplier))
+
+def fruit_spawn_interval(level):
+	"""Logic ticks between fruit spawns - faster at higher levels, never below 150"""
+	return max(150, 300 - level * 20)
+
+def sprite_position(entity, alpha=1.0):
+	"""Top-left pixel of an entity, alpha of the way from its previous cell to its current one"""
+	x, y = entity.x, entity.y
+	# Only slide between neighbouring cells; tunnel wraps and respawns jump
+	if alpha < 1.0 and abs(x - entity.prev_x) + abs(y - entity.prev_y) == 1:
+		x = entity.prev_x + (x - entity.prev_x) * alpha
+		y = entity.prev_y + (y - entity.prev_y) * alpha
+	return round(x * CELL_SIZE), round(y * CELL_SIZE)
+
+def level_difficulty(level, ghost_speedup=0.3, power_duration_start=200, power_duration_step=15, power_duration_min=100):
+	"""Return difficulty multipliers based on level"""
+	speed_multiplier = 1.0 + (level - 1) * ghost_speedup  # Ghosts get 30% faster each level by default
+	power_duration = max(power_duration_min, power_duration_start - (level - 1) * power_duration_step)  # Power pellets last shorter
+	return speed_multiplier, power_duration
+
+DIRECTION_INDEX = {direction: d for d, direction in enumerate(DIRECTIONS)}
+
+class Maze:
+	"""Maze cells in one flat bytearray, with moves precomputed per cell.
+
+	Cell (x, y) lives at cells[y * width + x]. For every open cell the layout
+	keeps a bitmask of open directions (bit d for DIRECTIONS[d]), the open
+	directions themselves and the cell each one leads to, tunnel wrap
+	included, so movement code never repeats bounds, wall or wrap checks.
+	Walls never change, so those tables are built once per layout and shared;
+	copying a maze copies only the cell buffer.
+	"""
+
+	WALL = 1
+
+	_layouts = {}  # (width, tunnel row, wall bytes) -> move tables
+
+	def __init__(self, cells, width, tunnel_row=TUNNEL_ROW, layout=None):
+		self.cells = cells
+		self.width = width
+		self.height = len(cells) // width
+		self.size = len(cells)
+		self.tunnel_row = tunnel_row
+		if layout is None:
+			layout = self._layout(cells, width, tunnel_row)
+		self.layout = layout
+		self.open_masks, self.moves, self.targets, self.neighbours, self.open_cells = layout
+
+	@classmethod
+	def from_rows(cls, rows, tunnel_row=TUNNEL_ROW):
+		"""Build a maze from a list of rows of cell values, such as MAZE"""
+		return cls(bytearray(cell for row in rows for cell in row), len(rows[0]), tunnel_row)
+
+	@classmethod
+	def _layout(cls, cells, width, tunnel_row):
+		key = (width, tunnel_row, bytes(cell == cls.WALL for cell in cells))
+		layout = cls._layouts.get(key)
+		if layout is not None:
+			return layout
+
+		size = len(cells)
+		height = size // width
+		open_masks = bytearray(size)
+		moves = [()] * size  # Open directions per cell, in DIRECTIONS order
+		targets = array("i", [-1]) * (size * len(DIRECTIONS))  # Cell reached per (cell, direction)
+		neighbours = [[] for _ in range(size)]  # (direction index, cell) per open cell
+		open_cells = []
+		for cell in range(size):
+			if cells[cell] == cls.WALL:
+				continue
+			open_cells.append(cell)
+			x, y = cell % width, cell // width
+			for d, (dx, dy) in enumerate(DIRECTIONS):
+				new_x, new_y = x + dx, y + dy
+				if new_y == tunnel_row:
+					new_x %= width
+				if not (0 <= new_x < width and 0 <= new_y < height):
+					continue
+				target = new_y * width + new_x
+				if cells[target] == cls.WALL:
+					continue
+				open_masks[cell] |= 1 << d
+				targets[cell * len(DIRECTIONS) + d] = target
+				neighbours[cell].append((d, target))
+			moves[cell] = tuple(DIRECTIONS[d] for d, _ in neighbours[cell])
+
+		layout = (open_masks, moves, targets, neighbours, open_cells)
+		cls._layouts[key] = layout
+		return layout
+
+	def copy(self):
+		return Maze(bytearray(self.cells), self.width, self.tunnel_row, self.layout)
+
+	def get(self, x, y):
+		return self.cells[y * self.width + x]
+
+	def set(self, x, y, item):
+		self.cells[y * self.width + x] = item
+
+	def row(self, y):
+		return self.cells[y * self.width:(y + 1) * self.width]
+
+	def valid_moves(self, x, y):
+		"""Directions that lead out of (x, y) without hitting a wall"""
+		return self.moves[y * self.width + x]
+
+	def can_move(self, x, y, direction):
+		return bool(self.open_masks[y * self.width + x] >> DIRECTION_INDEX[direction] & 1)
+
+	def step(self, x, y, direction):
+		"""The cell one move from (x, y), wrapping through the tunnel, or None into a wall"""
+		target = self.targets[(y * self.width + x) * len(DIRECTIONS) + DIRECTION_INDEX[direction]]
+		if target < 0:
+			return None
+		return target % self.width, target // self.width
+
+class PathTable:
+	"""All-pairs next-step and distance table for one maze layout.
+
+	Built once per wall layout with a BFS from every open cell, then shared by
+	every ghost. Lookups are a single index into flat arrays.
+	"""
+
+	NO_STEP = 255
+	UNREACHABLE = 0xFFFF
+
+	# Compiled table file: magic, version, width, height, tunnel row, then steps and distances
+	MAGIC = b"PNAV"
+	VERSION = 1
+	HEADER = struct.Struct("<BHHh")
+
+	_tables = {}  # id of a shared Maze layout (kept alive by Maze) -> PathTable
+
+	def __init__(self, maze, compiled=None):
+		self.width = maze.width
+		self.height = maze.height
+		self.size = maze.size
+		self.tunnel_row = maze.tunnel_row
+
+		# Neighbours of each open cell as (direction index, cell index), tunnel edges included
+		self.neighbours = maze.neighbours
+		self.open_cells = maze.open_cells
+
+		if compiled is not None:
+			self.steps, self.distances = compiled
+			return
+		self.steps = bytearray([self.NO_STEP]) * (self.size * self.size)
+		self.distances = array("H", [self.UNREACHABLE]) * (self.size * self.size)
+		for cell in self.open_cells:
+			self._fill_from(cell)
+
+	def _fill_from(self, src):
+		"""BFS from src, recording the first step taken towards every reached cell"""
+		base = src * self.size
+		steps = self.steps
+		distances = self.distances
+		neighbours = self.neighbours
+		unreachable = self.UNREACHABLE
+
+		distances[base + src] = 0
+		queue = deque()
+		for d, cell in neighbours[src]:
+			if distances[base + cell] == unreachable:
+				distances[base + cell] = 1
+				steps[base + cell] = d
+				queue.append(cell)
+
+		while queue:
+			cell = queue.popleft()
+			distance = distances[base + cell] + 1
+			first_step = steps[base + cell]
+			for _, neighbour in neighbours[cell]:
+				if distances[base + neighbour] == unreachable:
+					distances[base + neighbour] = distance
+					steps[base + neighbour] = first_step
+					queue.append(neighbour)
+
+	@classmethod
+	def for_maze(cls, maze, cache_path=None):
+		"""Return the shared table for this maze's wall layout, building it on first use.
+
+		With a cache_path the table is read from that file when it was compiled
+		for the same layout, and written there after building otherwise.
+		"""
+		table = cls._tables.get(id(maze.layout))
+		if table is None:
+			if cache_path is not None:
+				table = cls.load(cache_path, maze)
+			if table is None:
+				table = cls(maze)
+				if cache_path is not None:
+					table.save(cache_path)
+			cls._tables[id(maze.layout)] = table
+		return table
+
+	def save(self, path):
+		"""Write the compiled table to path; a cache that cannot be written is skipped"""
+		distances = array("H", self.distances)
+		if sys.byteorder != "little":
+			distances.byteswap()
+		header = self.MAGIC + self.HEADER.pack(self.VERSION, self.width, self.height, self.tunnel_row)
+		try:
+			os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+			# Write then rename, so a reader in another process never sees half a file
+			temp_path = f"{path}.{os.getpid()}.tmp"
+			with open(temp_path, "wb") as f:
+				f.write(header)
+				f.write(self.steps)
+				f.write(distances.tobytes())
+			os.replace(temp_path, path)
+		except OSError:
+			pass
+
+	@classmethod
+	def load(cls, path, maze):
+		"""Read a table saved for this maze, or None if the file is missing or does not fit"""
+		try:
+			with open(path, "rb") as f:
+				data = f.read()
+		except OSError:
+			return None
+		offset = len(cls.MAGIC) + cls.HEADER.size
+		area = maze.size * maze.size
+		if data[:len(cls.MAGIC)] != cls.MAGIC or len(data) != offset + 3 * area:
+			return None
+		if cls.HEADER.unpack_from(data, len(cls.MAGIC)) != (cls.VERSION, maze.width, maze.height, maze.tunnel_row):
+			return None
+		steps = bytearray(data[offset:offset + area])
+		distances = array("H")
+		distances.frombytes(data[offset + area:])
+		if sys.byteorder != "little":
+			distances.byteswap()
+		return cls(maze, (steps, distances))
+
+	def _index(self, x, y, target_x, target_y):
+		if not (0 <= target_x < self.width and 0 <= target_y < self.height):
+			return None
+		return (y * self.width + x) * self.size + target_y * self.width + target_x
+
+	def next_direction(self, x, y, target_x, target_y):
+		"""First move on a shortest path from (x, y) to the target, or None"""
+		index = self._index(x, y, target_x, target_y)
+		if index is None:
+			return None
+		step = self.steps[index]
+		if step == self.NO_STEP:
+			return None
+		return DIRECTIONS[step]
+
+	def distance(self, x, y, target_x, target_y):
+		"""Maze distance from (x, y) to the target, or None if unreachable"""
+		index = self._index(x, y, target_x, target_y)
+		if index is None:
+			return None
+		distance = self.distances[index]
+		if distance == self.UNREACHABLE:
+			return None
+		return distance
+
+class DistanceField:
+	"""BFS distances from one root cell to every cell of a maze (a "flow field").
+
+	The game builds one rooted at Pac-Man each logic tick and every ghost reads
+	distances and downhill moves from it instead of searching on its own.
+	"""
+
+	def __init__(self, path_table, root_x, root_y):
+		self.path_table = path_table
+		self.root = (root_x, root_y)
+		self.width = path_table.width
+		self.height = path_table.height
+		self.distances = array("H", [PathTable.UNREACHABLE]) * path_table.size
+
+		distances = self.distances
+		neighbours = path_table.neighbours
+		unreachable = PathTable.UNREACHABLE
+		root = root_y * self.width + root_x
+		distances[root] = 0
+		queue = deque([root])
+		while queue:
+			cell = queue.popleft()
+			distance = distances[cell] + 1
+			for _, neighbour in neighbours[cell]:
+				if distances[neighbour] == unreachable:
+					distances[neighbour] = distance
+					queue.append(neighbour)
+
+	def distance(self, x, y):
+		"""Maze distance from (x, y) to the root, or None if unreachable"""
+		if not (0 <= x < self.width and 0 <= y < self.height):
+			return None
+		distance = self.distances[y * self.width + x]
+		if distance == PathTable.UNREACHABLE:
+			return None
+		return distance
+
+	def downhill(self, x, y):
+		"""Move from (x, y) that gets closest to the root, or None if already there"""
+		cell = y * self.width + x
+		best_move = None
+		best_distance = self.distances[cell]
+		for d, neighbour in self.path_table.neighbours[cell]:
+			if self.distances[neighbour] < best_distance:
+				best_distance = self.distances[neighbour]
+				best_move = DIRECTIONS[d]
+		return best_move
+
+class PathCache:
+	"""Bounded LRU cache of distance fields, shared by all ghosts of a game.
+
+	Keyed by root cell. Fields stay valid until the maze layout changes, so the
+	game invalidates the cache on next_level and restart_game.
+	"""
+
+	def __init__(self, path_table, max_size=PATH_CACHE_SIZE):
+		self.path_table = path_table
+		self.max_size = max_size
+		self.fields = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	def field(self, x, y):
+		"""Distance field rooted at (x, y), built on a miss"""
+		key = (x, y)
+		field = self.fields.get(key)
+		if field is not None:
+			self.fields.move_to_end(key)
+			self.hits += 1
+			return field
+
+		self.misses += 1
+		field = DistanceField(self.path_table, x, y)
+		self.fields[key] = field
+		if len(self.fields) > self.max_size:
+			self.fields.popitem(last=False)
+			self.evictions += 1
+		return field
+
+	def invalidate(self, path_table=None):
+		"""Drop every cached field, optionally switching to a new maze layout"""
+		self.fields.clear()
+		if path_table is not None:
+			self.path_table = path_table
+
+	def hit_rate(self):
+		lookups = self.hits + self.misses
+		return self.hits / lookups if lookups else 0.0
+
+	def stats(self):
+		"""Counters for tuning the cache size"""
+		return {
+			"size": len(self.fields),
+			"max_size": self.max_size,
+			"hits": self.hits,
+			"misses": self.misses,
+			"evictions": self.evictions,
+			"hit_rate": self.hit_rate()
+		}
+
+class MazeIndex:
+	"""Dot counts and spawnable empty cells of one maze, kept up to date as it changes.
+
+	Spawnable cells are the empty cells Pac-Man can reach, outside the ghost
+	base, so dead-end pockets are never offered. Reachability comes from the
+	maze's PathTable and each layout is indexed once; levels start from a copy.
+	Adding, removing and picking a random spawn cell are O(1).
+	"""
+
+	_templates = {}  # Maze cells, start cell and ghost base -> MazeIndex
+
+	def __init__(self, maze, path_table, start_x, start_y, excluded=GHOST_BASE_COORDS):
+		self.width = path_table.width
+		self.spawnable = bytearray(path_table.size)
+		self.free_cells = []
+		self.free_positions = {}  # Cell index -> position in free_cells
+		self.dots = 0
+		self.super_dots = 0
+		for cell in path_table.open_cells:
+			x, y = cell % self.width, cell // self.width
+			if (x, y) not in excluded and path_table.distance(start_x, start_y, x, y) is not None:
+				self.spawnable[cell] = 1
+			item = maze.cells[cell]
+			if item == 2:
+				self.dots += 1
+			elif item == 4:
+				self.super_dots += 1
+			elif item == 0 and self.spawnable[cell]:
+				self.add_free(cell)
+
+	@classmethod
+	def for_maze(cls, maze, path_table, start_x, start_y, excluded=GHOST_BASE_COORDS):
+		"""Return a fresh index for this maze, copied from the shared template"""
+		key = (start_x, start_y, excluded, maze.width, bytes(maze.cells))
+		template = cls._templates.get(key)
+		if template is None:
+			template = cls(maze, path_table, start_x, start_y, excluded)
+			cls._templates[key] = template
+		return template.copy()
+
+	def copy(self):
+		index = copy.copy(self)
+		index.free_cells = self.free_cells[:]
+		index.free_positions = dict(self.free_positions)
+		return index
+
+	def add_free(self, cell):
+		if cell not in self.free_positions:
+			self.free_positions[cell] = len(self.free_cells)
+			self.free_cells.append(cell)
+
+	def remove_free(self, cell):
+		position = self.free_positions.pop(cell, None)
+		if position is None:
+			return
+		# Swap the last cell into the hole
+		last = self.free_cells.pop()
+		if last != cell:
+			self.free_cells[position] = last
+			self.free_positions[last] = position
+
+	def set_cell(self, maze, x, y, item):
+		"""Write item into the maze and update the counts and spawn cells"""
+		cell = y * self.width + x
+		old = maze.cells[cell]
+		if old == item:
+			return
+		maze.cells[cell] = item
+		if old == 2:
+			self.dots -= 1
+		elif old == 4:
+			self.super_dots -= 1
+		if item == 2:
+			self.dots += 1
+		elif item == 4:
+			self.super_dots += 1
+
+		if item == 0 and self.spawnable[cell]:
+			self.add_free(cell)
+		else:
+			self.remove_free(cell)
+
+	def snapshot(self):
+		"""Immutable copy for rewinding; spawnable never changes after indexing, so it is shared"""
+		return self.width, self.spawnable, tuple(self.free_cells), self.dots, self.super_dots
+
+	@classmethod
+	def from_snapshot(cls, state):
+		index = cls.__new__(cls)
+		index.width, index.spawnable, free_cells, index.dots, index.super_dots = state
+		index.free_cells = list(free_cells)
+		index.free_positions = {cell: position for position, cell in enumerate(free_cells)}
+		return index
+
+	def random_free_cell(self, rng):
+		"""A random spawnable empty cell as (x, y), or None"""
+		if not self.free_cells:
+			return None
+		cell = self.free_cells[rng.randrange(len(self.free_cells))]
+		return cell % self.width, cell // self.width
+
+class MazeSpec:
+	"""A maze and where everything on it starts: Pac-Man, the ghosts and the ghost base.
+
+	builtin() is the classic MAZE; load() reads a text file with one character
+	per cell (see MAZE_FILE_CELLS). A file must be rectangular apart from
+	trailing spaces, have one P and at least one G, and may mark one tunnel
+	row with T cells. Its PathTable is compiled once and cached in
+	NAV_CACHE_DIR beside the file, keyed by the hash of the file, so later
+	runs read it back instead of searching from every cell again.
+	"""
+
+	def __init__(self, name, maze, pacman_start, ghost_starts, ghost_base, cache_path=None):
+		self.name = name
+		self.maze = maze  # Every level starts from a copy of this
+		self.pacman_start = pacman_start
+		self.ghost_starts = ghost_starts
+		self.ghost_base = frozenset(ghost_base)  # Fruit never spawns here
+		self.path_table = PathTable.for_maze(maze, cache_path)
+
+	@classmethod
+	def builtin(cls):
+		return cls("classic", Maze.from_rows(MAZE), PACMAN_START,
+				   [(x, y) for x, y, _, _ in GHOST_SETUP], GHOST_BASE_COORDS)
+
+	@classmethod
+	def load(cls, path, cache=True):
+		"""Read a maze file, compiling its path table or reading it from the cache"""
+		with open(path, "rb") as f:
+			data = f.read()
+		lines = data.decode("utf-8").splitlines()
+		while lines and not lines[-1].strip():
+			lines.pop()
+		if not lines:
+			raise ValueError(f"{path}: empty maze")
+		width = max(len(line) for line in lines)
+
+		cells = bytearray()
+		pacman_start = None
+		ghost_starts = []
+		ghost_base = []
+		tunnel_row = -1
+		for y, line in enumerate(lines):
+			for x, char in enumerate(line.ljust(width)):
+				if char not in MAZE_FILE_CELLS:
+					raise ValueError(f"{path}:{y + 1}: unknown maze character {char!r}")
+				cells.append(MAZE_FILE_CELLS[char])
+				if char == "P":
+					if pacman_start is not None:
+						raise ValueError(f"{path}:{y + 1}: more than one Pac-Man start")
+					pacman_start = (x, y)
+				elif char == "G":
+					ghost_starts.append((x, y))
+					ghost_base.append((x, y))
+				elif char == "=":
+					ghost_base.append((x, y))
+				elif char == "T":
+					if tunnel_row not in (-1, y):
+						raise ValueError(f"{path}:{y + 1}: tunnel cells on more than one row")
+					tunnel_row = y
+		if pacman_start is None:
+			raise ValueError(f"{path}: no Pac-Man start (P)")
+		if not ghost_starts:
+			raise ValueError(f"{path}: no ghost start (G)")
+
+		cache_path = None
+		if cache:
+			name = os.path.splitext(os.path.basename(path))[0]
+			digest = hashlib.sha1(data).hexdigest()[:16]
+			cache_path = os.path.join(os.path.dirname(path), NAV_CACHE_DIR, f"{name}-{digest}.nav")
+		return cls(os.path.basename(path), Maze(cells, width, tunnel_row), pacman_start,
+				   ghost_starts, ghost_base, cache_path)
+
+	def ghost_setup(self):
+		"""(x, y, color, personality) per ghost start, dressed in turn like GHOST_SETUP's ghosts"""
+		return [(x, y) + GHOST_SETUP[index % len(GHOST_SETUP)][2:]
+				for index, (x, y) in enumerate(self.ghost_starts)]
+
+class SpriteAtlas:
+	"""Pre-rendered sprites for Pac-Man, the ghosts, the fruits and the life icon.
+
+	Every sprite is a CELL_SIZE square drawn once with the usual primitives and
+	then blitted by any renderer. Sprites are baked on first use, or all at once
+	with preload(), and converted for fast blitting when a display exists.
+	"""
+
+	GHOST_EYES = ("normal", "flashing", "eaten")
+	LIFE_ICON_SIZE = 22
+
+	def __init__(self):
+		self.sprites = {}
+
+	def preload(self, ghost_colors=None):
+		"""Bake every sprite the game can show"""
+		if ghost_colors is None:
+			ghost_colors = [color for _, _, color, _ in GHOST_SETUP]
+		for direction in DIRECTIONS:
+			self.pacman(direction, True)
+		self.pacman(RIGHT, False)
+		for color in ghost_colors:
+			self.ghost(color, "normal")
+		self.ghost(DARK_BLUE, "normal")
+		self.ghost(DARK_BLUE, "flashing")
+		self.ghost(WHITE, "flashing")
+		self.ghost(GRAY, "eaten")
+		for fruit_type in FRUITS:
+			self.fruit(fruit_type)
+		self.life_icon()
+
+	def clear(self):
+		self.sprites.clear()
+
+	def get(self, key, paint, size=CELL_SIZE):
+		sprite = self.sprites.get(key)
+		if sprite is None:
+			sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+			paint(sprite, size // 2, size // 2)
+			if pygame.display.get_surface() is not None:
+				sprite = sprite.convert_alpha()
+			self.sprites[key] = sprite
+		return sprite
+
+	def pacman(self, direction, mouth_open):
+		if not mouth_open:
+			direction = None  # Every direction looks the same with the mouth closed
+		return self.get(("pacman", direction), lambda surface, x, y: self.paint_pacman(surface, x, y, direction))
+
+	def ghost(self, color, eyes):
+		return self.get(("ghost", color, eyes), lambda surface, x, y: self.paint_ghost(surface, x, y, color, eyes))
+
+	def fruit(self, fruit_type):
+		return self.get(("fruit", fruit_type[0]), lambda surface, x, y: self.paint_fruit(surface, x, y, fruit_type))
+
+	def life_icon(self):
+		return self.get("life", self.paint_life_icon, self.LIFE_ICON_SIZE)
+
+	def paint_pacman(self, surface, center_x, center_y, direction):
+		radius = CELL_SIZE // 3
+		pygame.draw.circle(surface, YELLOW, (center_x, center_y), radius)
+		if direction is None:
+			return
+
+		# Calculate mouth angle based on direction
+		if direction == RIGHT:
+			start_angle = 0.3
+			end_angle = -0.3
+		elif direction == LEFT:
+			start_angle = math.pi - 0.3
+			end_angle = math.pi + 0.3
+		elif direction == UP:
+			start_angle = -math.pi/2 - 0.3
+			end_angle = -math.pi/2 + 0.3
+		else:  # DOWN
+			start_angle = math.pi/2 - 0.3
+			end_angle = math.pi/2 + 0.3
+
+		# Draw mouth (triangle to create the opening)
+		mouth_points = [
+			(center_x, center_y),
+			(center_x + radius * math.cos(start_angle), center_y + radius * math.sin(start_angle)),
+			(center_x + radius * math.cos(end_angle), center_y + radius * math.sin(end_angle))
+		]
+		pygame.draw.polygon(surface, BLACK, mouth_points)
+
+	def paint_ghost(self, surface, center_x, center_y, color, eyes):
+		radius = CELL_SIZE // 3
+
+		# Draw ghost body (circle + rectangle)
+		pygame.draw.circle(surface, color, (center_x, center_y - 2), radius)
+		pygame.draw.rect(surface, color,
+						(center_x - radius, center_y - 2, radius * 2, radius + 2))
+
+		# Draw wavy bottom
+		wave_points = []
+		for i in range(5):
+			x = center_x - radius + (i * radius * 2 // 4)
+			y = center_y + radius if i % 2 == 0 else center_y + radius - 4
+			wave_points.append((x, y))
+		wave_points.append((center_x + radius, center_y + radius))
+		wave_points.append((center_x - radius, center_y + radius))
+		pygame.draw.polygon(surface, color, wave_points)
+
+		# Draw eyes - dots when eaten, blank when flashing, pupils otherwise
+		eye_size = 3
+		if eyes == "eaten":
+			pygame.draw.circle(surface, WHITE, (center_x - 6, center_y - 8), 2)
+			pygame.draw.circle(surface, WHITE, (center_x + 6, center_y - 8), 2)
+		else:
+			eye_color = BLACK if eyes == "flashing" else WHITE
+			pygame.draw.circle(surface, eye_color, (center_x - 6, center_y - 8), eye_size)
+			pygame.draw.circle(surface, eye_color, (center_x + 6, center_y - 8), eye_size)
+			if eyes == "normal":
+				pygame.draw.circle(surface, BLACK, (center_x - 6, center_y - 8), 2)
+				pygame.draw.circle(surface, BLACK, (center_x + 6, center_y - 8), 2)
+
+	def paint_life_icon(self, surface, center_x, center_y):
+		# Mini Pac-Man (larger for bigger display)
+		pygame.draw.circle(surface, YELLOW, (center_x, center_y), 10)
+		mouth_points = [
+			(center_x, center_y),
+			(center_x + 8, center_y - 4),
+			(center_x + 8, center_y + 4)
+		]
+		pygame.draw.polygon(surface, BLACK, mouth_points)
+
+	def paint_fruit(self, surface, center_x, center_y, fruit_type):
+		# Fruit cells are opaque so they hide whatever is under them
+		surface.fill(BLACK)
+		paint = getattr(self, "paint_" + fruit_type[0])
+		paint(surface, center_x, center_y, fruit_type)
+
+	def paint_cherry(self, surface, center_x, center_y, fruit_type):
+		# Draw cherry stems
+		pygame.draw.line(surface, BROWN, (center_x-4, center_y-10), (center_x-4, center_y-4), 3)
+		pygame.draw.line(surface, BROWN, (center_x+4, center_y-10), (center_x+4, center_y-4), 3)
+		# Draw cherry bodies
+		pygame.draw.circle(surface, fruit_type[2], (center_x-4, center_y), 6)
+		pygame.draw.circle(surface, fruit_type[2], (center_x+4, center_y), 6)
+		# Highlight
+		pygame.draw.circle(surface, WHITE, (center_x-6, center_y-2), 2)
+		pygame.draw.circle(surface, WHITE, (center_x+2, center_y-2), 2)
+
+	def paint_strawberry(self, surface, center_x, center_y, fruit_type):
+		# Draw strawberry body
+		points = [(center_x, center_y+8), (center_x-6, center_y), (center_x-4, center_y-5),
+				 (center_x+4, center_y-5), (center_x+6, center_y)]
+		pygame.draw.polygon(surface, fruit_type[2], points)
+		# Draw leaves
+		pygame.draw.rect(surface, fruit_type[3], (center_x-5, center_y-8, 10, 4))
+		# Draw seeds
+		for i in range(3):
+			for j in range(2):
+				pygame.draw.circle(surface, WHITE, (center_x-4+i*4, center_y-1+j*4), 1)
+
+	def paint_orange(self, surface, center_x, center_y, fruit_type):
+		# Draw orange body
+		pygame.draw.circle(surface, fruit_type[2], (center_x, center_y), 8)
+		# Draw orange texture lines
+		for angle in range(0, 360, 45):
+			end_x = center_x + 6 * math.cos(math.radians(angle))
+			end_y = center_y + 6 * math.sin(math.radians(angle))
+			pygame.draw.line(surface, DARK_RED, (center_x, center_y), (end_x, end_y), 2)
+		# Draw stem
+		pygame.draw.circle(surface, fruit_type[3], (center_x, center_y-8), 3)
+
+	def paint_apple(self, surface, center_x, center_y, fruit_type):
+		# Draw apple body
+		pygame.draw.circle(surface, fruit_type[2], (center_x, center_y+1), 7)
+		# Draw apple indent at top
+		pygame.draw.circle(surface, BLACK, (center_x, center_y-5), 4)
+		pygame.draw.circle(surface, fruit_type[2], (center_x, center_y-3), 4)
+		# Draw stem
+		pygame.draw.line(surface, BROWN, (center_x, center_y-8), (center_x, center_y-4), 3)
+		# Draw leaf
+		pygame.draw.circle(surface, fruit_type[3], (center_x+3, center_y-6), 3)
+
+	def paint_grapes(self, surface, center_x, center_y, fruit_type):
+		# Draw grape cluster
+		for row in range(3):
+			for col in range(2 - row % 2):
+				x = center_x - 4 + col * 8 + (row % 2) * 4
+				y = center_y - 5 + row * 4
+				pygame.draw.circle(surface, fruit_type[2], (x, y), 4)
+		# Draw stem
+		pygame.draw.line(surface, fruit_type[3], (center_x, center_y-9), (center_x, center_y-5), 3)
+
+	def paint_bell(self, surface, center_x, center_y, fruit_type):
+		# Draw bell body
+		points = [(center_x-8, center_y+5), (center_x-8, center_y-2), (center_x-3, center_y-8),
+				 (center_x+3, center_y-8), (center_x+8, center_y-2), (center_x+8, center_y+5)]
+		pygame.draw.polygon(surface, fruit_type[2], points)
+		# Draw bell bottom
+		pygame.draw.rect(surface, BROWN, (center_x-9, center_y+5, 18, 3))
+		# Draw clapper
+		pygame.draw.circle(surface, BLACK, (center_x, center_y+3), 3)
+		# Draw highlight
+		pygame.draw.circle(surface, WHITE, (center_x-4, center_y-4), 3)
+
+	def paint_key(self, surface, center_x, center_y, fruit_type):
+		# Draw key shaft
+		pygame.draw.rect(surface, fruit_type[2], (center_x-8, center_y-1, 10, 3))
+		# Draw key head (circle)
+		pygame.draw.circle(surface, fruit_type[2], (center_x+8, center_y), 5)
+		pygame.draw.circle(surface, BLACK, (center_x+8, center_y), 3)
+		# Draw key teeth
+		pygame.draw.rect(surface, fruit_type[2], (center_x-8, center_y+1, 3, 4))
+		pygame.draw.rect(surface, fruit_type[2], (center_x-5, center_y+1, 3, 3))
+
+# Shared by every Pac-Man renderer
+SPRITES = SpriteAtlas()
+
 class PacMan:
-	def __init__(self, level=1):
-		self.x = 1
-		self.y = 1
-		self.start_x = 1
-		self.start_y = 1
+	def __init__(self, level=1, start=PACMAN_START):
+		self.x, self.y = start
+		self.prev_x, self.prev_y = start  # Cell at the start of the last logic tick, for interpolation
+		self.start_x, self.start_y = start
 		self.direction = RIGHT
 		self.mouth_open = True
 		self.mouth_timer = 0
 		self.move_timer = 0
 		# Speed increases with level - starts at 2 frames delay, decreases by 0.1 per level
 		# Minimum delay of 0.5 frames to prevent becoming too fast
-		self.move_delay = max(0.5, 2.0 - (level - 1) * 0.1)
+		self.move_delay = pacman_move_delay(level)
 		self.level = level
 
 	def set_level_speed(self, level):
 		"""Update Pac-Man's speed based on current level"""
 		self.level = level
-		self.move_delay = max(0.5, 2.0 - (level - 1) * 0.1)
+		self.move_delay = pacman_move_delay(level)
 
 	def reset_position(self):
 		"""Reset Pac-Man to starting position"""
@@ -118,27 +931,14 @@ class PacMan:
 			return False
 		self.move_timer = 0
 
-		new_x = self.x + dx
-		new_y = self.y + dy
-
-		# Handle tunnel wraparound
-		if new_y == TUNNEL_ROW:
-			if new_x < 0:  # Going through left edge
-				new_x = len(maze[0]) - 1
-			elif new_x >= len(maze[0]):  # Going through right edge
-				new_x = 0
-
-		# Check boundaries and walls
-		if (0 <= new_x < len(maze[0]) and
-			0 <= new_y < len(maze) and
-			maze[new_y][new_x] != 1):  # 1 = wall
-			self.x = new_x
-			self.y = new_y
-			# Update direction for drawing
-			if dx != 0 or dy != 0:
-				self.direction = (dx, dy)
-			return True
-		return False
+		# The maze handles walls and the tunnel wraparound
+		target = maze.step(self.x, self.y, (dx, dy))
+		if target is None:
+			return False
+		self.x, self.y = target
+		# Update direction for drawing
+		self.direction = (dx, dy)
+		return True
 
 	def update(self):
 		# Animate mouth opening/closing
@@ -147,49 +947,26 @@ class PacMan:
 			self.mouth_open = not self.mouth_open
 			self.mouth_timer = 0
 
-	def draw(self, screen):
-		center_x = self.x * CELL_SIZE + CELL_SIZE // 2
-		center_y = self.y * CELL_SIZE + CELL_SIZE // 2
-		radius = CELL_SIZE // 3
-
-		if self.mouth_open:
-			# Calculate mouth angle based on direction
-			if self.direction == RIGHT:
-				start_angle = 0.3
-				end_angle = -0.3
-			elif self.direction == LEFT:
-				start_angle = math.pi - 0.3
-				end_angle = math.pi + 0.3
-			elif self.direction == UP:
-				start_angle = -math.pi/2 - 0.3
-				end_angle = -math.pi/2 + 0.3
-			else:  # DOWN
-				start_angle = math.pi/2 - 0.3
-				end_angle = math.pi/2 + 0.3
-
-			# Draw Pac-Man with mouth
-			pygame.draw.circle(screen, YELLOW, (center_x, center_y), radius)
-
-			# Draw mouth (triangle to create the opening)
-			mouth_points = [
-				(center_x, center_y),
-				(center_x + radius * math.cos(start_angle), center_y + radius * math.sin(start_angle)),
-				(center_x + radius * math.cos(end_angle), center_y + radius * math.sin(end_angle))
-			]
-			pygame.draw.polygon(screen, BLACK, mouth_points)
-		else:
-			# Closed mouth - just a circle
-			pygame.draw.circle(screen, YELLOW, (center_x, center_y), radius)
+	def draw(self, screen, position=None):
+		if position is None:
+			position = (self.x * CELL_SIZE, self.y * CELL_SIZE)
+		screen.blit(SPRITES.pacman(self.direction, self.mouth_open), position)
 
 class Ghost:
-	def __init__(self, x, y, color, personality="aggressive", ghost_id=0):
+	# Wall-clock profiling, left out of rewind snapshots and reset on restore
+	TRANSIENT = {"decision_time": 0.0}
+
+	def __init__(self, x, y, color, personality="aggressive", ghost_id=0, rng=random):
+		self.rng = rng  # The game passes its seeded RNG for repeatable runs
 		self.x = x
 		self.y = y
+		self.prev_x = x  # Cell at the start of the last logic tick, for interpolation
+		self.prev_y = y
 		self.start_x = x
 		self.start_y = y
 		self.color = color
 		self.original_color = color
-		self.direction = random.choice([UP, DOWN, LEFT, RIGHT])
+		self.direction = self.rng.choice([UP, DOWN, LEFT, RIGHT])
 		self.move_timer = 0
 		self.personality = personality
 		self.ghost_id = ghost_id  # For spreading behavior
@@ -199,13 +976,15 @@ class Ghost:
 		self.vulnerable_timer = 0
 		self.eaten = False
 		self.returning_home = False
-		self.base_speed = 6
-		self.path_cache = {}
-		self.path_cache_timer = 0
+		self.base_speed = GHOST_BASE_SPEED
+		self.path_table = None  # Shared PathTable, assigned by the game or built on first use
 		self.target_corner = None
 		self.scatter_timer = 0
 		self.mode = "chase"  # chase, scatter, or frightened
 		self.spread_offset = ghost_id * 3  # Each ghost gets different spread behavior
+		self.decisions = 0  # AI decisions made and the CPU seconds they took
+		self.decision_time = 0.0
+		self.deferred = 0  # Moves made on the last plan since the last full decision
 
 	def set_vulnerable(self, duration):
 		self.vulnerable = True
@@ -255,14 +1034,15 @@ class Ghost:
 
 	def get_corner_target(self):
 		"""Get corner target based on personality"""
+		right, bottom = self.path_table.width - 2, self.path_table.height - 2
 		if self.personality == "aggressive":
 			return (1, 1)  # Top-left
 		elif self.personality == "ambush":
-			return (18, 1)  # Top-right
+			return (right, 1)  # Top-right
 		elif self.personality == "patrol":
-			return (18, 19)  # Bottom-right
+			return (right, bottom)  # Bottom-right
 		else:  # unpredictable
-			return (1, 19)  # Bottom-left
+			return (1, bottom)  # Bottom-left
 
 	def calculate_distance(self, x1, y1, x2, y2):
 		"""Calculate Manhattan distance with tunnel consideration"""
@@ -270,8 +1050,8 @@ class Ghost:
 		dy = abs(y1 - y2)
 
 		# Consider tunnel shortcut on tunnel row
-		if y1 == TUNNEL_ROW and y2 == TUNNEL_ROW:
-			tunnel_distance = min(dx, 20 - dx)  # 20 is maze width
+		if y1 == self.path_table.tunnel_row and y2 == self.path_table.tunnel_row:
+			tunnel_distance = min(dx, self.path_table.width - dx)
 			return tunnel_distance + dy
 
 		return dx + dy
@@ -284,71 +1064,17 @@ class Ghost:
 				positions.append((ghost.x, ghost.y))
 		return positions
 
-	def find_path_to_target(self, maze, target_x, target_y):
-		"""Advanced BFS pathfinding with caching and tunnel support"""
-		cache_key = (self.x, self.y, target_x, target_y)
-
-		# Use cached path if recent and valid
-		if (cache_key in self.path_cache and
-			self.path_cache_timer < 30):  # Cache for 30 frames
-			return self.path_cache[cache_key]
-
-		queue = deque([(self.x, self.y, [])])
-		visited = set()
-		visited.add((self.x, self.y))
-
-		while queue:
-			x, y, path = queue.popleft()
-
-			if x == target_x and y == target_y:
-				self.path_cache[cache_key] = path
-				self.path_cache_timer = 0
-				return path
-
-			if len(path) > 20:  # Increased search depth
-				continue
-
-			for dx, dy in [UP, DOWN, LEFT, RIGHT]:
-				new_x, new_y = x + dx, y + dy
-
-				# Handle tunnel wraparound for ghosts too
-				if new_y == TUNNEL_ROW:
-					if new_x < 0:
-						new_x = len(maze[0]) - 1
-					elif new_x >= len(maze[0]):
-						new_x = 0
-
-				if ((new_x, new_y) not in visited and
-					0 <= new_x < len(maze[0]) and
-					0 <= new_y < len(maze) and
-					maze[new_y][new_x] != 1):
-
-					visited.add((new_x, new_y))
-					new_path = path + [(dx, dy)]
-					queue.append((new_x, new_y, new_path))
-
-		# Cache empty result too
-		self.path_cache[cache_key] = []
-		return []
+	def next_step_to_target(self, maze, target_x, target_y):
+		"""First move towards the target from the shared path table, or None"""
+		if self.path_table is None:
+			self.path_table = PathTable.for_maze(maze)
+		distance = self.path_table.distance(self.x, self.y, target_x, target_y)
+		if distance is None or distance > MAX_PATH_LENGTH:
+			return None
+		return self.path_table.next_direction(self.x, self.y, target_x, target_y)
 
 	def get_valid_moves(self, maze):
-		valid_moves = []
-		for dx, dy in [UP, DOWN, LEFT, RIGHT]:
-			new_x = self.x + dx
-			new_y = self.y + dy
-
-			# Handle tunnel wraparound
-			if new_y == TUNNEL_ROW:
-				if new_x < 0:
-					new_x = len(maze[0]) - 1
-				elif new_x >= len(maze[0]):
-					new_x = 0
-
-			if (0 <= new_x < len(maze[0]) and
-				0 <= new_y < len(maze) and
-				maze[new_y][new_x] != 1):  # Not a wall
-				valid_moves.append((dx, dy))
-		return valid_moves
+		return maze.valid_moves(self.x, self.y)
 
 	def get_spread_target(self, pacman_x, pacman_y, other_ghost_positions):
 		"""Calculate a spread-out target to avoid clustering"""
@@ -368,8 +1094,8 @@ class Ghost:
 			target_y = pacman_y + int(6 * math.sin(math.radians(angle)))
 		else:  # unpredictable
 			# Random positions around Pac-Man
-			offset_x = random.choice([-5, -3, 3, 5])
-			offset_y = random.choice([-5, -3, 3, 5])
+			offset_x = self.rng.choice([-5, -3, 3, 5])
+			offset_y = self.rng.choice([-5, -3, 3, 5])
 			target_x = pacman_x + offset_x
 			target_y = pacman_y + offset_y
 
@@ -388,8 +1114,8 @@ class Ghost:
 					target_y += 2
 
 		# Clamp to maze bounds
-		target_x = max(1, min(18, target_x))
-		target_y = max(1, min(19, target_y))
+		target_x = max(1, min(self.path_table.width - 2, target_x))
+		target_y = max(1, min(self.path_table.height - 2, target_y))
 
 		return target_x, target_y
 
@@ -398,16 +1124,18 @@ class Ghost:
 		predicted_x = pacman_x + pacman_direction[0] * steps
 		predicted_y = pacman_y + pacman_direction[1] * steps
 
+		width, height = self.path_table.width, self.path_table.height
+
 		# Handle tunnel wraparound in prediction
-		if predicted_y == TUNNEL_ROW:
+		if predicted_y == self.path_table.tunnel_row:
 			if predicted_x < 0:
-				predicted_x = 19
-			elif predicted_x >= 20:
+				predicted_x = width - 1
+			elif predicted_x >= width:
 				predicted_x = 0
 
 		# Clamp to maze bounds
-		predicted_x = max(0, min(19, predicted_x))
-		predicted_y = max(0, min(20, predicted_y))
+		predicted_x = max(0, min(width - 1, predicted_x))
+		predicted_y = max(0, min(height - 1, predicted_y))
 
 		return predicted_x, predicted_y
 
@@ -424,12 +1152,24 @@ class Ghost:
 				self.mode = "chase"
 				self.scatter_timer = 0
 
-	def choose_smart_move(self, maze, pacman_x, pacman_y, pacman_direction, all_ghosts):
+	def pacman_distance(self, pacman_field, x, y, pacman_x, pacman_y):
+		"""Maze distance to Pac-Man read from the shared field, Manhattan if unreachable"""
+		distance = pacman_field.distance(x, y)
+		if distance is None:
+			return self.calculate_distance(x, y, pacman_x, pacman_y)
+		return distance
+
+	def choose_smart_move(self, maze, pacman_x, pacman_y, pacman_direction, all_ghosts, pacman_field=None):
 		"""Ultra-smart movement with improved spreading and no disappearing"""
 		valid_moves = self.get_valid_moves(maze)
 		if not valid_moves:
 			return (0, 0)
 
+		if self.path_table is None:
+			self.path_table = PathTable.for_maze(maze)
+		if pacman_field is None:
+			pacman_field = DistanceField(self.path_table, pacman_x, pacman_y)
+
 		# Update ghost mode
 		self.update_mode()
 
@@ -441,16 +1181,16 @@ class Ghost:
 				return (0, 0)
 
 			# Find path home
-			path = self.find_path_to_target(maze, self.start_x, self.start_y)
-			if path and len(path) > 0:
-				return path[0]
+			step = self.next_step_to_target(maze, self.start_x, self.start_y)
+			if step:
+				return step
 			else:
 				# Fallback if pathfinding fails
 				dx = 1 if self.start_x > self.x else -1 if self.start_x < self.x else 0
 				dy = 1 if self.start_y > self.y else -1 if self.start_y < self.y else 0
 				if (dx, dy) in valid_moves:
 					return (dx, dy)
-				return random.choice(valid_moves)
+				return self.rng.choice(valid_moves)
 
 		# Get other ghost positions for spreading
 		other_ghost_positions = self.get_other_ghost_positions(all_ghosts)
@@ -461,16 +1201,9 @@ class Ghost:
 			max_distance = -1
 
 			for dx, dy in valid_moves:
-				new_x, new_y = self.x + dx, self.y + dy
-
-				# Handle tunnel wraparound
-				if new_y == TUNNEL_ROW:
-					if new_x < 0:
-						new_x = len(maze[0]) - 1
-					elif new_x >= len(maze[0]):
-						new_x = 0
+				new_x, new_y = maze.step(self.x, self.y, (dx, dy))
 
-				distance_to_pacman = self.calculate_distance(new_x, new_y, pacman_x, pacman_y)
+				distance_to_pacman = self.pacman_distance(pacman_field, new_x, new_y, pacman_x, pacman_y)
 
 				# Avoid other ghosts bonus
 				ghost_avoidance_bonus = 0
@@ -481,7 +1214,7 @@ class Ghost:
 
 				# Prefer corners when vulnerable
 				corner_bonus = 0
-				if new_x <= 2 or new_x >= 17 or new_y <= 2 or new_y >= 18:
+				if new_x <= 2 or new_x >= self.path_table.width - 3 or new_y <= 2 or new_y >= self.path_table.height - 3:
 					corner_bonus = 5
 
 				total_score = distance_to_pacman + corner_bonus + ghost_avoidance_bonus
@@ -497,14 +1230,14 @@ class Ghost:
 		if self.mode == "scatter":
 			corner_x, corner_y = self.get_corner_target()
 			# Add some randomness to prevent exact clustering
-			corner_x += random.randint(-2, 2)
-			corner_y += random.randint(-2, 2)
-			corner_x = max(1, min(18, corner_x))
-			corner_y = max(1, min(19, corner_y))
+			corner_x += self.rng.randint(-2, 2)
+			corner_y += self.rng.randint(-2, 2)
+			corner_x = max(1, min(self.path_table.width - 2, corner_x))
+			corner_y = max(1, min(self.path_table.height - 2, corner_y))
 
-			path = self.find_path_to_target(maze, corner_x, corner_y)
-			if path and len(path) > 0:
-				return path[0]
+			step = self.next_step_to_target(maze, corner_x, corner_y)
+			if step:
+				return step
 
 		# Chase mode - IMPROVED with better spreading
 		if self.mode == "chase":
@@ -513,9 +1246,9 @@ class Ghost:
 
 			if self.personality == "aggressive":
 				# Red ghost - direct but spread approach
-				path = self.find_path_to_target(maze, target_x, target_y)
-				if path and len(path) > 0:
-					return path[0]
+				step = self.next_step_to_target(maze, target_x, target_y)
+				if step:
+					return step
 
 			elif self.personality == "ambush":
 				# Pink ghost - predictive ambush with spreading
@@ -528,43 +1261,43 @@ class Ghost:
 						predicted_x += 3 if predicted_x > 10 else -3
 						predicted_y += 2 if predicted_y > 10 else -2
 
-				path = self.find_path_to_target(maze, predicted_x, predicted_y)
-				if path and len(path) > 0:
-					return path[0]
+				step = self.next_step_to_target(maze, predicted_x, predicted_y)
+				if step:
+					return step
 
 			elif self.personality == "patrol":
 				# Cyan ghost - circling behavior with better spreading
-				distance_to_pacman = self.calculate_distance(self.x, self.y, pacman_x, pacman_y)
+				distance_to_pacman = self.pacman_distance(pacman_field, self.x, self.y, pacman_x, pacman_y)
 
 				if distance_to_pacman > 8:
 					# Far away - approach but maintain spread
-					path = self.find_path_to_target(maze, target_x, target_y)
-					if path and len(path) > 0:
-						return path[0]
+					step = self.next_step_to_target(maze, target_x, target_y)
+					if step:
+						return step
 				else:
 					# Close - maintain patrol pattern
 					patrol_x = target_x
 					patrol_y = target_y
-					path = self.find_path_to_target(maze, patrol_x, patrol_y)
-					if path and len(path) > 0:
-						return path[0]
+					step = self.next_step_to_target(maze, patrol_x, patrol_y)
+					if step:
+						return step
 
 			elif self.personality == "unpredictable":
 				# Orange ghost - truly unpredictable with spreading
-				distance_to_pacman = self.calculate_distance(self.x, self.y, pacman_x, pacman_y)
+				distance_to_pacman = self.pacman_distance(pacman_field, self.x, self.y, pacman_x, pacman_y)
 
 				if distance_to_pacman > 8:
 					# Far away - approach spread target
-					path = self.find_path_to_target(maze, target_x, target_y)
-					if path and len(path) > 0:
-						return path[0]
+					step = self.next_step_to_target(maze, target_x, target_y)
+					if step:
+						return step
 				else:
 					# Close - be truly unpredictable
-					if random.random() < 0.3:
+					if self.rng.random() < 0.3:
 						# Sometimes approach anyway
-						path = self.find_path_to_target(maze, target_x, target_y)
-						if path and len(path) > 0:
-							return path[0]
+						step = self.next_step_to_target(maze, target_x, target_y)
+						if step:
+							return step
 					else:
 						# Random movement with ghost avoidance
 						best_moves = []
@@ -579,12 +1312,13 @@ class Ghost:
 								best_moves.append((dx, dy))
 
 						if best_moves:
-							return random.choice(best_moves)
+							return self.rng.choice(best_moves)
 
-		# Fallback: smart chase with ghost avoidance
-		path = self.find_path_to_target(maze, pacman_x, pacman_y)
-		if path and len(path) > 0:
-			return path[0]
+		# Fallback: smart chase down the shared Pac-Man distance field
+		if self.pacman_distance(pacman_field, self.x, self.y, pacman_x, pacman_y) <= MAX_PATH_LENGTH:
+			step = pacman_field.downhill(self.x, self.y)
+			if step:
+				return step
 
 		# Final fallback: avoid reversing and avoid other ghosts
 		opposite_dir = (-self.direction[0], -self.direction[1])
@@ -602,205 +1336,163 @@ class Ghost:
 					good_moves.append((dx, dy))
 
 		if good_moves:
-			return random.choice(good_moves)
+			return self.rng.choice(good_moves)
+
+		return self.rng.choice(valid_moves)
 
-		return random.choice(valid_moves)
+	def follow_plan(self, maze, pacman_field):
+		"""Cheap move for when the decision budget is spent: keep going along a corridor,
+		otherwise head for home, flee or chase down the shared Pac-Man field"""
+		valid_moves = self.get_valid_moves(maze)
+		if not valid_moves:
+			return (0, 0)
+		self.update_mode()
+
+		if self.direction in valid_moves and len(valid_moves) <= 2:
+			return self.direction
+
+		if self.eaten or self.returning_home:
+			step = self.next_step_to_target(maze, self.start_x, self.start_y)
+			if step:
+				return step
+		elif self.vulnerable:
+			return max(valid_moves, key=lambda move: self.flee_distance(maze, pacman_field, move))
+		elif self.mode == "chase":
+			step = pacman_field.downhill(self.x, self.y)
+			if step:
+				return step
 
-	def move(self, maze, pacman_x, pacman_y, pacman_direction, level_speed_multiplier=1.0, all_ghosts=None):
-		# Update vulnerable state and timers
+		opposite_dir = (-self.direction[0], -self.direction[1])
+		for move in valid_moves:
+			if move != opposite_dir:
+				return move
+		return valid_moves[0]
+
+	def flee_distance(self, maze, pacman_field, move):
+		"""How far from Pac-Man a move leads; cells he cannot reach are the safest"""
+		x, y = maze.step(self.x, self.y, move)  # Through the tunnel too
+		distance = pacman_field.distance(x, y)
+		if distance is None:
+			return PathTable.UNREACHABLE
+		return distance
+
+	def ready_to_move(self, level_speed_multiplier=1.0):
+		"""Advance the ghost's timers; True when it is due to move this tick"""
 		self.update_vulnerable_state()
-		self.path_cache_timer += 1
 
 		self.move_timer += 1
 		# Increase speed based on level
-		adjusted_speed = max(1, int(self.base_speed / level_speed_multiplier))
+		adjusted_speed = ghost_move_delay(level_speed_multiplier, self.base_speed)
 		move_speed = adjusted_speed + 2 if self.vulnerable else adjusted_speed
 
 		if self.move_timer < move_speed:
-			return
+			return False
 
 		self.move_timer = 0
+		return True
+
+	def decide(self, maze, pacman_x, pacman_y, pacman_direction, all_ghosts, pacman_field):
+		"""Full AI decision, timed for the tournament's per-decision cost"""
+		decision_start = time.perf_counter()
+		move = self.choose_smart_move(maze, pacman_x, pacman_y, pacman_direction, all_ghosts, pacman_field)
+		self.decision_time += time.perf_counter() - decision_start
+		self.decisions += 1
+		self.deferred = 0
+		return move
+
+	def move(self, maze, pacman_x, pacman_y, pacman_direction, level_speed_multiplier=1.0, all_ghosts=None, pacman_field=None):
+		if not self.ready_to_move(level_speed_multiplier):
+			return
 
 		# Choose move based on ultra-smart AI with spreading
 		if all_ghosts is None:
 			all_ghosts = []
-		dx, dy = self.choose_smart_move(maze, pacman_x, pacman_y, pacman_direction, all_ghosts)
-
-		# Apply movement with tunnel support
-		new_x = self.x + dx
-		new_y = self.y + dy
-
-		# Handle tunnel wraparound
-		if new_y == TUNNEL_ROW:
-			if new_x < 0:
-				new_x = len(maze[0]) - 1
-			elif new_x >= len(maze[0]):
-				new_x = 0
-
-		if (0 <= new_x < len(maze[0]) and
-			0 <= new_y < len(maze) and
-			maze[new_y][new_x] != 1):
-			self.x = new_x
-			self.y = new_y
+		self.apply_move(maze, *self.decide(maze, pacman_x, pacman_y, pacman_direction, all_ghosts, pacman_field))
+
+	def apply_move(self, maze, dx, dy):
+		if (dx, dy) == (0, 0):
+			# Standing still (no way out, or just respawned)
+			self.direction = (0, 0)
+			return
+
+		# The maze handles walls and the tunnel wraparound
+		target = maze.step(self.x, self.y, (dx, dy))
+		if target is not None:
+			self.x, self.y = target
 			self.direction = (dx, dy)
 
-	def draw(self, screen):
+	def draw(self, screen, position=None):
 		# FIXED: Always draw ghost unless specifically being respawned
 		if self.eaten and self.returning_home and abs(self.x - self.start_x) <= 1 and abs(self.y - self.start_y) <= 1:
 			return  # Only don't draw when actually respawning at home
 
-		center_x = self.x * CELL_SIZE + CELL_SIZE // 2
-		center_y = self.y * CELL_SIZE + CELL_SIZE // 2
-		radius = CELL_SIZE // 3
-
-		# Draw ghost body (circle + rectangle)
-		ghost_color = self.color if not (self.eaten and self.returning_home) else GRAY
-		pygame.draw.circle(screen, ghost_color, (center_x, center_y - 2), radius)
-		pygame.draw.rect(screen, ghost_color,
-						(center_x - radius, center_y - 2, radius * 2, radius + 2))
-
-		# Draw wavy bottom
-		wave_points = []
-		for i in range(5):
-			x = center_x - radius + (i * radius * 2 // 4)
-			y = center_y + radius if i % 2 == 0 else center_y + radius - 4
-			wave_points.append((x, y))
-		wave_points.append((center_x + radius, center_y + radius))
-		wave_points.append((center_x - radius, center_y + radius))
-		pygame.draw.polygon(screen, ghost_color, wave_points)
-
-		# Draw eyes - different for eaten ghosts
-		eye_size = 3
 		if self.eaten and self.returning_home:
-			# Draw dot eyes for eaten ghosts
-			pygame.draw.circle(screen, WHITE, (center_x - 6, center_y - 8), 2)
-			pygame.draw.circle(screen, WHITE, (center_x + 6, center_y - 8), 2)
+			sprite = SPRITES.ghost(GRAY, "eaten")
+		elif self.vulnerable and self.vulnerable_timer < 60:
+			sprite = SPRITES.ghost(self.color, "flashing")
 		else:
-			eye_color = WHITE if not self.vulnerable or self.vulnerable_timer >= 60 else BLACK
-			pygame.draw.circle(screen, eye_color, (center_x - 6, center_y - 8), eye_size)
-			pygame.draw.circle(screen, eye_color, (center_x + 6, center_y - 8), eye_size)
-			if not self.vulnerable or self.vulnerable_timer >= 60:
-				pygame.draw.circle(screen, BLACK, (center_x - 6, center_y - 8), 2)
-				pygame.draw.circle(screen, BLACK, (center_x + 6, center_y - 8), 2)
+			sprite = SPRITES.ghost(self.color, "normal")
+		if position is None:
+			position = (self.x * CELL_SIZE, self.y * CELL_SIZE)
+		screen.blit(sprite, position)
+
+class GhostScheduler:
+	"""Spreads ghost AI decisions over logic ticks within a fixed budget.
+
+	Ghosts start with staggered move timers so their decisions rarely fall on
+	the same tick. When more are due than the budget allows, the ones that
+	have waited longest get a full choose_smart_move and the rest take a cheap
+	step on their last plan. The budget counts decisions, not wall time, so a
+	seed plus an input stream still replays the same game.
+	"""
+
+	def __init__(self, budget=GHOST_DECISIONS_PER_TICK):
+		self.budget = budget
+
+	@staticmethod
+	def stagger(ghosts):
+		"""Spread the ghosts' first moves evenly over one move interval"""
+		for index, ghost in enumerate(ghosts):
+			ghost.move_timer = index * ghost.base_speed // len(ghosts)
+
+	def move_ghosts(self, ghosts, maze, pacman, level_speed_multiplier, pacman_field):
+		due = [ghost for ghost in ghosts if ghost.ready_to_move(level_speed_multiplier)]
+		if len(due) > self.budget:
+			due.sort(key=lambda ghost: -ghost.deferred)
+		for rank, ghost in enumerate(due):
+			if rank < self.budget:
+				move = ghost.decide(maze, pacman.x, pacman.y, pacman.direction, ghosts, pacman_field)
+			else:
+				move = ghost.follow_plan(maze, pacman_field)
+				ghost.deferred += 1
+			ghost.apply_move(maze, *move)
 
 class Fruit:
-	def __init__(self, x, y):
+	def __init__(self, x, y, rng=random, spawn_frame=0):
 		self.x = x
 		self.y = y
-		self.fruit_type = random.choice(FRUITS)
-		self.spawn_time = time.time()
-		self.lifetime = 10  # Fruit disappears after 10 seconds
+		self.fruit_type = rng.choice(FRUITS)
+		self.spawn_frame = spawn_frame
+		self.lifetime = FRUIT_LIFETIME
 		self.pulse_timer = 0
 
-	def is_expired(self):
-		return time.time() - self.spawn_time > self.lifetime
+	def is_expired(self, frame):
+		return frame - self.spawn_frame > self.lifetime
 
 	def get_points(self):
 		return self.fruit_type[1]
 
-	def draw_cherry(self, screen, center_x, center_y):
-		# Draw cherry stems
-		pygame.draw.line(screen, BROWN, (center_x-4, center_y-10), (center_x-4, center_y-4), 3)
-		pygame.draw.line(screen, BROWN, (center_x+4, center_y-10), (center_x+4, center_y-4), 3)
-		# Draw cherry bodies
-		pygame.draw.circle(screen, self.fruit_type[2], (center_x-4, center_y), 6)
-		pygame.draw.circle(screen, self.fruit_type[2], (center_x+4, center_y), 6)
-		# Highlight
-		pygame.draw.circle(screen, WHITE, (center_x-6, center_y-2), 2)
-		pygame.draw.circle(screen, WHITE, (center_x+2, center_y-2), 2)
-
-	def draw_strawberry(self, screen, center_x, center_y):
-		# Draw strawberry body
-		points = [(center_x, center_y+8), (center_x-6, center_y), (center_x-4, center_y-5),
-				 (center_x+4, center_y-5), (center_x+6, center_y)]
-		pygame.draw.polygon(screen, self.fruit_type[2], points)
-		# Draw leaves
-		pygame.draw.rect(screen, self.fruit_type[3], (center_x-5, center_y-8, 10, 4))
-		# Draw seeds
-		for i in range(3):
-			for j in range(2):
-				pygame.draw.circle(screen, WHITE, (center_x-4+i*4, center_y-1+j*4), 1)
-
-	def draw_orange(self, screen, center_x, center_y):
-		# Draw orange body
-		pygame.draw.circle(screen, self.fruit_type[2], (center_x, center_y), 8)
-		# Draw orange texture lines
-		for angle in range(0, 360, 45):
-			end_x = center_x + 6 * math.cos(math.radians(angle))
-			end_y = center_y + 6 * math.sin(math.radians(angle))
-			pygame.draw.line(screen, DARK_RED, (center_x, center_y), (end_x, end_y), 2)
-		# Draw stem
-		pygame.draw.circle(screen, self.fruit_type[3], (center_x, center_y-8), 3)
-
-	def draw_apple(self, screen, center_x, center_y):
-		# Draw apple body
-		pygame.draw.circle(screen, self.fruit_type[2], (center_x, center_y+1), 7)
-		# Draw apple indent at top
-		pygame.draw.circle(screen, BLACK, (center_x, center_y-5), 4)
-		pygame.draw.circle(screen, self.fruit_type[2], (center_x, center_y-3), 4)
-		# Draw stem
-		pygame.draw.line(screen, BROWN, (center_x, center_y-8), (center_x, center_y-4), 3)
-		# Draw leaf
-		pygame.draw.circle(screen, self.fruit_type[3], (center_x+3, center_y-6), 3)
-
-	def draw_grapes(self, screen, center_x, center_y):
-		# Draw grape cluster
-		for row in range(3):
-			for col in range(2 - row % 2):
-				x = center_x - 4 + col * 8 + (row % 2) * 4
-				y = center_y - 5 + row * 4
-				pygame.draw.circle(screen, self.fruit_type[2], (x, y), 4)
-		# Draw stem
-		pygame.draw.line(screen, self.fruit_type[3], (center_x, center_y-9), (center_x, center_y-5), 3)
-
-	def draw_bell(self, screen, center_x, center_y):
-		# Draw bell body
-		points = [(center_x-8, center_y+5), (center_x-8, center_y-2), (center_x-3, center_y-8),
-				 (center_x+3, center_y-8), (center_x+8, center_y-2), (center_x+8, center_y+5)]
-		pygame.draw.polygon(screen, self.fruit_type[2], points)
-		# Draw bell bottom
-		pygame.draw.rect(screen, BROWN, (center_x-9, center_y+5, 18, 3))
-		# Draw clapper
-		pygame.draw.circle(screen, BLACK, (center_x, center_y+3), 3)
-		# Draw highlight
-		pygame.draw.circle(screen, WHITE, (center_x-4, center_y-4), 3)
-
-	def draw_key(self, screen, center_x, center_y):
-		# Draw key shaft
-		pygame.draw.rect(screen, self.fruit_type[2], (center_x-8, center_y-1, 10, 3))
-		# Draw key head (circle)
-		pygame.draw.circle(screen, self.fruit_type[2], (center_x+8, center_y), 5)
-		pygame.draw.circle(screen, BLACK, (center_x+8, center_y), 3)
-		# Draw key teeth
-		pygame.draw.rect(screen, self.fruit_type[2], (center_x-8, center_y+1, 3, 4))
-		pygame.draw.rect(screen, self.fruit_type[2], (center_x-5, center_y+1, 3, 3))
+	def update(self):
+		# Pulse effect for visibility, counted in logic ticks
+		self.pulse_timer += 1
 
 	def draw(self, screen):
-		center_x = self.x * CELL_SIZE + CELL_SIZE // 2
-		center_y = self.y * CELL_SIZE + CELL_SIZE // 2
-
-		# Draw black background
-		pygame.draw.rect(screen, BLACK, (self.x * CELL_SIZE, self.y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+		rect = (self.x * CELL_SIZE, self.y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
 
-		# Pulse effect for visibility
-		self.pulse_timer += 1
 		if self.pulse_timer % 60 < 30:  # Pulse every 2 seconds
-			# Draw fruit based on type
-			fruit_name = self.fruit_type[0]
-			if fruit_name == "cherry":
-				self.draw_cherry(screen, center_x, center_y)
-			elif fruit_name == "strawberry":
-				self.draw_strawberry(screen, center_x, center_y)
-			elif fruit_name == "orange":
-				self.draw_orange(screen, center_x, center_y)
-			elif fruit_name == "apple":
-				self.draw_apple(screen, center_x, center_y)
-			elif fruit_name == "grapes":
-				self.draw_grapes(screen, center_x, center_y)
-			elif fruit_name == "bell":
-				self.draw_bell(screen, center_x, center_y)
-			elif fruit_name == "key":
-				self.draw_key(screen, center_x, center_y)
+			screen.blit(SPRITES.fruit(self.fruit_type), rect)
+		else:
+			screen.fill(BLACK, rect)
 
 class LifeNotification:
 	def __init__(self, message, color=GREEN):
@@ -818,10 +1510,11 @@ class LifeNotification:
 	def draw(self, screen, font):
 		if self.timer > 0:
 			# Create surface with text
-			text_surface = font.render(self.message, True, self.color)
+			text_surface = render_text(font, self.message, self.color)
 
-			# Apply alpha transparency
+			# Apply alpha transparency to a copy; the cached surface is shared
 			if self.alpha < 255:
+				text_surface = text_surface.copy()
 				text_surface.set_alpha(self.alpha)
 
 			# Center text on screen
@@ -829,13 +1522,13 @@ class LifeNotification:
 			screen.blit(text_surface, text_rect)
 
 class WinDialog:
+	"""Level-complete dialog. Its buttons need no fonts or display, so the
+	simulation opens it and hit-tests clicks even when nothing is drawn."""
+
 	def __init__(self, screen, score, level):
 		self.screen = screen
 		self.score = score
 		self.level = level
-		self.font_large = pygame.font.Font(None, 48)
-		self.font_medium = pygame.font.Font(None, 36)
-		self.font_small = pygame.font.Font(None, 24)
 
 		# Dialog dimensions
 		self.width = 450
@@ -856,6 +1549,10 @@ class WinDialog:
 		)
 
 	def draw(self):
+		font_large = load_font(48)
+		font_medium = load_font(36)
+		font_small = load_font(24)
+
 		# Draw semi-transparent overlay
 		overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
 		overlay.set_alpha(128)
@@ -867,40 +1564,40 @@ class WinDialog:
 		pygame.draw.rect(self.screen, BLACK, (self.x, self.y, self.width, self.height), 3)
 
 		# Draw title
-		title_text = self.font_large.render("🎉 LEVEL COMPLETE! 🎉", True, GREEN)
+		title_text = render_text(font_large, "🎉 LEVEL COMPLETE! 🎉", GREEN)
 		title_rect = title_text.get_rect(center=(self.x + self.width//2, self.y + 35))
 		self.screen.blit(title_text, title_rect)
 
 		# Draw level info
-		level_text = self.font_medium.render(f"Level {self.level} Cleared!", True, BLACK)
+		level_text = render_text(font_medium, f"Level {self.level} Cleared!", BLACK)
 		level_rect = level_text.get_rect(center=(self.x + self.width//2, self.y + 75))
 		self.screen.blit(level_text, level_rect)
 
 		# Draw score
-		score_text = self.font_medium.render(f"Score: {self.score}", True, BLACK)
+		score_text = render_text(font_medium, f"Score: {self.score}", BLACK)
 		score_rect = score_text.get_rect(center=(self.x + self.width//2, self.y + 110))
 		self.screen.blit(score_text, score_rect)
 
 		# Draw message
-		msg_text = self.font_medium.render("All dots collected!", True, BLACK)
+		msg_text = render_text(font_medium, "All dots collected!", BLACK)
 		msg_rect = msg_text.get_rect(center=(self.x + self.width//2, self.y + 140))
 		self.screen.blit(msg_text, msg_rect)
 
 		# Draw question
-		question_text = self.font_medium.render("Continue to next level?", True, BLACK)
+		question_text = render_text(font_medium, "Continue to next level?", BLACK)
 		question_rect = question_text.get_rect(center=(self.x + self.width//2, self.y + 175))
 		self.screen.blit(question_text, question_rect)
 
 		# Draw buttons
 		pygame.draw.rect(self.screen, GREEN, self.continue_button_rect)
 		pygame.draw.rect(self.screen, BLACK, self.continue_button_rect, 2)
-		continue_text = self.font_small.render("NEXT LEVEL", True, BLACK)
+		continue_text = render_text(font_small, "NEXT LEVEL", BLACK)
 		continue_text_rect = continue_text.get_rect(center=self.continue_button_rect.center)
 		self.screen.blit(continue_text, continue_text_rect)
 
 		pygame.draw.rect(self.screen, RED, self.quit_button_rect)
 		pygame.draw.rect(self.screen, BLACK, self.quit_button_rect, 2)
-		quit_text = self.font_small.render("QUIT", True, WHITE)
+		quit_text = render_text(font_small, "QUIT", WHITE)
 		quit_text_rect = quit_text.get_rect(center=self.quit_button_rect.center)
 		self.screen.blit(quit_text, quit_text_rect)
 
@@ -911,24 +1608,39 @@ class WinDialog:
 			return "quit"
 		return None
 
-class Game:
-	def __init__(self, screen=None):
-		if screen is None:
-			self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+class Game(GameLoop):
+	# Scalar game attributes the simulation changes; snapshot() adds the maze and entities
+	STATE_FIELDS = ("score", "level", "lives", "last_extra_life_score", "game_over", "won", "show_win_dialog",
+					"life_lost_timer", "fruit_spawn_timer", "fruit_spawn_interval", "ghost_eat_multiplier")
+
+	def __init__(self, screen=None, headless=False, seed=None, maze_spec=None):
+		# Headless games never touch the display or fonts; drive them with step()
+		self.headless = headless
+		if screen is None and not headless:
+			screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
 			pygame.display.set_caption("Pac-Man Game - Spread Out Ghosts & No Disappearing")
-			self.own_screen = True
-		else:
-			self.screen = screen
-			self.own_screen = False
-		self.clock = pygame.time.Clock()
-		self.pacman = PacMan(1)  # Initialize with level 1
-		self.maze = [row[:] for row in MAZE]  # Copy the maze
+		# All randomness comes from one seeded RNG and time from the tick counter,
+		# so a seed plus an input stream always replays the same game. Logic runs
+		# at LOGIC_FPS whatever the frame rate
+		GameLoop.__init__(self, screen, seed, LOGIC_FPS,
+						  ("events", "input", "update", "ghosts", "collisions", "draw", "flip", "wait"))
+		self.game_clock = GameClock(LOGIC_FPS)
+		self.fps = RENDER_FPS  # Frame cap in run(); 0 removes it
+		self.maze_spec = maze_spec or MazeSpec.builtin()  # Maze, start cells and ghost base
+		self.pacman = PacMan(1, self.maze_spec.pacman_start)  # Initialize with level 1
+		self.start_maze = self.maze_spec.maze  # Every level starts from a copy of this
+		self.maze = self.start_maze.copy()
+		self.path_table = self.maze_spec.path_table  # Walls never change, so this is built once
+		self.path_cache = PathCache(self.path_table)  # Distance fields shared by all ghosts
+		self.pacman_field = None  # Shared BFS distance field from Pac-Man, one per logic tick
+		self.ghost_setup = self.maze_spec.ghost_setup()  # (x, y, color, personality) per ghost
+		self.ghost_scheduler = GhostScheduler()  # Caps full ghost AI decisions per tick
+		self.difficulty = {}  # Overrides for level_difficulty's tuning parameters
 		self.score = 0
 		self.level = 1
 		self.lives = MAX_LIVES
 		self.last_extra_life_score = 0
-		self.dots_remaining = self.count_dots()
-		self.super_dots_remaining = self.count_super_dots()
+		self.maze_index = self.index_maze()
 		self.game_over = False
 		self.won = False
 		self.show_win_dialog = False
@@ -936,32 +1648,63 @@ class Game:
 		self.life_lost_timer = 0
 
 		# Create ultra-smart ghosts with different personalities and IDs
-		self.ghosts = [
-			Ghost(9, 9, RED, "aggressive", 0),      # Red ghost - aggressive chaser
-			Ghost(10, 9, PINK, "ambush", 1),        # Pink ghost - ambush tactics
-			Ghost(9, 10, CYAN, "patrol", 2),        # Cyan ghost - patrol behavior
-			Ghost(10, 10, ORANGE, "unpredictable", 3)  # Orange ghost - unpredictable
-		]
+		self.ghosts = self.create_ghosts()
 
 		# Fruit system
 		self.current_fruit = None
 		self.fruit_spawn_timer = 0
-		self.fruit_spawn_interval = max(150, 300 - (self.level * 20))  # Faster spawning at higher levels
+		self.fruit_spawn_interval = fruit_spawn_interval(self.level)
 
 		# Ghost eating system
 		self.ghost_eat_multiplier = 1
 
-		# Fonts - adjusted for larger display
-		self.font = pygame.font.Font(None, 32)
-		self.font_large = pygame.font.Font(None, 40)
-		self.font_notification = pygame.font.Font(None, 52)
+		# Fonts are loaded by the renderer on first use
+		self.font = None
+		self.font_large = None
+		self.font_notification = None
 		self.win_dialog = None
+		if not headless:
+			self.load_fonts()
+			SPRITES.preload([color for _, _, color, _ in self.ghost_setup])
+
+		# Renderer caches: walls and dots pre-drawn per level, plus what was drawn last frame
+		self.maze_surface = None
+		self.drawn_maze = None
+		self.last_sprite_rects = []
+		self.hud_state = None
+		self.overlay_drawn = False
+
+	def load_fonts(self):
+		"""Create the HUD fonts - adjusted for larger display"""
+		init_pygame()  # Already done when launched from the arcade
+		self.font = load_font(32)
+		self.font_large = load_font(40)
+		self.font_notification = load_font(52)
+
+	def create_ghosts(self):
+		"""Create the ghosts from ghost_setup, all sharing this maze's path table"""
+		ghosts = []
+		for ghost_id, (x, y, color, personality) in enumerate(self.ghost_setup):
+			ghost = Ghost(x, y, color, personality, ghost_id, self.rng)
+			ghost.path_table = self.path_table
+			ghosts.append(ghost)
+		GhostScheduler.stagger(ghosts)
+		return ghosts
+
+	def index_maze(self):
+		"""Fresh MazeIndex for the current maze: dot counts and fruit spawn cells"""
+		return MazeIndex.for_maze(self.maze, self.path_table, self.pacman.start_x, self.pacman.start_y,
+								  self.maze_spec.ghost_base)
+
+	def update_pacman_field(self):
+		"""Return the distance field rooted at Pac-Man, looking it up only when he has moved"""
+		if self.pacman_field is None or self.pacman_field.root != (self.pacman.x, self.pacman.y):
+			self.pacman_field = self.path_cache.field(self.pacman.x, self.pacman.y)
+		return self.pacman_field
 
 	def get_level_difficulty(self):
 		"""Return difficulty multipliers based on level"""
-		speed_multiplier = 1.0 + (self.level - 1) * 0.3  # Ghosts get 30% faster each level
-		power_duration = max(100, 200 - (self.level - 1) * 15)  # Power pellets last shorter
-		return speed_multiplier, power_duration
+		return level_difficulty(self.level, **self.difficulty)
 
 	def check_extra_life(self):
 		"""Check if player earned an extra life"""
@@ -978,7 +1721,7 @@ class Game:
 	def lose_life(self):
 		"""Lose a life and reset positions"""
 		self.lives -= 1
-		self.life_lost_timer = 90  # 1.5 second pause
+		self.life_lost_timer = LIFE_LOST_PAUSE
 
 		if self.lives <= 0:
 			self.game_over = True
@@ -990,73 +1733,80 @@ class Game:
 				ghost.reset_position()
 			self.life_notification = LifeNotification(f"LIFE LOST! {self.lives} REMAINING", ORANGE)
 
-	def count_dots(self):
-		count = 0
-		for row in self.maze:
-			for cell in row:
-				if cell == 2:  # 2 = regular dot
-					count += 1
-		return count
-
-	def count_super_dots(self):
-		count = 0
-		for row in self.maze:
-			for cell in row:
-				if cell == 4:  # 4 = super dot
-					count += 1
-		return count
+	@property
+	def dots_remaining(self):
+		return self.maze_index.dots
 
-	def spawn_fruit(self):
-		# Find empty spaces to spawn fruit, excluding ghost base
-		empty_spaces = []
-		for y, row in enumerate(self.maze):
-			for x, cell in enumerate(row):
-				if cell == 0 and (x, y) not in GHOST_BASE_COORDS:  # Empty space, not in ghost base
-					empty_spaces.append((x, y))
+	@property
+	def super_dots_remaining(self):
+		return self.maze_index.super_dots
 
-		if empty_spaces:
-			x, y = random.choice(empty_spaces)
-			self.current_fruit = Fruit(x, y)
+	def spawn_fruit(self):
+		# Any reachable empty cell outside the ghost base
+		cell = self.maze_index.random_free_cell(self.rng)
+		if cell is not None:
+			x, y = cell
+			self.current_fruit = Fruit(x, y, self.rng, self.game_clock.frame)
+
+	def draw_cell(self, surface, x, y, cell):
+		rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+
+		if cell == 1:  # Wall
+			pygame.draw.rect(surface, BLUE, rect)
+		elif cell == 2:  # Regular dot
+			pygame.draw.rect(surface, BLACK, rect)
+			pygame.draw.circle(surface, WHITE, rect.center, 4)
+		elif cell == 4:  # Super dot (power pellet)
+			pygame.draw.rect(surface, BLACK, rect)
+			pygame.draw.circle(surface, WHITE, rect.center, 10)
+			pygame.draw.circle(surface, YELLOW, rect.center, 8)
+		else:  # Empty space
+			pygame.draw.rect(surface, BLACK, rect)
+		return rect
+
+	def build_maze_surface(self):
+		"""Pre-render walls and dots once per level"""
+		maze = self.maze
+		self.maze_surface = pygame.Surface((maze.width * CELL_SIZE, maze.height * CELL_SIZE), 0, self.screen)
+		for cell, item in enumerate(maze.cells):
+			self.draw_cell(self.maze_surface, cell % maze.width, cell // maze.width, item)
+		self.drawn_maze = bytearray(maze.cells)
+
+	def sync_maze_surface(self):
+		"""Erase eaten dots from the cached maze; returns the rects that changed"""
+		cells = self.maze.cells
+		drawn = self.drawn_maze
+		if cells == drawn:
+			return []
+		changed = []
+		width = self.maze.width
+		for start in range(0, len(cells), width):
+			end = start + width
+			if cells[start:end] == drawn[start:end]:
+				continue
+			for cell in range(start, end):
+				if cells[cell] != drawn[cell]:
+					changed.append(self.draw_cell(self.maze_surface, cell - start, start // width, cells[cell]))
+					drawn[cell] = cells[cell]
+		return changed
 
 	def draw_maze(self):
-		for y, row in enumerate(self.maze):
-			for x, cell in enumerate(row):
-				rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-
-				if cell == 1:  # Wall
-					pygame.draw.rect(self.screen, BLUE, rect)
-				elif cell == 2:  # Regular dot
-					pygame.draw.rect(self.screen, BLACK, rect)
-					center_x = x * CELL_SIZE + CELL_SIZE // 2
-					center_y = y * CELL_SIZE + CELL_SIZE // 2
-					pygame.draw.circle(self.screen, WHITE, (center_x, center_y), 4)
-				elif cell == 4:  # Super dot (power pellet)
-					pygame.draw.rect(self.screen, BLACK, rect)
-					center_x = x * CELL_SIZE + CELL_SIZE // 2
-					center_y = y * CELL_SIZE + CELL_SIZE // 2
-					pygame.draw.circle(self.screen, WHITE, (center_x, center_y), 10)
-					pygame.draw.circle(self.screen, YELLOW, (center_x, center_y), 8)
-				else:  # Empty space
-					pygame.draw.rect(self.screen, BLACK, rect)
-
-		# Draw fruit if it exists and not expired
-		if self.current_fruit and not self.current_fruit.is_expired():
+		self.screen.blit(self.maze_surface, (0, 0))
+
+		# Draw fruit if it exists
+		if self.current_fruit:
 			self.current_fruit.draw(self.screen)
-		elif self.current_fruit and self.current_fruit.is_expired():
-			self.current_fruit = None
 
 	def collect_items(self):
-		cell = self.maze[self.pacman.y][self.pacman.x]
+		cell = self.maze.get(self.pacman.x, self.pacman.y)
 
 		if cell == 2:  # Regular dot
-			self.maze[self.pacman.y][self.pacman.x] = 0
+			self.maze_index.set_cell(self.maze, self.pacman.x, self.pacman.y, 0)
 			self.score += 10
-			self.dots_remaining -= 1
 
 		elif cell == 4:  # Super dot (power pellet)
-			self.maze[self.pacman.y][self.pacman.x] = 0
+			self.maze_index.set_cell(self.maze, self.pacman.x, self.pacman.y, 0)
 			self.score += 50
-			self.super_dots_remaining -= 1
 			# Make all ghosts vulnerable with level-adjusted duration
 			speed_multiplier, power_duration = self.get_level_difficulty()
 			for ghost in self.ghosts:
@@ -1096,6 +1846,11 @@ class Game:
 		return False
 
 	def update_fruit_spawning(self):
+		if self.current_fruit and self.current_fruit.is_expired(self.game_clock.frame):
+			self.current_fruit = None
+		if self.current_fruit:
+			self.current_fruit.update()
+
 		self.fruit_spawn_timer += 1
 		if self.fruit_spawn_timer >= self.fruit_spawn_interval and not self.current_fruit:
 			self.spawn_fruit()
@@ -1104,10 +1859,12 @@ class Game:
 	def next_level(self):
 		# Keep score, increment level, reset maze
 		self.level += 1
-		self.pacman = PacMan(self.level)  # Create new Pac-Man with level speed
-		self.maze = [row[:] for row in MAZE]
-		self.dots_remaining = self.count_dots()
-		self.super_dots_remaining = self.count_super_dots()
+		self.pacman = PacMan(self.level, self.maze_spec.pacman_start)  # Create new Pac-Man with level speed
+		self.maze = self.start_maze.copy()
+		self.path_cache.invalidate()
+		self.maze_surface = None
+		self.pacman_field = None
+		self.maze_index = self.index_maze()
 		self.won = False
 		self.show_win_dialog = False
 		self.win_dialog = None
@@ -1117,57 +1874,45 @@ class Game:
 		self.life_lost_timer = 0
 
 		# Update fruit spawn interval for higher levels
-		self.fruit_spawn_interval = max(150, 300 - (self.level * 20))
+		self.fruit_spawn_interval = fruit_spawn_interval(self.level)
 
 		# Reset ghosts with proper IDs
-		self.ghosts = [
-			Ghost(9, 9, RED, "aggressive", 0),
-			Ghost(10, 9, PINK, "ambush", 1),
-			Ghost(9, 10, CYAN, "patrol", 2),
-			Ghost(10, 10, ORANGE, "unpredictable", 3)
-		]
+		self.ghosts = self.create_ghosts()
 
 	def draw_lives(self, ui_y):
 		"""Draw life indicators in the UI"""
-		life_text = self.font_large.render("LIVES:", True, WHITE)
+		life_text = render_text(self.font_large, "LIVES:", WHITE)
 		self.screen.blit(life_text, (520, ui_y + 15))
 
 		# Draw Pac-Man symbols for each life
 		for i in range(self.lives):
 			life_x = 620 + i * 30
 			life_y = ui_y + 25
-			# Draw mini Pac-Man (larger for bigger display)
-			pygame.draw.circle(self.screen, YELLOW, (life_x, life_y), 10)
-			# Draw small mouth
-			mouth_points = [
-				(life_x, life_y),
-				(life_x + 8, life_y - 4),
-				(life_x + 8, life_y + 4)
-			]
-			pygame.draw.polygon(self.screen, BLACK, mouth_points)
+			icon = SPRITES.life_icon()
+			self.screen.blit(icon, icon.get_rect(center=(life_x, life_y)))
 
 	def draw_ui(self):
 		# UI area background
-		ui_y = len(self.maze) * CELL_SIZE
+		ui_y = self.maze.height * CELL_SIZE
 		pygame.draw.rect(self.screen, GRAY, (0, ui_y, WINDOW_WIDTH, WINDOW_HEIGHT - ui_y))
 
 		# Score
-		score_text = self.font_large.render(f"SCORE: {self.score}", True, WHITE)
+		score_text = render_text(self.font_large, f"SCORE: {self.score}", WHITE)
 		self.screen.blit(score_text, (20, ui_y + 15))
 
 		# Level
-		level_text = self.font_large.render(f"LEVEL: {self.level}", True, YELLOW)
+		level_text = render_text(self.font_large, f"LEVEL: {self.level}", YELLOW)
 		self.screen.blit(level_text, (200, ui_y + 15))
 
 		# Speed indicator
-		speed_text = self.font.render(f"Speed: {2.0 - self.pacman.move_delay:.1f}x", True, CYAN)
+		speed_text = render_text(self.font, f"Speed: {2.0 - self.pacman.move_delay:.1f}x", CYAN)
 		self.screen.blit(speed_text, (320, ui_y + 20))
 
 		# Lives
 		self.draw_lives(ui_y)
 
 		# Dots remaining
-		dots_text = self.font.render(f"Dots: {self.dots_remaining} | Super Dots: {self.super_dots_remaining}", True, WHITE)
+		dots_text = render_text(self.font, f"Dots: {self.dots_remaining} | Super Dots: {self.super_dots_remaining}", WHITE)
 		self.screen.blit(dots_text, (20, ui_y + 50))
 
 		# Next extra life info
@@ -1178,27 +1923,29 @@ class Game:
 				break
 
 		if next_threshold and self.lives < MAX_LIVES:
-			extra_life_text = self.font.render(f"Extra life at: {next_threshold}", True, GREEN)
+			extra_life_text = render_text(self.font, f"Extra life at: {next_threshold}", GREEN)
 			self.screen.blit(extra_life_text, (350, ui_y + 50))
 
 		if self.game_over and self.lives <= 0:
 			# Game over message
-			game_over_text = self.font.render("ALL LIVES LOST! Press R to restart or ESC to quit", True, RED)
+			game_over_text = render_text(self.font, "ALL LIVES LOST! Press R to restart or ESC to quit", RED)
 			self.screen.blit(game_over_text, (20, ui_y + 80))
 		elif not self.show_win_dialog and not self.life_lost_timer:
 			# Instructions
-			instruction_text = self.font.render("WASD/Arrows: Move | Ghosts spread out and hunt strategically!", True, WHITE)
+			instruction_text = render_text(self.font, "WASD/Arrows: Move | Ghosts spread out and hunt strategically!", WHITE)
 			self.screen.blit(instruction_text, (20, ui_y + 80))
 
 	def restart_game(self):
-		self.pacman = PacMan(1)  # Reset to level 1 speed
-		self.maze = [row[:] for row in MAZE]
+		self.pacman = PacMan(1, self.maze_spec.pacman_start)  # Reset to level 1 speed
+		self.maze = self.start_maze.copy()
+		self.path_cache.invalidate()
+		self.maze_surface = None
+		self.pacman_field = None
 		self.score = 0
 		self.level = 1
 		self.lives = MAX_LIVES
 		self.last_extra_life_score = 0
-		self.dots_remaining = self.count_dots()
-		self.super_dots_remaining = self.count_super_dots()
+		self.maze_index = self.index_maze()
 		self.game_over = False
 		self.won = False
 		self.show_win_dialog = False
@@ -1211,113 +1958,192 @@ class Game:
 		self.life_lost_timer = 0
 
 		# Reset ghosts with proper IDs
-		self.ghosts = [
-			Ghost(9, 9, RED, "aggressive", 0),
-			Ghost(10, 9, PINK, "ambush", 1),
-			Ghost(9, 10, CYAN, "patrol", 2),
-			Ghost(10, 10, ORANGE, "unpredictable", 3)
-		]
-
-	def handle_input(self):
-		if self.game_over or self.show_win_dialog or self.life_lost_timer > 0:
-			return
-
-		# Handle continuous key presses for smooth movement
-		keys = pygame.key.get_pressed()
-
-		moved = False
+		self.ghosts = self.create_ghosts()
+
+	def snapshot(self):
+		"""Capture the simulation state for rewinding"""
+		state = snapshot_state(self, self.STATE_FIELDS)
+		state["clock"] = self.game_clock.frame
+		state["maze"] = bytes(self.maze.cells)
+		state["maze_index"] = self.maze_index.snapshot()
+		state["pacman"] = freeze_object(self.pacman)
+		state["ghosts"] = tuple(freeze_object(ghost) for ghost in self.ghosts)
+		state["fruit"] = self.current_fruit and freeze_object(self.current_fruit)
+		state["notification"] = self.life_notification and freeze_object(self.life_notification)
+		return state
+
+	def restore(self, state):
+		"""Return to a snapshot; the renderer redraws whatever differs from the last frame"""
+		state = dict(state)
+		self.game_clock.frame = state.pop("clock")
+		self.maze.cells[:] = state.pop("maze")
+		self.maze_index = MazeIndex.from_snapshot(state.pop("maze_index"))
+		self.pacman = thaw_object(state.pop("pacman"))
+		self.ghosts = [thaw_object(ghost) for ghost in state.pop("ghosts")]
+		fruit = state.pop("fruit")
+		self.current_fruit = fruit and thaw_object(fruit)
+		notification = state.pop("notification")
+		self.life_notification = notification and thaw_object(notification)
+		restore_state(self, state)
+		self.win_dialog = WinDialog(self.screen, self.score, self.level) if self.show_win_dialog else None
+		self.pacman_field = None
+
+	def read_input(self, input):
+		"""Map the keys currently held to a direction, or None"""
 		# Arrow keys
-		if keys[pygame.K_LEFT]:
-			moved = self.pacman.move(-1, 0, self.maze)
-		elif keys[pygame.K_RIGHT]:
-			moved = self.pacman.move(1, 0, self.maze)
-		elif keys[pygame.K_UP]:
-			moved = self.pacman.move(0, -1, self.maze)
-		elif keys[pygame.K_DOWN]:
-			moved = self.pacman.move(0, 1, self.maze)
+		if input[pygame.K_LEFT]:
+			return LEFT
+		elif input[pygame.K_RIGHT]:
+			return RIGHT
+		elif input[pygame.K_UP]:
+			return UP
+		elif input[pygame.K_DOWN]:
+			return DOWN
 
 		# WASD keys
-		elif keys[pygame.K_a]:
-			moved = self.pacman.move(-1, 0, self.maze)
-		elif keys[pygame.K_d]:
-			moved = self.pacman.move(1, 0, self.maze)
-		elif keys[pygame.K_w]:
-			moved = self.pacman.move(0, -1, self.maze)
-		elif keys[pygame.K_s]:
-			moved = self.pacman.move(0, 1, self.maze)
-
-		if moved:
-			self.collect_items()
-
-	def run(self):
-		running = True
-
-		while running:
-			# Handle events
-			for event in pygame.event.get():
-				if event.type == pygame.QUIT:
-					if self.own_screen:
-						pygame.quit()
-						sys.exit()
-					else:
-						return "quit"
-				elif event.type == pygame.KEYDOWN:
-					if event.key == pygame.K_ESCAPE:
-						if self.own_screen:
-							running = False
-						else:
-							return "menu"
-					elif event.key == pygame.K_r and self.game_over:
-						self.restart_game()
-				elif event.type == pygame.MOUSEBUTTONDOWN:
-					if self.show_win_dialog and self.win_dialog:
-						result = self.win_dialog.handle_click(event.pos)
-						if result == "continue":
-							self.next_level()
-						elif result == "quit":
-							if self.own_screen:
-								running = False
-							else:
-								return "menu"
-
-			# Update life lost timer
-			if self.life_lost_timer > 0:
-				self.life_lost_timer -= 1
-
-			if not self.game_over and not self.show_win_dialog and self.life_lost_timer == 0:
-				# Handle input
-				self.handle_input()
-
-				# Update Pac-Man animation
-				self.pacman.update()
-
-				# Update fruit spawning
-				self.update_fruit_spawning()
-
-				# Move ghosts with ultra-smart AI and level-based speed - PASS ALL GHOSTS
-				speed_multiplier, _ = self.get_level_difficulty()
-				for ghost in self.ghosts:
-					ghost.move(self.maze, self.pacman.x, self.pacman.y, self.pacman.direction, speed_multiplier, self.ghosts)
-
-				# Check for collisions
-				self.check_ghost_collision()
-
-			# Update life notification
-			if self.life_notification:
-				if not self.life_notification.update():
-					self.life_notification = None
+		elif input[pygame.K_a]:
+			return LEFT
+		elif input[pygame.K_d]:
+			return RIGHT
+		elif input[pygame.K_w]:
+			return UP
+		elif input[pygame.K_s]:
+			return DOWN
+		return None
 
-			# Clear screen
-			self.screen.fill(BLACK)
+	def is_playing(self):
+		return not self.game_over and not self.show_win_dialog and self.life_lost_timer == 0
+
+	def step(self, action=None):
+		"""Advance the simulation by one logic tick without touching the display.
+
+		action is the direction Pac-Man tries to move this tick (UP, DOWN, LEFT,
+		RIGHT) or None to stand still.
+		"""
+		self.game_clock.tick()
+		for entity in [self.pacman] + self.ghosts:
+			entity.prev_x, entity.prev_y = entity.x, entity.y
+
+		# Update life lost timer
+		if self.life_lost_timer > 0:
+			self.life_lost_timer -= 1
+
+		if self.is_playing():
+			# Handle input
+			if action is not None and self.pacman.move(action[0], action[1], self.maze):
+				self.collect_items()
+
+			# Update Pac-Man animation
+			self.pacman.update()
+
+			# Update fruit spawning
+			self.update_fruit_spawning()
+			self.frame_timer.mark("update")
+
+			# Move ghosts with ultra-smart AI and level-based speed - PASS ALL GHOSTS
+			speed_multiplier, _ = self.get_level_difficulty()
+			pacman_field = self.update_pacman_field()
+			self.ghost_scheduler.move_ghosts(self.ghosts, self.maze, self.pacman, speed_multiplier, pacman_field)
+			self.frame_timer.mark("ghosts")
+
+			# Check for collisions
+			self.check_ghost_collision()
+			self.frame_timer.mark("collisions")
+
+		# Update life notification
+		if self.life_notification:
+			if not self.life_notification.update():
+				self.life_notification = None
+		self.frame_timer.mark("update")
+
+	def update(self, dt, input):
+		"""One logic tick of live play, steered by the keys held"""
+		action = self.read_input(input)
+		self.frame_timer.mark("input")
+		self.step(action)
+
+	def handle_event(self, event):
+		if event.type == pygame.KEYDOWN:
+			if event.key == pygame.K_r and self.game_over:
+				self.restart_game()
+		elif event.type == pygame.MOUSEBUTTONDOWN:
+			if self.show_win_dialog and self.win_dialog:
+				result = self.win_dialog.handle_click(event.pos)
+				if result == "continue":
+					self.next_level()
+				elif result == "quit":
+					return "menu"
+		return None
 
-			# Draw everything
-			self.draw_maze()
+	def invalidate(self):
+		self.overlay_drawn = True
+
+	def get_sprite_positions(self, alpha=1.0):
+		"""Interpolated top-left pixel of Pac-Man and each ghost"""
+		return [sprite_position(entity, alpha) for entity in [self.pacman] + self.ghosts]
+
+	def get_sprite_rects(self, positions):
+		"""Screen rects of everything that moves or animates"""
+		rects = []
+		if self.current_fruit:
+			rects.append(pygame.Rect(self.current_fruit.x * CELL_SIZE, self.current_fruit.y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+		if not self.game_over or self.lives > 0:
+			for position in positions:
+				rects.append(pygame.Rect(position, (CELL_SIZE, CELL_SIZE)))
+		return rects
+
+	def get_hud_state(self):
+		"""Everything draw_ui shows; the HUD is only redrawn when this changes"""
+		return (self.score, self.level, self.pacman.move_delay, self.lives, self.dots_remaining,
+				self.super_dots_remaining, self.game_over, self.show_win_dialog, self.life_lost_timer > 0)
+
+	def get_hud_rect(self):
+		ui_y = self.maze.height * CELL_SIZE
+		return pygame.Rect(0, ui_y, WINDOW_WIDTH, WINDOW_HEIGHT - ui_y)
+
+	def draw_sprites(self, positions):
+		if self.current_fruit:
+			self.current_fruit.draw(self.screen)
 
-			if not self.game_over or self.lives > 0:
-				self.pacman.draw(self.screen)
-				for ghost in self.ghosts:
-					ghost.draw(self.screen)
+		if not self.game_over or self.lives > 0:
+			self.pacman.draw(self.screen, positions[0])
+			for ghost, position in zip(self.ghosts, positions[1:]):
+				ghost.draw(self.screen, position)
+
+	def render(self, alpha=None):
+		"""Draw the current state to the screen.
+
+		alpha (0 to 1) places the sprites that far from their previous cell to
+		their current one, for drawing between logic ticks; by default it is
+		where the fixed timestep left off. Returns the screen rects that
+		changed, for pygame.display.update, or None when the whole screen was
+		redrawn. Does nothing without a screen.
+		"""
+		if self.screen is None:
+			return []
+		if alpha is None:
+			alpha = self.timestep.alpha
+		if self.font is None:
+			self.load_fonts()
+
+		full_redraw = self.maze_surface is None
+		if full_redraw:
+			self.build_maze_surface()
+			erased = []
+		else:
+			erased = self.sync_maze_surface()
+
+		# Overlays cover the whole maze, so redraw fully while one is up and once after
+		overlay = self.life_notification is not None or self.show_win_dialog
+		full_redraw = full_redraw or overlay or self.overlay_drawn
+		self.overlay_drawn = overlay
 
+		positions = self.get_sprite_positions(alpha)
+		sprite_rects = self.get_sprite_rects(positions)
+		if full_redraw:
+			self.screen.fill(BLACK)
+			self.screen.blit(self.maze_surface, (0, 0))
+			self.draw_sprites(positions)
 			self.draw_ui()
 
 			# Draw life notification
@@ -1328,16 +2154,29 @@ class Game:
 			if self.show_win_dialog and self.win_dialog:
 				self.win_dialog.draw()
 
-			# Update display
-			pygame.display.flip()
-			self.clock.tick(15)  # 15 FPS for good responsiveness
+			self.last_sprite_rects = sprite_rects
+			self.hud_state = self.get_hud_state()
+			return None
 
-		if self.own_screen:
-			pygame.quit()
-			sys.exit()
-		else:
-			return "menu"
+		# Restore the maze under last frame's sprites, then draw them at their new cells
+		dirty = erased + self.last_sprite_rects + sprite_rects
+		for rect in dirty:
+			self.screen.blit(self.maze_surface, rect, rect)
+		self.draw_sprites(positions)
+		self.last_sprite_rects = sprite_rects
+
+		hud_state = self.get_hud_state()
+		if hud_state != self.hud_state:
+			self.draw_ui()
+			self.hud_state = hud_state
+			dirty.append(self.get_hud_rect())
+		return dirty
 
 if __name__ == "__main__":
-	game = Game()
-	game.run()
\ No newline at end of file
+	parser = argparse.ArgumentParser(description="Pac-Man")
+	parser.add_argument("--maze", help="maze file to play instead of the classic maze")
+	args = parser.parse_args()
+	game = Game(maze_spec=MazeSpec.load(args.maze) if args.maze else None)
+	game.run()
+	pygame.quit()
+	sys.exit()
\ No newline at end of file
@@ -0,0 +1,331 @@
+import sys
+import time
+import numpy as np
+from pacman import (GHOST_BASE_SPEED, MAX_PATH_LENGTH, MAX_LIVES, EXTRA_LIFE_SCORES, FRUITS, FRUIT_LIFETIME,
+					LIFE_LOST_PAUSE, MazeSpec, PathTable, fruit_spawn_interval, level_difficulty, pacman_move_delay)
+
+# Batched Pac-Man: N games held as NumPy arrays and stepped together.
+#
+# Follows the rules of pacman.Game (dot and power pellet scoring, fruit, ghost
+# eating with doubling points, lives, extra lives and level difficulty, using
+# pacman.py's own per-level rules and constants) on any MazeSpec, with
+# a simplified ghost AI that vectorizes: ghosts chase Pac-Man along the shared
+# PathTable, flee him when frightened and head home when eaten. Scatter mode
+# and the per-personality spread targets are not modelled. Levels advance as
+# soon as the maze is cleared, with no win dialog.
+
+NO_ACTION = -1  # Action value for "don't move" (otherwise an index into DIRECTIONS)
+
+FRUIT_POINTS = np.array([fruit[1] for fruit in FRUITS], dtype=np.int64)
+
+def per_level(rule, levels):
+	"""Apply one of pacman.py's per-level rules to an array of levels.
+
+	The rule runs once per distinct level. A rule returning a tuple gives a
+	tuple of arrays.
+	"""
+	lookup = np.zeros(levels.max(initial=0) + 1, dtype=np.intp)  # Level -> row of values
+	distinct = np.flatnonzero(np.bincount(levels, minlength=len(lookup)))
+	lookup[distinct] = np.arange(len(distinct))
+	index = lookup[levels]
+	values = [rule(int(level)) for level in distinct] or [rule(1)]  # Shape for empty results
+	if isinstance(values[0], tuple):
+		return tuple(np.array(column)[index] for column in zip(*values))
+	return np.array(values)[index]
+
+class BatchPacMan:
+	"""N independent Pac-Man games stepped at once with vectorized rules"""
+
+	def __init__(self, num_games, seed=None, maze_spec=None):
+		self.num_games = num_games
+		self.rng = np.random.default_rng(seed)
+		self.games = np.arange(num_games)
+
+		# Navigation data comes straight from the maze's move table and the shared path table
+		maze_spec = maze_spec or MazeSpec.builtin()
+		maze = maze_spec.maze
+		table = maze_spec.path_table
+		self.width = table.width
+		self.height = table.height
+		self.size = table.size
+		self.steps = np.frombuffer(table.steps, dtype=np.uint8).reshape(self.size, self.size)
+		self.distances = np.frombuffer(table.distances, dtype=np.uint16).reshape(self.size, self.size)
+		self.neighbours = np.array(maze.targets, dtype=np.int32).reshape(self.size, 4)
+
+		self.initial_maze = np.frombuffer(maze.cells, dtype=np.uint8).copy()
+		self.initial_dots = int(np.count_nonzero(self.initial_maze == 2))
+		self.initial_super_dots = int(np.count_nonzero(self.initial_maze == 4))
+
+		start_x, start_y = maze_spec.pacman_start
+		self.pacman_start = start_y * self.width + start_x
+		self.ghost_starts = np.array([y * self.width + x for x, y in maze_spec.ghost_starts], dtype=np.int32)
+		self.num_ghosts = len(self.ghost_starts)
+
+		# Per-cell lookups: coordinates, corner bonus and "close to home" per ghost
+		cells = np.arange(self.size)
+		cell_x = cells % self.width
+		cell_y = cells // self.width
+		self.cell_x = cell_x
+		self.cell_y = cell_y
+		self.corner_bonus = np.where((cell_x <= 2) | (cell_x >= self.width - 3) |
+									 (cell_y <= 2) | (cell_y >= self.height - 3), 5, 0)
+		start_x = self.ghost_starts % self.width
+		start_y = self.ghost_starts // self.width
+		self.near_home = ((np.abs(cell_x[None, :] - start_x[:, None]) <= 1) &
+						  (np.abs(cell_y[None, :] - start_y[:, None]) <= 1))
+
+		# Fruit can appear on any empty cell Pac-Man can reach, outside the ghost base
+		reachable = self.distances[self.pacman_start] != PathTable.UNREACHABLE
+		outside_base = np.array([(x, y) not in maze_spec.ghost_base for x, y in zip(cell_x, cell_y)])
+		self.fruit_cells = np.flatnonzero(reachable & outside_base)
+
+		n, g = num_games, self.num_ghosts
+		self.maze = np.empty((n, self.size), dtype=np.uint8)
+		self.level = np.ones(n, dtype=np.int32)
+		self.score = np.zeros(n, dtype=np.int64)
+		self.lives = np.full(n, MAX_LIVES, dtype=np.int32)
+		self.last_extra_life_score = np.zeros(n, dtype=np.int32)
+		self.dots_remaining = np.zeros(n, dtype=np.int32)
+		self.super_dots_remaining = np.zeros(n, dtype=np.int32)
+		self.game_over = np.zeros(n, dtype=bool)
+		self.life_lost_timer = np.zeros(n, dtype=np.int32)
+		self.ghost_eat_multiplier = np.ones(n, dtype=np.int64)
+		self.ticks = np.zeros(n, dtype=np.int64)
+
+		self.pacman = np.zeros(n, dtype=np.int32)
+		self.pacman_direction = np.zeros(n, dtype=np.int8)
+		self.pacman_timer = np.zeros(n, dtype=np.int32)
+
+		self.ghosts = np.zeros((n, g), dtype=np.int32)
+		self.ghost_timer = np.zeros((n, g), dtype=np.int32)
+		# Staggered first moves, as pacman.GhostScheduler does
+		self.ghost_stagger = np.arange(g, dtype=np.int32) * GHOST_BASE_SPEED // g
+		self.vulnerable_timer = np.zeros((n, g), dtype=np.int32)
+		self.eaten = np.zeros((n, g), dtype=bool)
+
+		self.fruit = np.full(n, -1, dtype=np.int32)
+		self.fruit_points = np.zeros(n, dtype=np.int64)
+		self.fruit_age = np.zeros(n, dtype=np.int32)
+		self.fruit_spawn_timer = np.zeros(n, dtype=np.int32)
+		self.fruit_spawn_interval = np.zeros(n, dtype=np.int32)
+
+		self.reset()
+
+	def reset(self, mask=None):
+		"""Restart the selected games (all by default) from level 1"""
+		if mask is None:
+			mask = np.ones(self.num_games, dtype=bool)
+		self.level[mask] = 1
+		self.score[mask] = 0
+		self.lives[mask] = MAX_LIVES
+		self.last_extra_life_score[mask] = 0
+		self.game_over[mask] = False
+		self.ticks[mask] = 0
+		self.start_level(mask)
+
+	def start_level(self, mask):
+		"""Fresh maze, positions, fruit and ghosts for the selected games"""
+		self.maze[mask] = self.initial_maze
+		self.dots_remaining[mask] = self.initial_dots
+		self.super_dots_remaining[mask] = self.initial_super_dots
+		self.life_lost_timer[mask] = 0
+		self.ghost_eat_multiplier[mask] = 1
+		self.pacman_timer[mask] = 0
+		self.ghost_timer[mask] = self.ghost_stagger
+		self.fruit[mask] = -1
+		self.fruit_spawn_timer[mask] = 0
+		self.fruit_spawn_interval[mask] = per_level(fruit_spawn_interval, self.level[mask])
+		self.reset_positions(mask)
+
+	def reset_positions(self, mask):
+		"""Put Pac-Man and the ghosts back on their starting cells"""
+		self.pacman[mask] = self.pacman_start
+		self.pacman_direction[mask] = 3  # RIGHT
+		self.ghosts[mask] = self.ghost_starts
+		self.vulnerable_timer[mask] = 0
+		self.eaten[mask] = False
+
+	def level_difficulty(self):
+		"""pacman.level_difficulty per game: (speed multiplier, power duration) arrays"""
+		return per_level(level_difficulty, self.level)
+
+	def step(self, actions):
+		"""Advance every game by one logic tick.
+
+		actions holds one entry per game: an index into pacman.DIRECTIONS, or
+		NO_ACTION to stand still. Finished games are left untouched.
+		"""
+		actions = np.asarray(actions)
+
+		self.life_lost_timer -= self.life_lost_timer > 0
+		active = ~self.game_over & (self.life_lost_timer == 0)
+		self.ticks += active
+		speed_multiplier, power_duration = self.level_difficulty()
+
+		moved = self.move_pacman(actions, active)
+		cleared = self.collect_items(moved, power_duration)
+		self.update_fruit(active)
+		self.move_ghosts(active, speed_multiplier)
+		self.check_ghost_collision(active)
+
+		if cleared.any():
+			self.level[cleared] += 1
+			self.start_level(cleared)
+
+	def move_pacman(self, actions, active):
+		wants = active & (actions >= 0)
+		self.pacman_timer += wants
+		move_delay = per_level(pacman_move_delay, self.level)
+		ready = wants & (self.pacman_timer >= move_delay)
+		self.pacman_timer[ready] = 0
+
+		target = self.neighbours[self.pacman, np.where(ready, actions, 0)]
+		moved = ready & (target >= 0)
+		self.pacman = np.where(moved, target, self.pacman)
+		self.pacman_direction = np.where(moved, actions, self.pacman_direction).astype(np.int8)
+		return moved
+
+	def collect_items(self, moved, power_duration):
+		"""Eat dots, power pellets and fruit under Pac-Man; returns games that cleared the maze"""
+		cell = self.maze[self.games, self.pacman]
+		dot = moved & (cell == 2)
+		power = moved & (cell == 4)
+		eaten = dot | power
+		self.maze[self.games[eaten], self.pacman[eaten]] = 0
+		self.score += 10 * dot + 50 * power
+		self.dots_remaining -= dot
+		self.super_dots_remaining -= power
+
+		# Power pellets frighten every ghost
+		self.vulnerable_timer[power] = power_duration[power, None]
+		self.ghost_eat_multiplier[power] = 1
+
+		fruit = moved & (self.fruit == self.pacman)
+		self.score += np.where(fruit, self.fruit_points, 0)
+		self.fruit[fruit] = -1
+
+		# At most one extra life per tick, as in Game.check_extra_life
+		granted = np.zeros(self.num_games, dtype=bool)
+		for threshold in EXTRA_LIFE_SCORES:
+			extra = (moved & ~granted & (self.score >= threshold) &
+					 (self.last_extra_life_score < threshold) & (self.lives < MAX_LIVES))
+			self.lives += extra
+			self.last_extra_life_score[extra] = threshold
+			granted |= extra
+
+		return moved & (self.dots_remaining == 0) & (self.super_dots_remaining == 0)
+
+	def update_fruit(self, active):
+		# Fruit ages through life-lost pauses too, as Game times it by game_clock
+		has_fruit = self.fruit >= 0
+		self.fruit_age += ~self.game_over & has_fruit
+		expired = active & has_fruit & (self.fruit_age > FRUIT_LIFETIME)
+		self.fruit[expired] = -1
+
+		self.fruit_spawn_timer += active
+		spawning = np.flatnonzero(active & (self.fruit_spawn_timer >= self.fruit_spawn_interval) & (self.fruit < 0))
+		if spawning.size == 0:
+			return
+
+		# Uniform pick among the currently empty candidate cells of each game
+		empty = self.maze[spawning[:, None], self.fruit_cells[None, :]] == 0
+		keys = self.rng.random(empty.shape) * empty
+		choice = keys.argmax(axis=1)
+		found = keys[np.arange(spawning.size), choice] > 0
+		spawning = spawning[found]
+		self.fruit[spawning] = self.fruit_cells[choice[found]]
+		self.fruit_points[spawning] = FRUIT_POINTS[self.rng.integers(len(FRUIT_POINTS), size=spawning.size)]
+		self.fruit_age[spawning] = 0
+		self.fruit_spawn_timer[spawning] = 0
+
+	def move_ghosts(self, active, speed_multiplier):
+		ghost_active = active[:, None]
+		self.vulnerable_timer -= ghost_active & (self.vulnerable_timer > 0)
+		vulnerable = self.vulnerable_timer > 0
+
+		self.ghost_timer += ghost_active
+		adjusted_speed = np.maximum(1, (GHOST_BASE_SPEED / speed_multiplier).astype(np.int32))
+		move_speed = adjusted_speed[:, None] + 2 * vulnerable
+		ready = ghost_active & (self.ghost_timer >= move_speed)
+		self.ghost_timer[ready] = 0
+
+		# Eaten ghosts that made it home come back to life without moving
+		ghost_index = np.arange(self.num_ghosts)[None, :]
+		home = ready & self.eaten & self.near_home[ghost_index, self.ghosts]
+		self.eaten[home] = False
+		self.vulnerable_timer[home] = 0
+		vulnerable &= ~home
+		ready &= ~home
+
+		pacman = self.pacman[:, None]
+		neighbours = self.neighbours[self.ghosts]  # (games, ghosts, 4)
+		valid = neighbours >= 0
+		safe_neighbours = np.where(valid, neighbours, 0)
+
+		# Chase: first step of the shortest path, random move when out of range
+		chase = self.steps[self.ghosts, pacman].astype(np.int32)
+		in_range = self.distances[self.ghosts, pacman] <= MAX_PATH_LENGTH
+		random_move = (self.rng.random(valid.shape) * valid).argmax(axis=2)
+		chase = np.where((chase != PathTable.NO_STEP) & in_range, chase, random_move)
+
+		# Eaten: head back to the starting cell
+		home_step = self.steps[self.ghosts, self.ghost_starts[None, :]].astype(np.int32)
+		home_step = np.where(home_step != PathTable.NO_STEP, home_step, random_move)
+
+		# Frightened: maximise distance from Pac-Man, corner bonus and spacing from other ghosts
+		flee_score = self.distances[safe_neighbours, pacman[:, :, None]].astype(np.int32)
+		flee_score += self.corner_bonus[safe_neighbours]
+		other_x = self.cell_x[self.ghosts]
+		other_y = self.cell_y[self.ghosts]
+		spacing = (np.abs(self.cell_x[safe_neighbours][..., None] - other_x[:, None, None, :]) +
+				   np.abs(self.cell_y[safe_neighbours][..., None] - other_y[:, None, None, :])) > 3
+		spacing &= ~np.eye(self.num_ghosts, dtype=bool)[None, :, None, :]
+		flee_score += 2 * spacing.sum(axis=3)
+		flee = np.where(valid, flee_score, -1).argmax(axis=2)
+
+		direction = np.where(self.eaten, home_step, np.where(vulnerable, flee, chase))
+		target = np.take_along_axis(neighbours, direction[..., None], axis=2)[..., 0]
+		move = ready & (target >= 0)
+		self.ghosts = np.where(move, target, self.ghosts)
+
+	def check_ghost_collision(self, active):
+		"""First ghost on Pac-Man's cell decides: eaten if frightened, otherwise a life is lost"""
+		same = (self.ghosts == self.pacman[:, None]) & active[:, None]
+		vulnerable = self.vulnerable_timer > 0
+		eat = same & vulnerable & ~self.eaten
+		kill = same & ~vulnerable
+		acting = eat | kill
+		hit = acting.any(axis=1)
+		if not hit.any():
+			return
+		first = acting.argmax(axis=1)
+
+		ate = hit & eat[self.games, first]
+		self.eaten[self.games[ate], first[ate]] = True
+		self.score += np.where(ate, 200 * self.ghost_eat_multiplier, 0)
+		self.ghost_eat_multiplier[ate] *= 2
+
+		killed = hit & kill[self.games, first]
+		self.lives -= killed
+		self.life_lost_timer[killed] = LIFE_LOST_PAUSE
+		self.game_over |= killed & (self.lives <= 0)
+		self.reset_positions(killed & ~self.game_over)
+
+def benchmark(num_games=4096, num_steps=500, seed=0):
+	"""Step random-playing games and return game-steps per second"""
+	batch = BatchPacMan(num_games, seed)
+	rng = np.random.default_rng(seed)
+	actions = rng.integers(0, 4, size=(num_steps, num_games))
+	start = time.perf_counter()
+	for tick in range(num_steps):
+		batch.step(actions[tick])
+		if batch.game_over.any():
+			batch.reset(batch.game_over)
+	elapsed = time.perf_counter() - start
+	return num_games * num_steps / elapsed
+
+if __name__ == "__main__":
+	num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 4096
+	num_steps = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+	rate = benchmark(num_games, num_steps)
+	print(f"{num_games} games x {num_steps} steps: {rate:,.0f} game-steps/s")
@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+import argparse
+
+# Replay a recorded InputLog: rebuilds the game from the class name and seed in
+# the log and feeds it the recorded events, held keys and tick counts. By
+# default it plays back at real speed in a window; --max-speed removes the
+# frame cap and skips drawing, which makes recorded sessions a repeatable
+# simulation workload. Record logs with `python arcade.py --record DIR`.
+
+def replay(path, max_speed=False):
+	"""Play one log back and return a summary of the run"""
+	from arcade import RetroArcade
+	from engine import InputLog, ReplayInput
+
+	log = InputLog.load(path)
+	arcade = RetroArcade()
+	game_classes = {entry.class_name: entry for entry in arcade.games.values()}
+	if log.game not in game_classes:
+		raise ValueError(f"{path} was recorded from unknown game {log.game}")
+
+	game = game_classes[log.game](arcade.screen, seed=log.seed)
+	game.input = ReplayInput(log)
+	if max_speed:
+		game.fps = 0
+		game.draw_frames = False
+
+	start = time.perf_counter()
+	game.run()
+	elapsed = time.perf_counter() - start
+	return {
+		"game": log.game,
+		"seed": log.seed,
+		"frames": log.frames,
+		"bytes": os.path.getsize(path),
+		"seconds": elapsed,
+		"score": getattr(game, "score", None)
+	}
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Replay recorded arcade input logs")
+	parser.add_argument("logs", nargs="+", help="input logs written by arcade.py --record")
+	parser.add_argument("--max-speed", action="store_true", help="no frame cap and no drawing")
+	args = parser.parse_args(argv)
+
+	if args.max_speed:
+		# Nothing is drawn, so no window is needed either
+		os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+		os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+	for path in args.logs:
+		result = replay(path, args.max_speed)
+		print(f"{result['game']:<18} seed {result['seed']:<10} {result['frames']:>7} frames "
+			  f"({result['bytes']} bytes) in {result['seconds']:.2f}s "
+			  f"({result['frames'] / result['seconds']:.0f} FPS), score {result['score']}")
+
+if __name__ == "__main__":
+	main(sys.argv[1:])
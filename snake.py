@@ -1,6 +1,6 @@
 import pygame
-import random
 import math
+from engine import QUALITY_LOW, GameClock, GameLoop, load_font, render_text, restore_state, snapshot_state
 
 # Colors
 BLACK = (0, 0, 0)
@@ -13,12 +13,14 @@ GRAY = (128, 128, 128)
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 850
 
-class SnakeGame:
-	def __init__(self, screen):
-		self.screen = screen
-		self.font = pygame.font.Font(None, 36)
-		self.font_large = pygame.font.Font(None, 48)
-		self.running = True
+class SnakeGame(GameLoop):
+	STATE_FIELDS = ("snake", "direction", "food", "score", "high_score", "game_over", "last_move_time", "food_animation")
+
+	def __init__(self, screen, seed=None):
+		GameLoop.__init__(self, screen, seed)
+		self.game_clock = GameClock(60)  # Move timing counts frames, not wall time
+		self.font = load_font(36)
+		self.font_large = load_font(48)
 		self.snake = [(10, 10), (9, 10), (8, 10)]
 		self.food = (15, 15)
 		self.direction = (1, 0)
@@ -28,84 +30,99 @@ class SnakeGame:
 		self.food_animation = 0  # For animated food
 		self.game_over = False
 		self.high_score = 0
+		self.background = None  # Pre-rendered gradient and grid
 
-	def run(self):
-		clock = pygame.time.Clock()
-
-		while self.running:
-			current_time = pygame.time.get_ticks()
-
-			for event in pygame.event.get():
-				if event.type == pygame.QUIT:
-					return "quit"
-				elif event.type == pygame.KEYDOWN:
-					if event.key == pygame.K_ESCAPE:
-						return "menu"
-					elif event.key == pygame.K_r and self.game_over:
-						# Restart game
-						self.restart_game()
-					elif not self.game_over:
-						if event.key == pygame.K_UP and self.direction != (0, 1):
-							self.direction = (0, -1)
-						elif event.key == pygame.K_DOWN and self.direction != (0, -1):
-							self.direction = (0, 1)
-						elif event.key == pygame.K_LEFT and self.direction != (1, 0):
-							self.direction = (-1, 0)
-						elif event.key == pygame.K_RIGHT and self.direction != (-1, 0):
-							self.direction = (1, 0)
-
-			# Move snake every 120ms (slightly faster)
-			if current_time - self.last_move_time > 120 and not self.game_over:
-				self.last_move_time = current_time
-				head = self.snake[0]
-				new_head = (head[0] + self.direction[0], head[1] + self.direction[1])
-
-				# Check boundaries
-				if (new_head[0] < 0 or new_head[0] >= WINDOW_WIDTH // self.cell_size or
-					new_head[1] < 0 or new_head[1] >= (WINDOW_HEIGHT - 120) // self.cell_size):
-					self.game_over = True
-
-				# Check self collision
-				if new_head in self.snake:
-					self.game_over = True
-
-				if self.game_over:
-					# Update high score
-					if self.score > self.high_score:
-						self.high_score = self.score
-					continue
-
-				self.snake.insert(0, new_head)
-
-				# Check food collision
-				if new_head == self.food:
-					self.score += 10
-					# Generate new food
-					while True:
-						new_food = (random.randint(0, WINDOW_WIDTH // self.cell_size - 1),
-								   random.randint(0, (WINDOW_HEIGHT - 120) // self.cell_size - 1))
-						if new_food not in self.snake:
-							self.food = new_food
-							break
-				else:
-					self.snake.pop()
-
-			# Update animation
-			self.food_animation += 1
-
-			# Draw everything
-			self.draw_background()
-			self.draw_snake()
-			self.draw_food()
-			self.draw_ui()
+	def update(self, dt, input):
+		"""Advance the game by one fixed 60 Hz tick"""
+		self.game_clock.tick()
+		current_time = self.game_clock.ms
 
-			if self.game_over:
-				self.draw_game_over()
+		# Turn with the arrow keys held this tick
+		if not self.game_over:
+			self.direction = self.read_direction(input)
+		self.frame_timer.mark("input")
+
+		# Move snake every 120ms (slightly faster)
+		if current_time - self.last_move_time > 120 and not self.game_over:
+			self.last_move_time = current_time
+			head = self.snake[0]
+			new_head = (head[0] + self.direction[0], head[1] + self.direction[1])
 
-			pygame.display.flip()
-			clock.tick(60)
+			# Check boundaries
+			if (new_head[0] < 0 or new_head[0] >= WINDOW_WIDTH // self.cell_size or
+				new_head[1] < 0 or new_head[1] >= (WINDOW_HEIGHT - 120) // self.cell_size):
+				self.game_over = True
 
-		return "menu"
+			# Check self collision
+			if new_head in self.snake:
+				self.game_over = True
+
+			if self.game_over:
+				# Update high score
+				if self.score > self.high_score:
+					self.high_score = self.score
+				return
+
+			self.frame_timer.mark("collisions")
+
+			self.snake.insert(0, new_head)
+
+			# Check food collision
+			if new_head == self.food:
+				self.score += 10
+				# Generate new food
+				while True:
+					new_food = (self.rng.randint(0, WINDOW_WIDTH // self.cell_size - 1),
+							   self.rng.randint(0, (WINDOW_HEIGHT - 120) // self.cell_size - 1))
+					if new_food not in self.snake:
+						self.food = new_food
+						break
+			else:
+				self.snake.pop()
+
+		# Update animation
+		self.food_animation += 1
+		self.frame_timer.mark("update")
+
+	def snapshot(self):
+		"""Capture the simulation state for rewinding"""
+		state = snapshot_state(self, self.STATE_FIELDS)
+		state["clock"] = self.game_clock.frame
+		return state
+
+	def restore(self, state):
+		state = dict(state)
+		self.game_clock.frame = state.pop("clock")
+		restore_state(self, state)
+
+	def handle_event(self, event):
+		if event.type != pygame.KEYDOWN:
+			return None
+		if event.key == pygame.K_r and self.game_over:
+			# Restart game
+			self.restart_game()
+		return None
+
+	def read_direction(self, input):
+		"""The direction the held arrow keys turn the snake to; it never turns straight back"""
+		if input[pygame.K_UP] and self.direction != (0, 1):
+			return (0, -1)
+		elif input[pygame.K_DOWN] and self.direction != (0, -1):
+			return (0, 1)
+		elif input[pygame.K_LEFT] and self.direction != (1, 0):
+			return (-1, 0)
+		elif input[pygame.K_RIGHT] and self.direction != (-1, 0):
+			return (1, 0)
+		return self.direction
+
+	def render(self):
+		"""Draw the whole scene"""
+		self.draw_background()
+		self.draw_snake()
+		self.draw_food()
+		self.draw_ui()
+		if self.game_over:
+			self.draw_game_over()
 
 	def restart_game(self):
 		"""Restart the game to initial state"""
@@ -118,19 +135,31 @@ class SnakeGame:
 
 	def draw_background(self):
 		"""Draw enhanced background with grid"""
+		if self.quality.level == QUALITY_LOW:
+			# Plain field, no gradient or grid
+			self.screen.fill((0, 25, 0), (0, 0, WINDOW_WIDTH, WINDOW_HEIGHT - 120))
+			return
+
+		# The background never changes, so it is drawn once and blitted
+		if self.background is None:
+			self.background = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT - 120), 0, self.screen)
+			self.paint_background(self.background)
+		self.screen.blit(self.background, (0, 0))
+
+	def paint_background(self, surface):
 		# Dark green gradient background
 		for y in range(0, WINDOW_HEIGHT - 120, 2):
 			color_intensity = int(10 + 5 * math.sin(y * 0.05))
 			color = (0, 15 + color_intensity, 0)
-			pygame.draw.line(self.screen, color, (0, y), (WINDOW_WIDTH, y))
-			pygame.draw.line(self.screen, color, (0, y + 1), (WINDOW_WIDTH, y + 1))
+			pygame.draw.line(surface, color, (0, y), (WINDOW_WIDTH, y))
+			pygame.draw.line(surface, color, (0, y + 1), (WINDOW_WIDTH, y + 1))
 
 		# Draw grid lines (subtle)
 		grid_color = (0, 40, 0)
 		for x in range(0, WINDOW_WIDTH, self.cell_size):
-			pygame.draw.line(self.screen, grid_color, (x, 0), (x, WINDOW_HEIGHT - 120))
+			pygame.draw.line(surface, grid_color, (x, 0), (x, WINDOW_HEIGHT - 120))
 		for y in range(0, WINDOW_HEIGHT - 120, self.cell_size):
-			pygame.draw.line(self.screen, grid_color, (0, y), (WINDOW_WIDTH, y))
+			pygame.draw.line(surface, grid_color, (0, y), (WINDOW_WIDTH, y))
 
 	def draw_snake(self):
 		"""Draw enhanced snake with gradient and borders"""
@@ -223,26 +252,26 @@ class SnakeGame:
 		pygame.draw.line(self.screen, (100, 100, 100), (0, WINDOW_HEIGHT - 120), (WINDOW_WIDTH, WINDOW_HEIGHT - 120), 2)
 
 		# Title
-		title_text = self.font_large.render("S N A K E", True, (50, 255, 50))
+		title_text = render_text(self.font_large, "S N A K E", (50, 255, 50))
 		title_rect = title_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 100))
 		self.screen.blit(title_text, title_rect)
 
 		# Score
-		score_text = self.font.render(f"Score: {self.score}", True, WHITE)
+		score_text = render_text(self.font, f"Score: {self.score}", WHITE)
 		self.screen.blit(score_text, (20, WINDOW_HEIGHT - 70))
 
 		# High Score
 		if self.high_score > 0:
-			high_score_text = self.font.render(f"Best: {self.high_score}", True, YELLOW)
+			high_score_text = render_text(self.font, f"Best: {self.high_score}", YELLOW)
 			self.screen.blit(high_score_text, (20, WINDOW_HEIGHT - 40))
 
 		# Length
-		length_text = self.font.render(f"Length: {len(self.snake)}", True, WHITE)
+		length_text = render_text(self.font, f"Length: {len(self.snake)}", WHITE)
 		length_rect = length_text.get_rect(right=WINDOW_WIDTH - 20, y=WINDOW_HEIGHT - 70)
 		self.screen.blit(length_text, length_rect)
 
 		# Controls
-		controls_text = self.font.render("Arrow keys to move | ESC: Menu", True, GRAY)
+		controls_text = render_text(self.font, "Arrow keys to move | ESC: Menu", GRAY)
 		controls_rect = controls_text.get_rect(right=WINDOW_WIDTH - 20, y=WINDOW_HEIGHT - 40)
 		self.screen.blit(controls_text, controls_rect)
 
@@ -255,27 +284,27 @@ class SnakeGame:
 		self.screen.blit(overlay, (0, 0))
 
 		# Game over text
-		game_over_text = self.font_large.render("GAME OVER", True, RED)
+		game_over_text = render_text(self.font_large, "GAME OVER", RED)
 		game_over_rect = game_over_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 100))
 		self.screen.blit(game_over_text, game_over_rect)
 
 		# Final score
-		score_text = self.font_large.render(f"Final Score: {self.score}", True, WHITE)
+		score_text = render_text(self.font_large, f"Final Score: {self.score}", WHITE)
 		score_rect = score_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 50))
 		self.screen.blit(score_text, score_rect)
 
 		# Length achieved
-		length_text = self.font.render(f"Snake Length: {len(self.snake)}", True, WHITE)
+		length_text = render_text(self.font, f"Snake Length: {len(self.snake)}", WHITE)
 		length_rect = length_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 10))
 		self.screen.blit(length_text, length_rect)
 
 		# New high score
 		if self.score == self.high_score and self.high_score > 0:
-			new_high_text = self.font.render("NEW HIGH SCORE!", True, YELLOW)
+			new_high_text = render_text(self.font, "NEW HIGH SCORE!", YELLOW)
 			new_high_rect = new_high_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 30))
 			self.screen.blit(new_high_text, new_high_rect)
 
 		# Restart instructions
-		restart_text = self.font.render("Press R to restart | ESC for menu", True, GREEN)
+		restart_text = render_text(self.font, "Press R to restart | ESC for menu", GREEN)
 		restart_rect = restart_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 70))
 		self.screen.blit(restart_text, restart_rect)
\ No newline at end of file
@@ -1,6 +1,6 @@
 import pygame
-import random
 import math
+from engine import QUALITY_HIGH, QUALITY_LOW, GameLoop, load_font, render_text
 
 # Colors
 BLACK = (0, 0, 0)
@@ -15,12 +15,14 @@ GRAY = (128, 128, 128)
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 850
 
-class SpaceInvadersGame:
-	def __init__(self, screen):
-		self.screen = screen
-		self.font = pygame.font.Font(None, 36)
-		self.font_large = pygame.font.Font(None, 48)
-		self.running = True
+class SpaceInvadersGame(GameLoop):
+	STATE_FIELDS = ("player_x", "bullets", "aliens", "alien_bullets", "alien_direction", "score", "lives", "game_over",
+					"wave", "animation_frame")
+
+	def __init__(self, screen, seed=None):
+		GameLoop.__init__(self, screen, seed)
+		self.font = load_font(36)
+		self.font_large = load_font(48)
 
 		# Player
 		self.player_x = WINDOW_WIDTH // 2
@@ -72,36 +74,29 @@ class SpaceInvadersGame:
 				}
 				self.aliens.append(alien)
 
-	def run(self):
-		clock = pygame.time.Clock()
-
-		while self.running:
-			for event in pygame.event.get():
-				if event.type == pygame.QUIT:
-					return "quit"
-				elif event.type == pygame.KEYDOWN:
-					if event.key == pygame.K_ESCAPE:
-						return "menu"
-					elif event.key == pygame.K_SPACE and not self.game_over:
-						self.shoot()
-					elif event.key == pygame.K_r and self.game_over:
-						self.restart_game()
-
-			if not self.game_over:
-				# Handle continuous input
-				keys = pygame.key.get_pressed()
-				if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-					self.player_x = max(20, self.player_x - self.player_speed)
-				if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-					self.player_x = min(WINDOW_WIDTH - self.player_width - 20, self.player_x + self.player_speed)
-
-				self.update_game()
-
-			self.draw_everything()
-			pygame.display.flip()
-			clock.tick(60)
-
-		return "menu"
+	def handle_event(self, event):
+		if event.type != pygame.KEYDOWN:
+			return None
+		if event.key == pygame.K_SPACE and not self.game_over:
+			self.shoot()
+		elif event.key == pygame.K_r and self.game_over:
+			self.restart_game()
+		return None
+
+	def update(self, dt, input):
+		"""Advance the game by one fixed 60 Hz tick"""
+		if self.game_over:
+			return
+
+		# Handle continuous input
+		if input[pygame.K_LEFT] or input[pygame.K_a]:
+			self.player_x = max(20, self.player_x - self.player_speed)
+		if input[pygame.K_RIGHT] or input[pygame.K_d]:
+			self.player_x = min(WINDOW_WIDTH - self.player_width - 20, self.player_x + self.player_speed)
+		self.frame_timer.mark("input")
+
+		self.update_game()
+		self.frame_timer.mark("update")
 
 	def shoot(self):
 		"""Player shoots a bullet"""
@@ -124,6 +119,8 @@ class SpaceInvadersGame:
 			if bullet['y'] < 0:
 				self.bullets.remove(bullet)
 
+		self.frame_timer.mark("update")
+
 		# Check bullet-alien collisions
 		for bullet in self.bullets[:]:
 			bullet_rect = pygame.Rect(bullet['x'], bullet['y'], bullet['width'], bullet['height'])
@@ -135,12 +132,13 @@ class SpaceInvadersGame:
 						self.bullets.remove(bullet)
 						self.score += (5 - alien['type']) * 10  # Higher rows worth more
 						break
+		self.frame_timer.mark("collisions")
 
 		# Move aliens
 		self.move_aliens()
 
 		# Alien shooting
-		if random.random() < 0.01:  # 1% chance per frame
+		if self.rng.random() < 0.01:  # 1% chance per frame
 			self.alien_shoot()
 
 		# Update alien bullets
@@ -149,6 +147,8 @@ class SpaceInvadersGame:
 			if bullet['y'] > WINDOW_HEIGHT:
 				self.alien_bullets.remove(bullet)
 
+		self.frame_timer.mark("update")
+
 		# Check alien bullet hits player
 		player_rect = pygame.Rect(self.player_x, self.player_y, self.player_width, self.player_height)
 		for bullet in self.alien_bullets[:]:
@@ -159,6 +159,8 @@ class SpaceInvadersGame:
 				if self.lives <= 0:
 					self.game_over = True
 
+		self.frame_timer.mark("collisions")
+
 		# Check if all aliens destroyed
 		if all(not alien['alive'] for alien in self.aliens):
 			self.wave += 1
@@ -196,7 +198,7 @@ class SpaceInvadersGame:
 		"""Random alien shoots"""
 		alive_aliens = [alien for alien in self.aliens if alien['alive']]
 		if alive_aliens:
-			shooter = random.choice(alive_aliens)
+			shooter = self.rng.choice(alive_aliens)
 			bullet = {
 				'x': shooter['x'] + 15,
 				'y': shooter['y'] + 20,
@@ -205,13 +207,15 @@ class SpaceInvadersGame:
 			}
 			self.alien_bullets.append(bullet)
 
-	def draw_everything(self):
+	def render(self):
 		"""Draw all game elements"""
 		# Space background
 		self.screen.fill(BLACK)
 
-		# Draw stars
-		for i in range(50):
+		# Draw stars - half of them at medium quality, none at low
+		star_step = 2 if self.quality.level < QUALITY_HIGH else 1
+		star_count = 0 if self.quality.level == QUALITY_LOW else 50
+		for i in range(0, star_count, star_step):
 			x = (i * 97 + self.animation_frame) % WINDOW_WIDTH
 			y = (i * 67) % (WINDOW_HEIGHT - 120)
 			star_brightness = (self.animation_frame + i * 13) % 100
@@ -291,24 +295,24 @@ class SpaceInvadersGame:
 	def draw_ui(self):
 		"""Draw user interface"""
 		# Score
-		score_text = self.font.render(f"Score: {self.score}", True, WHITE)
+		score_text = render_text(self.font, f"Score: {self.score}", WHITE)
 		self.screen.blit(score_text, (20, 20))
 
 		# Lives
-		lives_text = self.font.render(f"Lives: {self.lives}", True, WHITE)
+		lives_text = render_text(self.font, f"Lives: {self.lives}", WHITE)
 		self.screen.blit(lives_text, (20, 60))
 
 		# Wave
-		wave_text = self.font.render(f"Wave: {self.wave}", True, WHITE)
+		wave_text = render_text(self.font, f"Wave: {self.wave}", WHITE)
 		self.screen.blit(wave_text, (WINDOW_WIDTH - 150, 20))
 
 		# Title
-		title_text = self.font_large.render("SPACE INVADERS", True, CYAN)
+		title_text = render_text(self.font_large, "SPACE INVADERS", CYAN)
 		title_rect = title_text.get_rect(center=(WINDOW_WIDTH // 2, 40))
 		self.screen.blit(title_text, title_rect)
 
 		# Controls
-		controls_text = self.font.render("A/D or ←→: Move | SPACE: Shoot | ESC: Menu", True, GRAY)
+		controls_text = render_text(self.font, "A/D or ←→: Move | SPACE: Shoot | ESC: Menu", GRAY)
 		self.screen.blit(controls_text, (20, WINDOW_HEIGHT - 40))
 
 	def draw_game_over(self):
@@ -320,22 +324,22 @@ class SpaceInvadersGame:
 		self.screen.blit(overlay, (0, 0))
 
 		# Game over text
-		game_over_text = self.font_large.render("GAME OVER", True, RED)
+		game_over_text = render_text(self.font_large, "GAME OVER", RED)
 		game_over_rect = game_over_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 100))
 		self.screen.blit(game_over_text, game_over_rect)
 
 		# Final score
-		score_text = self.font_large.render(f"Final Score: {self.score}", True, WHITE)
+		score_text = render_text(self.font_large, f"Final Score: {self.score}", WHITE)
 		score_rect = score_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 50))
 		self.screen.blit(score_text, score_rect)
 
 		# Wave reached
-		wave_text = self.font.render(f"Wave Reached: {self.wave}", True, WHITE)
+		wave_text = render_text(self.font, f"Wave Reached: {self.wave}", WHITE)
 		wave_rect = wave_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 10))
 		self.screen.blit(wave_text, wave_rect)
 
 		# Restart instructions
-		restart_text = self.font.render("Press R to restart | ESC for menu", True, CYAN)
+		restart_text = render_text(self.font, "Press R to restart | ESC for menu", CYAN)
 		restart_rect = restart_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 + 50))
 		self.screen.blit(restart_text, restart_rect)
 
@@ -0,0 +1,11 @@
+from ghost_tournament import DIFFICULTIES
+from pacman import ghost_move_delay, level_difficulty
+
+def ghost_delays(difficulty, levels=range(1, 6)):
+	return [ghost_move_delay(level_difficulty(level, **DIFFICULTIES[difficulty])[0]) for level in levels]
+
+def test_fast_ghosts_move_sooner_from_level_2():
+	default = ghost_delays("default")
+	fast = ghost_delays("fast-ghosts")
+	assert fast[0] == default[0]
+	assert all(f < d for f, d in zip(fast[1:], default[1:]))
@@ -0,0 +1,33 @@
+from pacman import FRUIT_LIFETIME, LIFE_LOST_PAUSE, MAX_LIVES, Game
+from pacman_batch import NO_ACTION, BatchPacMan
+
+FROZEN = -10 ** 6  # Timer value that never comes due in a test
+
+def test_fruit_expires_as_in_game_across_a_lost_life():
+	game = Game(headless=True, seed=0)
+	for ghost in game.ghosts:
+		ghost.move_timer = FROZEN
+	game.fruit_spawn_timer = FROZEN
+	game.spawn_fruit()
+
+	batch = BatchPacMan(1, seed=0)
+	batch.ghost_timer[:] = FROZEN
+	batch.fruit_spawn_timer[:] = FROZEN
+	batch.fruit[0] = batch.fruit_cells[0]
+	batch.fruit_age[0] = 0
+
+	game_fruit = []
+	batch_fruit = []
+	for tick in range(FRUIT_LIFETIME + LIFE_LOST_PAUSE + 30):
+		if tick == 100:
+			# A ghost catches Pac-Man
+			game.ghosts[0].x, game.ghosts[0].y = game.pacman.x, game.pacman.y
+			batch.ghosts[0, 0] = batch.pacman[0]
+		game.step()
+		batch.step([NO_ACTION])
+		game_fruit.append(game.current_fruit is not None)
+		batch_fruit.append(bool(batch.fruit[0] >= 0))
+
+	assert game.lives == batch.lives[0] == MAX_LIVES - 1
+	assert not game_fruit[-1]
+	assert batch_fruit == game_fruit